@@ -0,0 +1,546 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+"""
+Month end checkpoints of the bank account figures used by the Bank Reconcile
+Report summary, so its cost does not grow with ledger history.
+
+- balance: GL balance till the end of the day of the GL Entries created
+  before gl_watermark. Checkpoints are only written by the scheduler
+  (update_all_checkpoints, month ends) with a watermark WATERMARK_OVERLAP
+  before its start, so GL Entries not committed yet cannot be missed: reads
+  add the GL Entries created after the watermark and posted on or before the
+  day, and the scheduler rolls the checkpoints forward to a new watermark.
+  GL Entries deleted by a repost are not seen by the watermark, the repost
+  doc_events drop the checkpoints from the earliest reposted date.
+- uncleared_amount: net debit of the Payment Entries, Journal Entries and POS
+  payments posted on or before the day and not cleared by its end (the
+  entries of ERPNext's Bank Reconciliation Statement). Clearance dates are
+  also written without document events (frappe.db.set_value), so these are
+  invalidated lazily: every read first drops the uncleared amounts on or after
+  the earliest posting date of the vouchers modified since the previous read
+  (watermark in the cache).
+"""
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import add_days, add_to_date, flt, get_datetime, get_first_day, get_last_day, getdate, now, now_datetime, today
+
+# Account -> datetime of the last uncleared amount invalidation
+WATERMARK_KEY = "bank_management:uncleared_watermark"
+
+# Seconds re-scanned before the watermark, for transactions committed after
+# the previous read that modified vouchers before it (also the GL watermark of
+# the checkpoints: longer transactions are not expected)
+WATERMARK_OVERLAP = 600
+
+# Reposts whose GL Entries are not rewritten yet
+PENDING_REPOST_STATUSES = ("Queued", "In Progress")
+
+# Hooks of ERPNext's Bank Reconciliation Statement, ERPNext's own methods are
+# replaced by the bounded queries below, methods of other apps are still called
+ENTRIES_HOOK = "get_entries_for_bank_reconciliation_statement"
+NOT_REFLECTED_HOOK = "get_amounts_not_reflected_in_system_for_bank_reconciliation_statement"
+
+# Voucher conditions on {posting_date} / {clearance_date}
+# Posted on or before date and not cleared by its end
+UNCLEARED = "{posting_date} <= %(date)s AND ({clearance_date} IS NULL OR {clearance_date} > %(date)s)"
+# Posted after from_date, on or before date and not cleared by its end
+POSTED_UNCLEARED = (
+    "{posting_date} > %(from_date)s AND {posting_date} <= %(date)s"
+    " AND ({clearance_date} IS NULL OR {clearance_date} > %(date)s)")
+# Posted on or before from_date, cleared after it and on or before date
+CLEARED_BETWEEN = (
+    "{posting_date} <= %(from_date)s AND {clearance_date} > %(from_date)s"
+    " AND {clearance_date} <= %(date)s")
+
+
+class BankBalanceCheckpoint(Document):
+    pass
+
+
+def get_checkpoint_balance(account, date):
+    """
+    GL balance of account (in account currency) till the end of date.
+
+    Uses the nearest checkpoint on or before date, the GL Entries created after
+    its watermark and posted on or before it, and the GL delta after it, so the
+    cost does not grow with ledger history. Read only.
+    """
+    date = getdate(date)
+
+    checkpoint = frappe.db.sql("""
+        SELECT posting_date, balance, gl_watermark
+        FROM `tabBank Balance Checkpoint`
+        WHERE account = %(account)s
+            AND posting_date <= %(date)s
+            AND gl_watermark IS NOT NULL
+        ORDER BY posting_date DESC
+        LIMIT 1
+    """, {"account": account, "date": date}, as_dict=True)
+
+    if not checkpoint:
+        return get_gl_balance(account, None, date)
+
+    checkpoint = checkpoint[0]
+    balance = flt(checkpoint.balance) + get_late_gl_balance(
+        account, checkpoint.posting_date, checkpoint.gl_watermark)
+    if getdate(checkpoint.posting_date) < date:
+        balance += get_gl_balance(account, add_days(checkpoint.posting_date, 1), date)
+
+    return balance
+
+
+def get_gl_balance(account, from_date, to_date):
+    """Sum of GL movements of account between from_date and to_date (inclusive)"""
+    balance = frappe.db.sql("""
+        SELECT SUM(debit_in_account_currency) - SUM(credit_in_account_currency)
+        FROM `tabGL Entry`
+        WHERE account = %(account)s
+            AND is_cancelled = 0
+            AND (%(from_date)s IS NULL OR posting_date >= %(from_date)s)
+            AND posting_date <= %(to_date)s
+    """, {"account": account, "from_date": from_date, "to_date": to_date})
+
+    return flt(balance[0][0]) if balance else 0.0
+
+
+def get_late_gl_balance(account, date, watermark, until=None):
+    """
+    Sum of the GL Entries of account posted on or before date and created at or
+    after watermark (and before until). Cancelled entries are included: a
+    cancellation flags the original entry and posts a reverse one, so the sum
+    of both is what changed since the watermark.
+    """
+    balance = frappe.db.sql("""
+        SELECT SUM(debit_in_account_currency) - SUM(credit_in_account_currency)
+        FROM `tabGL Entry`
+        WHERE account = %(account)s
+            AND creation >= %(watermark)s
+            AND (%(until)s IS NULL OR creation < %(until)s)
+            AND posting_date <= %(date)s
+    """, {"account": account, "date": date, "watermark": watermark, "until": until})
+
+    return flt(balance[0][0]) if balance else 0.0
+
+
+def get_watermark_balance(account, from_date, to_date, watermark):
+    """
+    Sum of the GL Entries of account posted after from_date (None: from the
+    start) and on or before to_date, created before watermark. Cancelled
+    entries are included, as in get_late_gl_balance.
+    """
+    balance = frappe.db.sql("""
+        SELECT SUM(debit_in_account_currency) - SUM(credit_in_account_currency)
+        FROM `tabGL Entry`
+        WHERE account = %(account)s
+            AND creation < %(watermark)s
+            AND (%(from_date)s IS NULL OR posting_date > %(from_date)s)
+            AND posting_date <= %(to_date)s
+    """, {"account": account, "from_date": from_date, "to_date": to_date, "watermark": watermark})
+
+    return flt(balance[0][0]) if balance else 0.0
+
+
+def save_checkpoint(account, date, balance, watermark):
+    """Insert or replace the checkpoint of account on date"""
+    timestamp = now()
+    frappe.db.sql("""
+        INSERT INTO `tabBank Balance Checkpoint`
+            (name, account, posting_date, balance, gl_watermark,
+             owner, modified_by, creation, modified, docstatus, idx)
+        VALUES
+            (%(name)s, %(account)s, %(date)s, %(balance)s, %(watermark)s,
+             %(user)s, %(user)s, %(timestamp)s, %(timestamp)s, 0, 0)
+        ON DUPLICATE KEY UPDATE
+            balance = VALUES(balance),
+            gl_watermark = VALUES(gl_watermark),
+            has_uncleared_amount = 0,
+            modified = VALUES(modified)
+    """, {
+        "name": f"{account}-{date}",
+        "account": account,
+        "date": date,
+        "balance": flt(balance),
+        "watermark": watermark,
+        "user": frappe.session.user,
+        "timestamp": timestamp
+    })
+
+
+def create_checkpoints(account, dates=None):
+    """
+    Roll the checkpoints of account forward to a new GL watermark and create
+    the missing ones on dates (default: the month ends before the current month).
+    Returns the number of checkpoints created.
+    """
+    watermark = add_to_date(now_datetime(), seconds=-WATERMARK_OVERLAP)
+
+    # Checkpoints without watermark (written by reads before) cannot be rolled forward
+    frappe.db.sql("""
+        DELETE FROM `tabBank Balance Checkpoint`
+        WHERE account = %(account)s AND gl_watermark IS NULL
+    """, {"account": account})
+
+    # Add the GL Entries created since their watermark
+    frappe.db.sql("""
+        UPDATE `tabBank Balance Checkpoint` cp
+        SET cp.balance = cp.balance + IFNULL((
+                SELECT SUM(gle.debit_in_account_currency) - SUM(gle.credit_in_account_currency)
+                FROM `tabGL Entry` gle
+                WHERE gle.account = cp.account
+                    AND gle.creation >= cp.gl_watermark
+                    AND gle.creation < %(watermark)s
+                    AND gle.posting_date <= cp.posting_date
+            ), 0),
+            cp.gl_watermark = %(watermark)s
+        WHERE cp.account = %(account)s
+            AND cp.gl_watermark < %(watermark)s
+    """, {"account": account, "watermark": watermark})
+
+    if dates is None:
+        dates = get_month_ends(account)
+
+    existing = {getdate(d) for d in frappe.db.sql_list("""
+        SELECT posting_date FROM `tabBank Balance Checkpoint` WHERE account = %(account)s
+    """, {"account": account})}
+
+    created = 0
+    for date in sorted({getdate(d) for d in dates} - existing):
+        checkpoint = frappe.db.sql("""
+            SELECT posting_date, balance
+            FROM `tabBank Balance Checkpoint`
+            WHERE account = %(account)s
+                AND posting_date < %(date)s
+            ORDER BY posting_date DESC
+            LIMIT 1
+        """, {"account": account, "date": date}, as_dict=True)
+
+        if checkpoint:
+            balance = flt(checkpoint[0].balance) + get_watermark_balance(
+                account, checkpoint[0].posting_date, date, watermark)
+        else:
+            balance = get_watermark_balance(account, None, date, watermark)
+
+        save_checkpoint(account, date, balance, watermark)
+        created += 1
+
+    return created
+
+
+def get_month_ends(account):
+    """Month ends from the first GL Entry of account to the end of the previous month"""
+    first_date = frappe.db.sql("""
+        SELECT MIN(posting_date) FROM `tabGL Entry` WHERE account = %(account)s
+    """, {"account": account})[0][0]
+    if not first_date:
+        return []
+
+    month_ends = []
+    last_date = add_days(get_first_day(today()), -1)
+    date = get_last_day(first_date)
+    while date <= last_date:
+        month_ends.append(date)
+        date = get_last_day(add_days(date, 1))
+    return month_ends
+
+
+def update_all_checkpoints():
+    """
+    scheduler_events: daily_long
+
+    Roll the checkpoints of every bank and cash account forward and create the
+    missing month end checkpoints. Companies with pending Repost Item
+    Valuations are skipped until their GL Entries are rewritten.
+    """
+    accounts = frappe.db.sql("""
+        SELECT name, company
+        FROM `tabAccount`
+        WHERE account_type IN ('Bank', 'Cash')
+            AND is_group = 0
+    """, as_dict=True)
+
+    pending_companies = set(frappe.db.sql_list("""
+        SELECT DISTINCT company
+        FROM `tabRepost Item Valuation`
+        WHERE docstatus = 1 AND status IN %(statuses)s
+    """, {"statuses": PENDING_REPOST_STATUSES}))
+
+    for account in accounts:
+        if account.company in pending_companies:
+            continue
+        try:
+            create_checkpoints(account.name)
+            frappe.db.commit()
+        except Exception:
+            frappe.db.rollback()
+            frappe.log_error(
+                "[bank_balance_checkpoint.py] method: update_all_checkpoints", "Bank Management")
+
+
+def get_checkpoint_uncleared_amount(account, company, date):
+    """
+    Net debit (debit - credit, account currency) of the vouchers of account
+    posted on or before date and not cleared by its end, as the entries of
+    ERPNext's Bank Reconciliation Statement (get_entries).
+
+    Uses the nearest valid checkpoint on or before date plus the vouchers
+    posted or cleared after it. A nearest checkpoint without valid amount gets
+    its amount stored first.
+    """
+    date = getdate(date)
+    invalidate_uncleared_amounts(account)
+
+    checkpoints = frappe.db.sql("""
+        (SELECT posting_date, uncleared_amount, has_uncleared_amount
+        FROM `tabBank Balance Checkpoint`
+        WHERE account = %(account)s
+            AND posting_date <= %(date)s
+        ORDER BY posting_date DESC
+        LIMIT 1)
+        UNION ALL
+        (SELECT posting_date, uncleared_amount, has_uncleared_amount
+        FROM `tabBank Balance Checkpoint`
+        WHERE account = %(account)s
+            AND posting_date <= %(date)s
+            AND has_uncleared_amount = 1
+        ORDER BY posting_date DESC
+        LIMIT 1)
+    """, {"account": account, "date": date}, as_dict=True)
+
+    checkpoints.sort(key=lambda d: getdate(d.posting_date), reverse=True)
+    nearest = checkpoints[0] if checkpoints else None
+    checkpoint = next((d for d in checkpoints if d.has_uncleared_amount), None)
+    if nearest and not nearest.has_uncleared_amount:
+        # Store it on the nearest checkpoint, later reads start from there
+        amount = get_uncleared_amount_since(account, company, checkpoint, nearest.posting_date)
+        save_uncleared_amount(account, nearest.posting_date, amount)
+        checkpoint = frappe._dict(posting_date=nearest.posting_date, uncleared_amount=amount)
+
+    amount = get_uncleared_amount_since(account, company, checkpoint, date)
+
+    filters = frappe._dict({
+        "account": account,
+        "report_date": date,
+        "include_pos_transactions": 1,
+        "company": company,
+    })
+    for method in get_extension_hooks(ENTRIES_HOOK):
+        amount += sum(flt(d.get("debit")) - flt(d.get("credit")) for d in frappe.get_attr(method)(filters) or [])
+
+    return amount
+
+
+def get_uncleared_amount_since(account, company, checkpoint, date):
+    """Uncleared amount on date from a checkpoint (posting_date, uncleared_amount) on or before it, or None"""
+    if not checkpoint:
+        return get_voucher_net(account, company, UNCLEARED, {"date": date})
+    if getdate(checkpoint.posting_date) == date:
+        return flt(checkpoint.uncleared_amount)
+
+    values = {"from_date": getdate(checkpoint.posting_date), "date": date}
+    return (flt(checkpoint.uncleared_amount)
+            + get_voucher_net(account, company, POSTED_UNCLEARED, values)
+            - get_voucher_net(account, company, CLEARED_BETWEEN, values))
+
+
+def get_voucher_net(account, company, condition, values):
+    """Net debit on account of the Payment Entries, Journal Entries and POS payments matching condition"""
+    values = dict(values, account=account, company=company)
+    net = 0.0
+
+    # Payment Entry, one branch per side so each uses its (company, paid_to/paid_from, clearance_date) index
+    for side, amount in (("paid_to", "received_amount_after_tax"), ("paid_from", "-paid_amount_after_tax")):
+        net += flt(frappe.db.sql("""
+            SELECT SUM({amount})
+            FROM `tabPayment Entry`
+            WHERE company = %(company)s
+                AND {side} = %(account)s
+                AND docstatus = 1
+                AND {condition}
+        """.format(
+            amount=amount,
+            side=side,
+            condition=condition.format(posting_date="posting_date", clearance_date="clearance_date")
+        ), values)[0][0])
+
+    net += flt(frappe.db.sql("""
+        SELECT SUM(jea.debit_in_account_currency - jea.credit_in_account_currency)
+        FROM `tabJournal Entry` je
+        INNER JOIN `tabJournal Entry Account` jea ON jea.parent = je.name
+        WHERE je.company = %(company)s
+            AND je.docstatus = 1
+            AND IFNULL(je.is_opening, 'No') = 'No'
+            AND jea.account = %(account)s
+            AND {condition}
+    """.format(
+        condition=condition.format(posting_date="je.posting_date", clearance_date="je.clearance_date")
+    ), values)[0][0])
+
+    net += flt(frappe.db.sql("""
+        SELECT SUM(sip.amount)
+        FROM `tabSales Invoice Payment` sip
+        INNER JOIN `tabSales Invoice` si ON si.name = sip.parent
+        WHERE si.docstatus = 1
+            AND sip.account = %(account)s
+            AND {condition}
+    """.format(
+        condition=condition.format(posting_date="si.posting_date", clearance_date="sip.clearance_date")
+    ), values)[0][0])
+
+    return net
+
+
+def get_amounts_not_reflected(account, company, date):
+    """
+    Amounts of vouchers of account posted after date but cleared on or before it,
+    as ERPNext's get_amounts_not_reflected_in_system. Bounded by the vouchers
+    posted after date ((company, posting_date) indexes).
+    """
+    values = {"account": account, "company": company, "date": getdate(date)}
+
+    je_amount = frappe.db.sql("""
+        SELECT SUM(jea.debit_in_account_currency - jea.credit_in_account_currency)
+        FROM `tabJournal Entry` je
+        INNER JOIN `tabJournal Entry Account` jea ON jea.parent = je.name
+        WHERE je.company = %(company)s
+            AND je.docstatus = 1
+            AND je.posting_date > %(date)s
+            AND je.clearance_date <= %(date)s
+            AND IFNULL(je.is_opening, 'No') = 'No'
+            AND jea.account = %(account)s
+    """, values)
+
+    # Unsigned, as in ERPNext
+    pe_amount = frappe.db.sql("""
+        SELECT SUM(IF(paid_from = %(account)s, paid_amount, received_amount))
+        FROM `tabPayment Entry`
+        WHERE company = %(company)s
+            AND (paid_from = %(account)s OR paid_to = %(account)s)
+            AND docstatus = 1
+            AND posting_date > %(date)s
+            AND clearance_date <= %(date)s
+    """, values)
+
+    amount = flt(je_amount[0][0]) + flt(pe_amount[0][0])
+
+    filters = frappe._dict({"account": account, "report_date": getdate(date), "company": company})
+    for method in get_extension_hooks(NOT_REFLECTED_HOOK):
+        amount += flt(frappe.get_attr(method)(filters))
+
+    return amount
+
+
+def get_extension_hooks(hook):
+    """Methods of hook from apps other than ERPNext"""
+    return [method for method in frappe.get_hooks(hook) if not method.startswith("erpnext.")]
+
+
+def invalidate_uncleared_amounts(account):
+    """
+    Drop the uncleared amounts that vouchers modified (submitted, cancelled,
+    cleared) since the previous call can have changed: those on or after the
+    earliest posting date of these vouchers. All of them without watermark.
+    """
+    watermark = frappe.cache.hget(WATERMARK_KEY, account)
+    next_watermark = add_to_date(now_datetime(), seconds=-WATERMARK_OVERLAP)
+
+    if not watermark:
+        frappe.db.sql("""
+            UPDATE `tabBank Balance Checkpoint`
+            SET has_uncleared_amount = 0
+            WHERE account = %(account)s
+        """, {"account": account})
+    else:
+        from_date = get_earliest_modified_posting_date(account, get_datetime(watermark))
+        if from_date:
+            frappe.db.sql("""
+                UPDATE `tabBank Balance Checkpoint`
+                SET has_uncleared_amount = 0
+                WHERE account = %(account)s
+                    AND posting_date >= %(from_date)s
+            """, {"account": account, "from_date": from_date})
+
+    frappe.cache.hset(WATERMARK_KEY, account, str(next_watermark))
+
+
+def get_earliest_modified_posting_date(account, since):
+    """Earliest posting date of the vouchers of account modified since (modified indexes)"""
+    values = {"account": account, "since": since}
+    dates = frappe.db.sql_list("""
+        SELECT MIN(posting_date)
+        FROM `tabPayment Entry`
+        WHERE modified >= %(since)s
+            AND (paid_from = %(account)s OR paid_to = %(account)s)
+        UNION ALL
+        SELECT MIN(je.posting_date)
+        FROM `tabJournal Entry` je
+        WHERE je.modified >= %(since)s
+            AND EXISTS (
+                SELECT 1 FROM `tabJournal Entry Account` jea
+                WHERE jea.parent = je.name AND jea.account = %(account)s
+            )
+        UNION ALL
+        SELECT MIN(si.posting_date)
+        FROM `tabSales Invoice Payment` sip
+        INNER JOIN `tabSales Invoice` si ON si.name = sip.parent
+        WHERE sip.modified >= %(since)s
+            AND sip.account = %(account)s
+    """, values)
+
+    dates = [getdate(d) for d in dates if d]
+    return min(dates) if dates else None
+
+
+def save_uncleared_amount(account, date, amount):
+    """Store the uncleared amount on the checkpoint of account on date (created by the scheduler)"""
+    frappe.db.sql("""
+        UPDATE `tabBank Balance Checkpoint`
+        SET uncleared_amount = %(amount)s, has_uncleared_amount = 1
+        WHERE account = %(account)s
+            AND posting_date = %(date)s
+    """, {"account": account, "date": date, "amount": flt(amount)})
+
+
+def clear_reposted_checkpoints(doc, method=None):
+    """
+    doc_events: Repost Item Valuation and Repost Accounting Ledger on_submit
+
+    Reposts delete and re-insert the GL Entries of past vouchers. Drop the
+    checkpoints of the company on or after the earliest reposted posting date,
+    the scheduler creates them again.
+    """
+    try:
+        if doc.doctype == "Repost Item Valuation":
+            from_date = doc.posting_date
+        else:
+            voucher_names = [d.voucher_no for d in doc.get("vouchers") or [] if d.voucher_no]
+            from_date = voucher_names and frappe.db.sql("""
+                SELECT MIN(posting_date) FROM `tabGL Entry`
+                WHERE voucher_no IN %(voucher_names)s AND company = %(company)s
+            """, {"voucher_names": tuple(voucher_names), "company": doc.company})[0][0]
+
+        if from_date:
+            frappe.db.sql("""
+                DELETE cp FROM `tabBank Balance Checkpoint` cp
+                INNER JOIN `tabAccount` account ON account.name = cp.account
+                WHERE account.company = %(company)s
+                    AND cp.posting_date >= %(from_date)s
+            """, {"company": doc.company, "from_date": getdate(from_date)})
+    except Exception:
+        frappe.log_error(
+            "[bank_balance_checkpoint.py] method: clear_reposted_checkpoints", "Bank Management")
+
+
+@frappe.whitelist()
+def rebuild_checkpoints(account):
+    """
+    Drop and recompute the checkpoints of account, e.g. after GL Entries were
+    deleted outside of the document lifecycle.
+
+        bench --site {site} execute bank_management.bank_management.doctype.bank_balance_checkpoint.bank_balance_checkpoint.rebuild_checkpoints --kwargs "{'account': '...'}"
+    """
+    frappe.only_for("System Manager")
+
+    frappe.db.delete("Bank Balance Checkpoint", {"account": account})
+    return create_checkpoints(account)
@@ -0,0 +1,167 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from erpnext.accounts.doctype.journal_entry.test_journal_entry import make_journal_entry
+from erpnext.accounts.report.bank_reconciliation_statement.bank_reconciliation_statement import (
+	get_amounts_not_reflected_in_system,
+	get_entries,
+)
+from erpnext.accounts.utils import get_balance_on
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, add_to_date, flt, get_last_day, getdate, now_datetime
+
+from bank_management.bank_management.doctype.bank_balance_checkpoint import bank_balance_checkpoint
+from bank_management.bank_management.doctype.bank_balance_checkpoint.bank_balance_checkpoint import (
+	WATERMARK_KEY,
+	clear_reposted_checkpoints,
+	create_checkpoints,
+	get_amounts_not_reflected,
+	get_checkpoint_balance,
+	get_checkpoint_uncleared_amount,
+)
+
+COMPANY = "_Test Company"
+BANK_ACCOUNT = "_Test Bank - _TC"
+CASH_ACCOUNT = "_Test Cash - _TC"
+
+
+class TestBankBalanceCheckpoint(FrappeTestCase):
+	def setUp(self):
+		frappe.db.delete("Bank Balance Checkpoint", {"account": BANK_ACCOUNT})
+		frappe.cache.hdel(WATERMARK_KEY, BANK_ACCOUNT)
+		self.today = getdate()
+
+	def make_entry(self, amount, days):
+		"""Submitted Journal Entry between the bank and cash accounts, days from today"""
+		return make_journal_entry(
+			BANK_ACCOUNT, CASH_ACCOUNT, amount, posting_date=add_days(self.today, days), submit=True
+		)
+
+	def assert_balance(self, date):
+		self.assertEqual(
+			flt(get_checkpoint_balance(BANK_ACCOUNT, date), 2), flt(get_balance_on(BANK_ACCOUNT, date), 2)
+		)
+
+	def get_checkpoint(self, date):
+		return frappe.db.get_value(
+			"Bank Balance Checkpoint",
+			{"account": BANK_ACCOUNT, "posting_date": date},
+			["balance", "gl_watermark"],
+			as_dict=True,
+		)
+
+	def assert_uncleared_amount(self, date):
+		filters = frappe._dict(
+			account=BANK_ACCOUNT, report_date=date, include_pos_transactions=1, company=COMPANY
+		)
+		expected = sum(flt(d.get("debit")) - flt(d.get("credit")) for d in get_entries(filters))
+		self.assertEqual(
+			flt(get_checkpoint_uncleared_amount(BANK_ACCOUNT, COMPANY, date), 2), flt(expected, 2)
+		)
+
+	def test_checkpoint_balance(self):
+		checkpoint_date = add_days(self.today, -10)
+		self.make_entry(100, -20)
+		create_checkpoints(BANK_ACCOUNT, [checkpoint_date])
+		self.assertTrue(self.get_checkpoint(checkpoint_date))
+		self.assert_balance(checkpoint_date)
+
+		# Reads do not write checkpoints
+		self.assert_balance(add_days(self.today, -1))
+		self.assertFalse(self.get_checkpoint(add_days(self.today, -1)))
+
+		# Checkpoint plus the GL delta after it
+		self.make_entry(40, -5)
+		self.assert_balance(self.today)
+
+		# Back-dated GL Entry before the existing checkpoints
+		self.make_entry(25, -15)
+		self.assert_balance(checkpoint_date)
+		self.assert_balance(self.today)
+
+		# Cancellation (reverse GL Entries) before the checkpoints
+		self.make_entry(60, -12).cancel()
+		self.assert_balance(checkpoint_date)
+		self.assert_balance(self.today)
+
+	def test_uncommitted_gl_entry(self):
+		checkpoint_date = add_days(self.today, -10)
+		self.make_entry(100, -20)
+		create_checkpoints(BANK_ACCOUNT, [checkpoint_date])
+		watermark = self.get_checkpoint(checkpoint_date).gl_watermark
+
+		# Created before the checkpoint was written but committed after it
+		late = self.make_entry(30, -15)
+		frappe.db.sql(
+			"UPDATE `tabGL Entry` SET creation = %s WHERE voucher_no = %s",
+			(add_to_date(now_datetime(), seconds=-60), late.name),
+		)
+		self.assert_balance(checkpoint_date)
+		self.assert_balance(self.today)
+
+		# Rolled forward to a new watermark
+		with patch.object(bank_balance_checkpoint, "WATERMARK_OVERLAP", -60):
+			create_checkpoints(BANK_ACCOUNT, [])
+		checkpoint = self.get_checkpoint(checkpoint_date)
+		self.assertGreater(checkpoint.gl_watermark, watermark)
+		self.assertEqual(flt(checkpoint.balance, 2), flt(get_balance_on(BANK_ACCOUNT, checkpoint_date), 2))
+		self.assert_balance(checkpoint_date)
+
+	def test_month_end_checkpoints(self):
+		self.make_entry(100, -70)
+		create_checkpoints(BANK_ACCOUNT)
+
+		dates = frappe.get_all(
+			"Bank Balance Checkpoint", filters={"account": BANK_ACCOUNT}, pluck="posting_date"
+		)
+		self.assertTrue(dates)
+		self.assertTrue(all(getdate(d) == get_last_day(d) and getdate(d) < self.today for d in dates))
+		for date in dates:
+			self.assert_balance(date)
+
+	def test_reposted_checkpoints(self):
+		create_checkpoints(BANK_ACCOUNT, [add_days(self.today, -20), add_days(self.today, -5)])
+		clear_reposted_checkpoints(
+			frappe._dict(doctype="Repost Item Valuation", company=COMPANY, posting_date=add_days(self.today, -10))
+		)
+		self.assertTrue(self.get_checkpoint(add_days(self.today, -20)))
+		self.assertFalse(self.get_checkpoint(add_days(self.today, -5)))
+
+	def test_checkpoint_uncleared_amount(self):
+		checkpoint_date = add_days(self.today, -10)
+		first = self.make_entry(100, -20)
+		create_checkpoints(BANK_ACCOUNT, [checkpoint_date])
+		self.assert_uncleared_amount(checkpoint_date)
+
+		# Posted after the checkpoint, not cleared
+		self.make_entry(40, -5)
+		self.assert_uncleared_amount(self.today)
+
+		# Cleared after the checkpoint
+		frappe.db.set_value("Journal Entry", first.name, "clearance_date", add_days(self.today, -3))
+		self.assert_uncleared_amount(checkpoint_date)
+		self.assert_uncleared_amount(self.today)
+
+		# Back-dated voucher cleared before the existing checkpoints
+		back_dated = self.make_entry(25, -15)
+		frappe.db.set_value("Journal Entry", back_dated.name, "clearance_date", add_days(self.today, -12))
+		self.assert_uncleared_amount(checkpoint_date)
+		self.assert_uncleared_amount(self.today)
+
+		# Clearance removed
+		frappe.db.set_value("Journal Entry", first.name, "clearance_date", None)
+		self.assert_uncleared_amount(self.today)
+
+	def test_amounts_not_reflected(self):
+		date = add_days(self.today, -5)
+		posted_later = self.make_entry(70, -2)
+		frappe.db.set_value("Journal Entry", posted_later.name, "clearance_date", add_days(self.today, -6))
+
+		filters = frappe._dict(account=BANK_ACCOUNT, report_date=date, company=COMPANY)
+		self.assertEqual(
+			flt(get_amounts_not_reflected(BANK_ACCOUNT, COMPANY, date), 2),
+			flt(get_amounts_not_reflected_in_system(filters), 2),
+		)
@@ -0,0 +1,27 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe import _
+from frappe.model.document import Document
+
+from bank_management.references import SETTINGS_FIELDS, enqueue_update_normalized_references
+from bank_management.bank_management.report.bank_reconcile_report.match_state import clear_fuzzy_match_state
+
+
+class BankManagementSettings(Document):
+    def validate(self):
+        if self.reference_normalization_method:
+            try:
+                frappe.get_attr(self.reference_normalization_method)
+            except Exception:
+                frappe.throw(_("Custom Normalization Method {0} not found").format(
+                    self.reference_normalization_method))
+
+    def on_update(self):
+        # Stored fuzzy matches depend on the tolerance and date window
+        if self.has_value_changed("fuzzy_amount_tolerance") or self.has_value_changed("fuzzy_date_window"):
+            clear_fuzzy_match_state()
+
+        if any(self.has_value_changed(fieldname) for fieldname in SETTINGS_FIELDS):
+            enqueue_update_normalized_references()
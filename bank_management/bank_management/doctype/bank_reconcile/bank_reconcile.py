@@ -0,0 +1,354 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+"""
+Batch reconciliation of selected Bank Reconcile Report rows.
+
+All Bank Transactions, vouchers and existing allocations are loaded with one
+query per doctype, allocations are computed in memory, then written set-wise:
+one multi-row insert of Bank Transaction Payments, one UPDATE per Bank
+Transaction column and one UPDATE of clearance_date per voucher doctype.
+Allocation follows ERPNext Bank Transaction.allocate_payment_entries: the
+allocated amount is the smaller of the Bank Transaction and voucher remaining
+amounts, and a fully allocated voucher is cleared on the Bank Transaction date.
+
+The Bank Transactions and vouchers are read with SELECT ... FOR UPDATE, so
+concurrent requests cannot allocate the same remaining amount twice. A voucher
+must be posted to the GL account of its row's Bank Transaction, in the same
+direction (deposit: debit, withdrawal: credit). Payment Entry amounts are
+base_paid_amount_after_tax, as in the report matching.
+"""
+
+import json
+
+import frappe
+from frappe import _
+from frappe.utils import flt, now
+
+from bank_management.metadata import get_bank_account_details
+from bank_management.bank_management.report.bank_reconcile_report.match_state import clear_match_state
+from bank_management.bank_management.report.bank_reconcile_report.report_cache import bump_bank_accounts
+
+VOUCHER_DOCTYPES = ("Payment Entry", "Journal Entry")
+
+
+@frappe.whitelist()
+def reconcile_selected(rows):
+    """
+    Reconcile selected (Bank Transaction, voucher) pairs in one request.
+
+    rows: [{"bank_transaction", "voucher_doc_type", "voucher_name"}]
+    Returns reconciled_count, failed_count and one result per row
+    (bank_transaction, voucher_doc_type, voucher_name, allocated_amount, status, message).
+    """
+    if isinstance(rows, str):
+        rows = json.loads(rows)
+    frappe.has_permission("Bank Transaction", "write", throw=True)
+
+    rows = [frappe._dict(row) for row in rows or []]
+    if not rows:
+        frappe.throw(_("Please select at least one row"))
+
+    bank_transactions = get_bank_transactions(
+        {row.bank_transaction for row in rows if row.bank_transaction})
+    permitted = {
+        name for name in bank_transactions
+        if frappe.has_permission("Bank Transaction", "write", doc=name)
+    }
+    bank_gl_accounts = get_bank_gl_accounts(bank_transactions)
+    vouchers = get_vouchers(rows, bank_transactions, bank_gl_accounts)
+    linked = get_existing_links(bank_transactions)
+
+    results = []
+    allocations = []
+    for row in rows:
+        result = frappe._dict({
+            "bank_transaction": row.bank_transaction,
+            "voucher_doc_type": row.voucher_doc_type,
+            "voucher_name": row.voucher_name,
+            "allocated_amount": 0.0,
+            "status": "Error",
+            "message": "",
+        })
+        results.append(result)
+
+        bank_transaction = bank_transactions.get(row.bank_transaction)
+        voucher = vouchers.get((row.voucher_doc_type, row.voucher_name))
+        gl_account = bank_gl_accounts.get(bank_transaction.bank_account) if bank_transaction else None
+        error = validate_row(row, bank_transaction, voucher, linked, gl_account, permitted)
+        if error:
+            result.message = error
+            continue
+
+        remaining_amount = get_remaining_amount(voucher, gl_account)
+        allocated_amount = min(flt(bank_transaction.unallocated_amount), remaining_amount)
+        bank_transaction.unallocated_amount = flt(
+            bank_transaction.unallocated_amount) - allocated_amount
+        bank_transaction.allocated_amount = flt(
+            bank_transaction.allocated_amount) + allocated_amount
+        voucher.allocated_amount = flt(voucher.allocated_amount) + allocated_amount
+        voucher.remaining_amount = remaining_amount - allocated_amount
+        linked.add((row.bank_transaction, row.voucher_doc_type, row.voucher_name))
+
+        allocations.append((bank_transaction, voucher, allocated_amount))
+        result.allocated_amount = allocated_amount
+        result.status = "Reconciled"
+
+    if allocations:
+        write_allocations(allocations, bank_transactions)
+        bump_bank_accounts({bank_transaction.bank_account for bank_transaction, voucher, amount in allocations})
+
+    reconciled_count = len(allocations)
+    return {
+        "reconciled_count": reconciled_count,
+        "failed_count": len(results) - reconciled_count,
+        "results": results
+    }
+
+
+def validate_row(row, bank_transaction, voucher, linked, gl_account, permitted):
+    """Error message for a row that cannot be reconciled, None otherwise"""
+    if not bank_transaction:
+        return _("Bank Transaction {0} not found or not submitted").format(row.bank_transaction)
+
+    if row.bank_transaction not in permitted:
+        return _("Not permitted to reconcile Bank Transaction {0}").format(row.bank_transaction)
+
+    if row.voucher_doc_type not in VOUCHER_DOCTYPES:
+        return _("{0} cannot be reconciled here").format(row.voucher_doc_type)
+
+    if not voucher or not gl_account or not flt(voucher.accounts.get(gl_account)):
+        return _("{0} {1} not found, not submitted or not posted to the bank account of {2}").format(
+            row.voucher_doc_type, row.voucher_name, row.bank_transaction)
+
+    # Deposits are debits of the bank GL account, withdrawals credits
+    is_deposit = flt(bank_transaction.deposit) > 0
+    if is_deposit != (flt(voucher.accounts[gl_account]) > 0):
+        return _("{0} {1} is a {2}, Bank Transaction {3} a {4}").format(
+            row.voucher_doc_type, row.voucher_name,
+            _("withdrawal") if is_deposit else _("deposit"),
+            row.bank_transaction,
+            _("deposit") if is_deposit else _("withdrawal"))
+
+    if (row.bank_transaction, row.voucher_doc_type, row.voucher_name) in linked:
+        return _("{0} {1} is already linked to Bank Transaction {2}").format(
+            row.voucher_doc_type, row.voucher_name, row.bank_transaction)
+
+    if flt(bank_transaction.unallocated_amount) <= 0:
+        return _("Bank Transaction {0} is already fully allocated").format(row.bank_transaction)
+
+    if get_remaining_amount(voucher, gl_account) <= 0:
+        return _("{0} {1} is already fully allocated").format(row.voucher_doc_type, row.voucher_name)
+
+    return None
+
+
+def get_remaining_amount(voucher, gl_account):
+    """Amount of the voucher in the bank GL account not yet allocated to Bank Transactions"""
+    return abs(flt(voucher.accounts.get(gl_account))) - flt(voucher.allocated_amount)
+
+
+def get_bank_transactions(names):
+    """Submitted Bank Transactions by name, locked until the end of the request (one query)"""
+    if not names:
+        return {}
+
+    return {
+        bt.name: bt
+        for bt in frappe.db.sql("""
+            SELECT name, date, bank_account, company, deposit, withdrawal,
+                allocated_amount, unallocated_amount
+            FROM `tabBank Transaction`
+            WHERE name IN %(names)s AND docstatus = 1
+            ORDER BY name
+            FOR UPDATE
+        """, {"names": tuple(names)}, as_dict=True)
+    }
+
+
+def get_bank_gl_accounts(bank_transactions):
+    """Bank Account -> GL Account (metadata cache)"""
+    bank_gl_accounts = {}
+    for bank_account in {bt.bank_account for bt in bank_transactions.values() if bt.bank_account}:
+        details = get_bank_account_details(bank_account)
+        if details and details.account:
+            bank_gl_accounts[bank_account] = details.account
+    return bank_gl_accounts
+
+
+def get_vouchers(rows, bank_transactions, bank_gl_accounts):
+    """
+    (doctype, name) -> voucher, locked until the end of the request (one query
+    per doctype), with its signed amount per bank GL account (accounts: debit
+    positive) and the amount already allocated to submitted Bank Transactions
+    """
+    names = {doctype: set() for doctype in VOUCHER_DOCTYPES}
+    gl_accounts = set(bank_gl_accounts.values())
+    for row in rows:
+        if row.voucher_doc_type in names and row.voucher_name:
+            names[row.voucher_doc_type].add(row.voucher_name)
+
+    vouchers = {}
+    if not gl_accounts:
+        return vouchers
+
+    if names["Payment Entry"]:
+        for pe in frappe.db.sql("""
+            SELECT name, posting_date, clearance_date, paid_from, paid_to,
+                base_paid_amount_after_tax AS amount
+            FROM `tabPayment Entry`
+            WHERE name IN %(names)s AND docstatus = 1
+                AND (paid_from IN %(accounts)s OR paid_to IN %(accounts)s)
+            ORDER BY name
+            FOR UPDATE
+        """, {"names": tuple(names["Payment Entry"]), "accounts": tuple(gl_accounts)}, as_dict=True):
+            pe.accounts = {}
+            if pe.paid_to in gl_accounts:
+                pe.accounts[pe.paid_to] = flt(pe.amount)
+            if pe.paid_from in gl_accounts:
+                pe.accounts[pe.paid_from] = -flt(pe.amount)
+            vouchers[("Payment Entry", pe.name)] = pe
+
+    if names["Journal Entry"]:
+        # Lock the Journal Entries first, an aggregate cannot be read FOR UPDATE
+        frappe.db.sql("""
+            SELECT name FROM `tabJournal Entry`
+            WHERE name IN %(names)s
+            ORDER BY name
+            FOR UPDATE
+        """, {"names": tuple(names["Journal Entry"])})
+
+        for je in frappe.db.sql("""
+            SELECT je.name, je.posting_date, je.clearance_date, jea.account,
+                SUM(jea.debit_in_account_currency - jea.credit_in_account_currency) AS amount
+            FROM `tabJournal Entry` je
+            INNER JOIN `tabJournal Entry Account` jea ON jea.parent = je.name
+            WHERE je.name IN %(names)s AND je.docstatus = 1
+                AND jea.account IN %(accounts)s
+            GROUP BY je.name, jea.account
+        """, {"names": tuple(names["Journal Entry"]), "accounts": tuple(gl_accounts)}, as_dict=True):
+            voucher = vouchers.setdefault(("Journal Entry", je.name), frappe._dict({
+                "name": je.name,
+                "posting_date": je.posting_date,
+                "clearance_date": je.clearance_date,
+                "accounts": {},
+            }))
+            voucher.accounts[je.account] = flt(je.amount)
+
+    allocated = get_allocated_amounts(vouchers)
+    for key, voucher in vouchers.items():
+        voucher.doctype = key[0]
+        voucher.allocated_amount = flt(allocated.get(key))
+
+    return vouchers
+
+
+def get_allocated_amounts(vouchers):
+    """(doctype, name) -> amount already allocated to submitted Bank Transactions (one query)"""
+    if not vouchers:
+        return {}
+
+    rows = frappe.db.sql("""
+        SELECT btp.payment_document, btp.payment_entry, SUM(btp.allocated_amount)
+        FROM `tabBank Transaction Payments` btp
+        INNER JOIN `tabBank Transaction` bt ON bt.name = btp.parent
+        WHERE bt.docstatus = 1
+            AND btp.parenttype = 'Bank Transaction'
+            AND btp.payment_entry IN %(names)s
+        GROUP BY btp.payment_document, btp.payment_entry
+    """, {"names": tuple(name for doctype, name in vouchers)})
+
+    return {(doctype, name): amount for doctype, name, amount in rows}
+
+
+def get_existing_links(bank_transactions):
+    """(Bank Transaction, doctype, voucher) already in payment_entries (one query)"""
+    if not bank_transactions:
+        return set()
+
+    return set(frappe.db.sql("""
+        SELECT parent, payment_document, payment_entry
+        FROM `tabBank Transaction Payments`
+        WHERE parenttype = 'Bank Transaction' AND parent IN %(names)s
+    """, {"names": tuple(bank_transactions)}))
+
+
+def write_allocations(allocations, bank_transactions):
+    """Write the allocations set-wise"""
+    timestamp = now()
+    user = frappe.session.user
+
+    # Continue the idx of existing payment_entries rows
+    next_idx = dict(frappe.db.sql("""
+        SELECT parent, MAX(idx)
+        FROM `tabBank Transaction Payments`
+        WHERE parenttype = 'Bank Transaction' AND parent IN %(names)s
+        GROUP BY parent
+    """, {"names": tuple({bt.name for bt, voucher, amount in allocations})}))
+
+    payment_rows = []
+    cleared = {doctype: {} for doctype in VOUCHER_DOCTYPES}
+    for bank_transaction, voucher, allocated_amount in allocations:
+        next_idx[bank_transaction.name] = (next_idx.get(bank_transaction.name) or 0) + 1
+
+        # Fully allocated vouchers are cleared on the Bank Transaction date
+        clearance_date = None
+        if flt(voucher.remaining_amount) <= 0:
+            clearance_date = bank_transaction.date
+            cleared[voucher.doctype][voucher.name] = clearance_date
+
+        payment_rows.append([
+            frappe.generate_hash(length=10), bank_transaction.name, "Bank Transaction", "payment_entries",
+            next_idx[bank_transaction.name], user, user, timestamp, timestamp, 1,
+            voucher.doctype, voucher.name, allocated_amount, clearance_date
+        ])
+
+    frappe.db.bulk_insert(
+        "Bank Transaction Payments",
+        ["name", "parent", "parenttype", "parentfield", "idx", "owner", "modified_by", "creation",
+         "modified", "docstatus", "payment_document", "payment_entry", "allocated_amount", "clearance_date"],
+        payment_rows
+    )
+
+    updated = {bt.name: bt for bt, voucher, amount in allocations}
+    set_values("Bank Transaction", "allocated_amount",
+               {name: flt(bt.allocated_amount) for name, bt in updated.items()})
+    set_values("Bank Transaction", "unallocated_amount",
+               {name: flt(bt.unallocated_amount) for name, bt in updated.items()})
+    # Same rule as Bank Transaction.set_status for submitted documents
+    set_values("Bank Transaction", "status",
+               {name: "Unreconciled" if flt(bt.unallocated_amount) > 0 else "Reconciled"
+                for name, bt in updated.items()})
+    frappe.db.sql("""
+        UPDATE `tabBank Transaction`
+        SET modified = %(modified)s, modified_by = %(user)s
+        WHERE name IN %(names)s
+    """, {"modified": timestamp, "user": user, "names": tuple(updated)})
+
+    for doctype, clearance_dates in cleared.items():
+        set_values(doctype, "clearance_date", clearance_dates)
+        if clearance_dates:
+            # As frappe.db.set_value: the balance checkpoints find changed vouchers by modified
+            frappe.db.sql(f"""
+                UPDATE `tab{doctype}`
+                SET modified = %(modified)s, modified_by = %(user)s
+                WHERE name IN %(names)s
+            """, {"modified": timestamp, "user": user, "names": tuple(clearance_dates)})
+
+    # Set-wise writes skip doc_events, clear the report match state here
+    clear_match_state(
+        bank_transactions=list(updated),
+        vouchers=[(voucher.doctype, voucher.name) for bt, voucher, amount in allocations])
+
+
+def set_values(doctype, fieldname, values):
+    """Set fieldname per document with a single UPDATE, values: {name: value}"""
+    if not values:
+        return
+
+    frappe.db.sql("""
+        UPDATE `tab{doctype}`
+        SET `{fieldname}` = CASE name {cases} END
+        WHERE name IN %s
+    """.format(doctype=doctype, fieldname=fieldname, cases=" ".join(["WHEN %s THEN %s"] * len(values))),
+        [value for item in values.items() for value in item] + [tuple(values)])
@@ -0,0 +1,96 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import getdate
+
+from bank_management.bank_management.doctype.bank_reconcile.bank_reconcile import reconcile_selected
+from bank_management.bank_management.report.bank_reconcile_report.test_bank_reconcile_report import (
+	create_bank_account,
+	make_bank_transaction,
+	make_journal_entry,
+	make_payment_entry,
+)
+
+
+def make_row(bank_transaction, voucher):
+	return {
+		"bank_transaction": bank_transaction.name,
+		"voucher_doc_type": voucher.doctype,
+		"voucher_name": voucher.name,
+	}
+
+
+class TestBankReconcile(FrappeTestCase):
+	def setUp(self):
+		self.bank_account = create_bank_account()
+
+	def assert_results(self, result, expected):
+		"""expected: [(status, allocated amount)] per row"""
+		self.assertEqual(
+			[(d["status"], d["allocated_amount"]) for d in result["results"]],
+			expected,
+			[d["message"] for d in result["results"]],
+		)
+
+	def test_allocation(self):
+		bank_transaction = make_bank_transaction(self.bank_account, "2025-06-10", deposit=100)
+		first = make_payment_entry(self.bank_account, "2025-06-01", "Receive", 60)
+		second = make_payment_entry(self.bank_account, "2025-06-02", "Receive", 50)
+
+		result = reconcile_selected(
+			[make_row(bank_transaction, first), make_row(bank_transaction, second)]
+		)
+		self.assert_results(result, [("Reconciled", 60), ("Reconciled", 40)])
+		self.assertEqual(result["reconciled_count"], 2)
+
+		values = frappe.db.get_value(
+			"Bank Transaction",
+			bank_transaction.name,
+			["allocated_amount", "unallocated_amount", "status"],
+			as_dict=True,
+		)
+		self.assertEqual((values.allocated_amount, values.unallocated_amount), (100, 0))
+		self.assertEqual(values.status, "Reconciled")
+
+		# Fully allocated vouchers are cleared on the Bank Transaction date
+		self.assertEqual(
+			getdate(frappe.db.get_value("Payment Entry", first.name, "clearance_date")), getdate("2025-06-10")
+		)
+		self.assertIsNone(frappe.db.get_value("Payment Entry", second.name, "clearance_date"))
+
+	def test_limits(self):
+		voucher = make_payment_entry(self.bank_account, "2025-06-01", "Receive", 50)
+		bank_transactions = [
+			make_bank_transaction(self.bank_account, "2025-06-10", deposit=30) for i in range(3)
+		]
+
+		result = reconcile_selected([make_row(bt, voucher) for bt in bank_transactions])
+		# The voucher remaining amount is shared across Bank Transactions
+		self.assert_results(result, [("Reconciled", 30), ("Reconciled", 20), ("Error", 0)])
+
+		# Already linked, Bank Transaction fully allocated
+		result = reconcile_selected([make_row(bank_transactions[0], voucher)])
+		self.assert_results(result, [("Error", 0)])
+		self.assertEqual(result["failed_count"], 1)
+
+	def test_account_and_direction(self):
+		deposit = make_bank_transaction(self.bank_account, "2025-06-10", deposit=70)
+		withdrawal = make_bank_transaction(self.bank_account, "2025-06-10", withdrawal=70)
+
+		other_account = make_payment_entry(create_bank_account(), "2025-06-01", "Receive", 70)
+		payment = make_payment_entry(self.bank_account, "2025-06-01", "Pay", 70)
+		journal_entry = make_journal_entry(self.bank_account, "2025-06-01", 70)
+
+		result = reconcile_selected(
+			[
+				# Posted to another bank account
+				make_row(deposit, other_account),
+				# Pay and credit Journal Entry against a deposit
+				make_row(deposit, payment),
+				make_row(deposit, journal_entry),
+				make_row(withdrawal, journal_entry),
+			]
+		)
+		self.assert_results(result, [("Error", 0), ("Error", 0), ("Error", 0), ("Reconciled", 70)])
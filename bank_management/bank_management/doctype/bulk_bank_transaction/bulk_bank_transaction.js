@@ -2,6 +2,20 @@
 // For license information, please see license.txt
 
 frappe.ui.form.on('Bulk Bank Transaction', {
+	onload(frm) {
+		// Progress of the background job creating Bank Transactions
+		frappe.realtime.off('bulk_bank_transaction_progress');
+		frappe.realtime.on('bulk_bank_transaction_progress', function (data) {
+			show_creation_progress(frm, data);
+		});
+
+		// Progress of the background statement import
+		frappe.realtime.off('bulk_bank_transaction_import');
+		frappe.realtime.on('bulk_bank_transaction_import', function (data) {
+			show_import_progress(frm, data);
+		});
+	},
+
 	refresh(frm) {
 		// Add button to create Bank Transactions (directly on toolbar, not under Actions)
 		if (!frm.is_new()) {
@@ -13,6 +27,12 @@ frappe.ui.form.on('Bulk Bank Transaction', {
 			frm.add_custom_button(__('Open Draft Bank Transactions'), function () {
 				open_draft_bank_transactions(frm);
 			});
+
+			if (frm.doc.statement_file) {
+				frm.add_custom_button(__('Import Statement'), function () {
+					import_statement(frm);
+				});
+			}
 		}
 	},
 
@@ -51,41 +71,111 @@ function create_bank_transactions(frm) {
 }
 
 function call_create_method(frm) {
-	// Count rows without bank_transaction already set
-	let rows_to_create = frm.doc.bank_transactions_table.filter(function (row) {
-		return !row.bank_transaction;
-	}).length;
-
 	// Use frm.call() with doc to call Document method correctly
 	frm.call({
 		doc: frm.doc,
 		method: 'create_bank_transactions',
-		freeze: true,
-		freeze_message: __('Creating Bank Transactions...'),
 		callback: function (r) {
-			if (!r.exc && r.message) {
-				if (r.message.created > 0) {
-					frappe.show_alert({
-						message: __('{0} Bank Transaction(s) created successfully', [
-							r.message.created,
-						]),
-						indicator: 'green',
-					});
-					// Refresh the form to show updated bank_transaction links
-					frm.reload_doc();
-				}
-				if (r.message.errors && r.message.errors.length > 0) {
-					frappe.msgprint({
-						title: __('Errors occurred'),
-						message: r.message.errors.join('<br>'),
-						indicator: 'orange',
-					});
-				}
+			if (!r.exc && r.message && r.message.queued) {
+				frappe.show_alert({
+					message: __('Creating {0} Bank Transaction(s) in background', [
+						r.message.pending,
+					]),
+					indicator: 'blue',
+				});
 			}
 		},
 	});
 }
 
+function show_creation_progress(frm, data) {
+	if (!data.done) {
+		frappe.show_progress(
+			__('Creating Bank Transactions'),
+			data.processed,
+			data.total,
+			__('{0} of {1} rows processed', [data.processed, data.total]),
+		);
+		return;
+	}
+
+	frappe.hide_progress();
+	if (data.created > 0) {
+		frappe.show_alert({
+			message: __('{0} Bank Transaction(s) created successfully', [data.created]),
+			indicator: 'green',
+		});
+	}
+	if (data.duplicates && data.duplicates.length > 0) {
+		frappe.msgprint({
+			title: __('{0} duplicate row(s) skipped', [data.duplicates.length]),
+			message: data.duplicates.join('<br>'),
+			indicator: 'blue',
+		});
+	}
+	if (data.errors && data.errors.length > 0) {
+		frappe.msgprint({
+			title: __('Errors occurred'),
+			message: data.errors.join('<br>'),
+			indicator: 'orange',
+		});
+	}
+	// Refresh the form to show updated bank_transaction links
+	frm.reload_doc();
+}
+
+function import_statement(frm) {
+	const run = function () {
+		frm.call({
+			doc: frm.doc,
+			method: 'import_statement',
+			callback: function (r) {
+				if (!r.exc && r.message && r.message.queued) {
+					frappe.show_alert({
+						message: __('Importing statement in background'),
+						indicator: 'blue',
+					});
+				}
+			},
+		});
+	};
+
+	// Save document if dirty so the job reads the attached file
+	if (frm.is_dirty()) {
+		frm.save().then(run);
+	} else {
+		run();
+	}
+}
+
+function show_import_progress(frm, data) {
+	if (!data.done) {
+		frappe.show_alert({
+			message: __('{0} statement rows imported', [data.imported]),
+			indicator: 'blue',
+		});
+		return;
+	}
+
+	if (data.error) {
+		frappe.msgprint({
+			title: __('Statement Import'),
+			message: data.error,
+			indicator: 'red',
+		});
+	} else {
+		frappe.show_alert({
+			message: __('{0} statement rows imported in {1}s ({2} rows/s)', [
+				data.imported,
+				data.seconds,
+				data.rows_per_second,
+			]),
+			indicator: 'green',
+		});
+	}
+	frm.reload_doc();
+}
+
 function open_draft_bank_transactions(frm) {
 	// Set route options for filter: docstatus = 0 (Draft)
 	// Use URL parameter format for list view filter
@@ -1,10 +1,27 @@
 # Copyright (c) 2025, abdopcnet@gmail.com and contributors
 # For license information, please see license.txt
 
+import time
+
 import frappe
 from frappe import _
 from frappe.model.document import Document
-from frappe.utils import flt, getdate
+from frappe.model.naming import parse_naming_series
+from frappe.utils import cint, flt, getdate, now
+
+from bank_management.metadata import get_bank_account_details
+from bank_management.trigram_index import index_bank_transactions
+from bank_management.bank_management.doctype.bulk_bank_transaction.fingerprint import (
+    get_existing_fingerprints,
+    get_fingerprint,
+)
+from bank_management.bank_management.doctype.bulk_bank_transaction.statement_import import (
+    get_statement_format,
+    parse_statement,
+)
+
+# Rows created and committed per batch when chunk_size is not set
+DEFAULT_CHUNK_SIZE = 500
 
 
 class BulkBankTransaction(Document):
@@ -13,8 +30,8 @@ class BulkBankTransaction(Document):
         if not self.bank_account:
             frappe.throw(_("Bank Account is required"))
 
-        # Validate that at least one row exists
-        if not self.bank_transactions_table:
+        # Validate that at least one row exists (or will be imported from the statement file)
+        if not self.bank_transactions_table and not self.statement_file:
             frappe.throw(
                 _("Please add at least one Bank Transaction in the table"))
 
@@ -30,112 +47,574 @@ class BulkBankTransaction(Document):
 
     @frappe.whitelist()
     def create_bank_transactions(self):
-        """Create all Bank Transactions from the table as Draft"""
+        """Create all Bank Transactions from the table as Draft (background job)"""
         # Ensure document is saved first to get name
         if self.is_new():
             self.save()
 
-        # Reload to get latest data
-        self.reload()
-
         # Validate bank_account is set
         if not self.bank_account:
             frappe.throw(_("Bank Account is required"))
 
-        if not self.bank_transactions_table:
+        # Counted in the database, imported statements are not loaded
+        if not frappe.db.exists("Bank Transactions Table", {"parent": self.name, "parenttype": self.doctype}):
             frappe.throw(_("No Bank Transactions to create"))
 
-        created_count = 0
-        errors = []
+        pending = count_pending_rows(self.name)
 
-        # Store the Bulk Bank Transaction name for linking
-        bulk_bank_transaction_name = self.name
+        frappe.enqueue(
+            process_bank_transactions,
+            queue="long",
+            timeout=7200,
+            job_id=f"bulk_bank_transaction::{self.name}",
+            deduplicate=True,
+            bulk_bank_transaction=self.name,
+            user=frappe.session.user
+        )
+
+        return {
+            "queued": True,
+            "pending": pending
+        }
+
+    @frappe.whitelist()
+    def import_statement(self):
+        """Import the rows of the attached bank statement file (background job)"""
+        if not self.statement_file:
+            frappe.throw(_("Please attach a Statement File"))
+
+        file_path = frappe.get_doc(
+            "File", {"file_url": self.statement_file}).get_full_path()
+        if not get_statement_format(file_path, self.statement_format):
+            frappe.throw(
+                _("Cannot detect the statement format, please select a Statement Format"))
+
+        frappe.enqueue(
+            import_statement_rows,
+            queue="long",
+            timeout=7200,
+            job_id=f"bulk_bank_transaction_import::{self.name}",
+            deduplicate=True,
+            bulk_bank_transaction=self.name,
+            user=frappe.session.user
+        )
+
+        return {"queued": True}
+
+    def get_company_and_currency(self):
+        """Company and currency for the Bank Transactions of this Bulk Bank Transaction"""
+        bank_account = get_bank_account_details(self.bank_account) or frappe._dict()
 
         # Get company from bank account if not provided in parent
-        company = self.company
+        company = self.company or bank_account.company
         if not company:
-            company = frappe.db.get_value(
-                "Bank Account", self.bank_account, "company")
-            if not company:
-                frappe.throw(
-                    _("Company not found for Bank Account {0}").format(self.bank_account))
-
-        # Get currency from bank account's linked account, or company default
-        account = frappe.db.get_value(
-            "Bank Account", self.bank_account, "account")
-        if account:
-            currency = frappe.db.get_value(
-                "Account", account, "account_currency")
-        else:
-            currency = None
+            frappe.throw(
+                _("Company not found for Bank Account {0}").format(self.bank_account))
 
-        # Fallback to company default currency if not found
+        # Currency of the bank account's linked account, or company default
+        currency = bank_account.currency
         if not currency:
-            currency = frappe.db.get_value(
-                "Company", company, "default_currency")
+            currency = frappe.get_cached_value("Company", company, "default_currency")
 
         if not currency:
             frappe.throw(
                 _("Currency not found for Bank Account {0}").format(self.bank_account))
 
-        for idx, row in enumerate(self.bank_transactions_table, start=1):
+        return company, currency
+
+
+def get_bulk_bank_transaction(name):
+    """Bulk Bank Transaction without its rows (an imported statement can have hundreds of thousands)"""
+    values = frappe.db.get_value("Bulk Bank Transaction", name, "*", as_dict=True)
+    if not values:
+        frappe.throw(_("Bulk Bank Transaction {0} not found").format(name), frappe.DoesNotExistError)
+
+    return frappe.get_doc({**values, "doctype": "Bulk Bank Transaction"})
+
+
+def count_pending_rows(bulk_bank_transaction):
+    """Rows without a bank_transaction link"""
+    return cint(frappe.db.sql("""
+        SELECT COUNT(*)
+        FROM `tabBank Transactions Table`
+        WHERE parent = %(parent)s AND parenttype = 'Bulk Bank Transaction'
+            AND IFNULL(bank_transaction, '') = ''
+    """, {"parent": bulk_bank_transaction})[0][0])
+
+
+def get_pending_rows(bulk_bank_transaction, after_idx, limit):
+    """Next page (by idx, keyset) of rows without a bank_transaction link"""
+    return frappe.db.sql("""
+        SELECT name, idx, date, deposit, withdrawal, description, reference_number, bank_transaction
+        FROM `tabBank Transactions Table`
+        WHERE parent = %(parent)s AND parenttype = 'Bulk Bank Transaction'
+            AND idx > %(after_idx)s
+            AND IFNULL(bank_transaction, '') = ''
+        ORDER BY idx
+        LIMIT %(limit)s
+    """, {"parent": bulk_bank_transaction, "after_idx": after_idx, "limit": limit}, as_dict=True)
+
+
+def process_bank_transactions(bulk_bank_transaction, user=None):
+    """
+    Background job: create Draft Bank Transactions for every row without a
+    bank_transaction link, committing after each chunk of rows. Rows are read
+    one chunk at a time (keyset on idx), the parent is loaded without them.
+    Progress is published to the form via realtime (bulk_bank_transaction_progress).
+    Re-running the job resumes from the first row without a link.
+
+    With skip_duplicates, rows whose fingerprint matches an existing Bank
+    Transaction are linked to it and rows repeating an earlier row are skipped,
+    both are reported in duplicates.
+    """
+    doc = get_bulk_bank_transaction(bulk_bank_transaction)
+    chunk_size = cint(doc.chunk_size) or DEFAULT_CHUNK_SIZE
+
+    created_count = 0
+    errors = []
+    duplicates = []
+    # fingerprint -> idx of the first row with it, for duplicates within the batch
+    seen_fingerprints = {}
+
+    def publish_progress(processed, total, done=False):
+        frappe.publish_realtime(
+            "bulk_bank_transaction_progress",
+            {
+                "processed": processed,
+                "total": total,
+                "created": created_count,
+                "errors": errors if done else [],
+                "duplicates": duplicates if done else [],
+                "done": done
+            },
+            doctype=doc.doctype,
+            docname=doc.name,
+            user=user
+        )
+
+    try:
+        company, currency = doc.get_company_and_currency()
+    except Exception as e:
+        errors.append(str(e))
+        publish_progress(0, 0, done=True)
+        return
+
+    # Resume from the first row without a Bank Transaction
+    total = count_pending_rows(doc.name)
+    processed = 0
+    last_idx = 0
+
+    while True:
+        chunk = [(row.idx, row) for row in get_pending_rows(doc.name, last_idx, chunk_size)]
+        if not chunk:
+            break
+        last_idx = chunk[-1][0]
+        processed += len(chunk)
+
+        if cint(doc.skip_duplicates):
+            chunk, chunk_duplicates = skip_duplicate_rows(
+                doc, chunk, seen_fingerprints)
+            duplicates.extend(chunk_duplicates)
+
+        if cint(doc.fast_insert) and chunk:
+            try:
+                frappe.db.savepoint("bulk_bank_transaction_chunk")
+                chunk_created, chunk_errors = insert_bank_transactions_fast(
+                    doc, chunk, company, currency)
+                created_count += chunk_created
+                errors.extend(chunk_errors)
+                chunk = []
+            except Exception:
+                # e.g. naming series collision, retry the chunk row by row
+                frappe.db.rollback(save_point="bulk_bank_transaction_chunk")
+                frappe.log_error(
+                    "[bulk_bank_transaction.py] method: insert_bank_transactions_fast", "Bulk Bank Transaction")
+
+        for idx, row in chunk:
+            # Validate required fields
+            if not row.date:
+                errors.append(_("Row {0}: Date is required").format(idx))
+                continue
+
+            if not flt(row.deposit) and not flt(row.withdrawal):
+                errors.append(
+                    _("Row {0}: Either Deposit or Withdrawal must be provided").format(idx))
+                continue
+
             try:
-                # Skip if Bank Transaction already created for this row
-                if row.bank_transaction:
-                    continue
-
-                # Validate required fields
-                if not row.date:
-                    errors.append(_("Row {0}: Date is required").format(idx))
-                    continue
-
-                if not flt(row.deposit) and not flt(row.withdrawal):
-                    errors.append(
-                        _("Row {0}: Either Deposit or Withdrawal must be provided").format(idx))
-                    continue
-
-                # Create Bank Transaction
-                bank_transaction = frappe.new_doc("Bank Transaction")
-                bank_transaction.date = row.date
-                bank_transaction.bank_account = self.bank_account
-                bank_transaction.company = company
-                bank_transaction.deposit = flt(row.deposit)
-                bank_transaction.withdrawal = flt(row.withdrawal)
-                bank_transaction.currency = currency
-                bank_transaction.description = row.description or ""
-                bank_transaction.reference_number = row.reference_number or ""
-                # Link to Bulk Bank Transaction
-                bank_transaction.custom_created_from = bulk_bank_transaction_name
-
-                # Insert as Draft (don't submit)
-                bank_transaction.insert()
+                frappe.db.savepoint("bulk_bank_transaction_row")
+                bank_transaction = make_bank_transaction(
+                    doc, row, company, currency)
 
                 # Update the row with created Bank Transaction name
+                frappe.db.set_value(
+                    "Bank Transactions Table", row.name, "bank_transaction", bank_transaction.name,
+                    update_modified=False)
                 row.bank_transaction = bank_transaction.name
 
                 created_count += 1
 
             except Exception as e:
+                frappe.db.rollback(save_point="bulk_bank_transaction_row")
                 frappe.log_error(
-                    "[bulk_bank_transaction.py] method: create_bank_transactions", "Bulk Bank Transaction")
+                    "[bulk_bank_transaction.py] method: process_bank_transactions", "Bulk Bank Transaction")
                 errors.append(_("Row {0}: {1}").format(idx, str(e)))
 
-        # Save the Bulk Bank Transaction to persist the bank_transaction links in child table
-        if created_count > 0:
-            self.save()
+        # Persist the chunk, an interrupted job resumes after it
+        frappe.db.commit()
+        publish_progress(min(processed, total), total)
+
+    publish_progress(total, total, done=True)
 
-        # Show message
-        message = _("{0} Bank Transaction(s) created successfully").format(
-            created_count)
-        if errors:
-            message += "\n\n" + _("Errors:\n{0}").format("\n".join(errors))
-            frappe.msgprint(message, title=_(
-                "Bank Transactions Created"), indicator="orange" if errors else "green")
+    return {
+        "created": created_count,
+        "errors": errors,
+        "duplicates": duplicates
+    }
+
+
+def skip_duplicate_rows(doc, rows, seen_fingerprints):
+    """
+    Split off the duplicate rows of a chunk: one IN query on the fingerprint index
+    for existing Bank Transactions and the seen_fingerprints hash set for rows
+    repeated within the batch. Rows duplicating an existing Bank Transaction are
+    linked to it so a re-run does not check them again.
+
+    Returns (remaining rows, duplicate messages).
+    """
+    fingerprints = {}
+    for idx, row in rows:
+        if row.date:
+            fingerprints[row.name] = get_fingerprint(
+                doc.bank_account, row.date, row.deposit, row.withdrawal, row.reference_number)
+
+    existing = get_existing_fingerprints(list(fingerprints.values()))
+
+    remaining = []
+    duplicates = []
+    links = []
+    for idx, row in rows:
+        fingerprint = fingerprints.get(row.name)
+        if not fingerprint:
+            # Invalid row, reported by the create step
+            remaining.append((idx, row))
+        elif fingerprint in existing:
+            links.append((row.name, existing[fingerprint]))
+            row.bank_transaction = existing[fingerprint]
+            duplicates.append(
+                _("Row {0}: duplicate of Bank Transaction {1}, skipped").format(idx, existing[fingerprint]))
+        elif fingerprint in seen_fingerprints:
+            duplicates.append(
+                _("Row {0}: duplicate of row {1}, skipped").format(idx, seen_fingerprints[fingerprint]))
         else:
-            frappe.msgprint(message, title=_(
-                "Bank Transactions Created"), indicator="green")
+            seen_fingerprints[fingerprint] = idx
+            remaining.append((idx, row))
 
-        return {
-            "created": created_count,
-            "errors": errors
-        }
+    set_bank_transaction_links(links)
+
+    return remaining, duplicates
+
+
+def import_statement_rows(bulk_bank_transaction, user=None):
+    """
+    Background job: stream the statement file into Bank Transactions Table.
+
+    Rows are parsed one at a time and written with multi-row inserts per chunk,
+    so memory stays constant for large statements (the parent is loaded without
+    its rows). Every chunk is committed with the number of statement lines staged
+    so far (statement_imported_rows): a re-run of the same file after an
+    interrupted job skips these lines instead of staging them again. On an error
+    (e.g. an invalid amount) the rows staged by the run are deleted again.
+    Throughput (rows per second) is published at the end
+    (bulk_bank_transaction_import).
+    """
+    doc = get_bulk_bank_transaction(bulk_bank_transaction)
+    chunk_size = cint(doc.chunk_size) or DEFAULT_CHUNK_SIZE
+    file_path = frappe.get_doc(
+        "File", {"file_url": doc.statement_file}).get_full_path()
+    statement_format = get_statement_format(file_path, doc.statement_format)
+
+    fields = ["name", "parent", "parenttype", "parentfield", "idx", "owner", "modified_by",
+              "creation", "modified", "docstatus", "date", "deposit", "withdrawal",
+              "description", "reference_number"]
+    timestamp = now()
+    start_idx = idx = cint(frappe.db.sql("""
+        SELECT MAX(idx)
+        FROM `tabBank Transactions Table`
+        WHERE parent = %(parent)s AND parenttype = 'Bulk Bank Transaction'
+    """, {"parent": doc.name})[0][0])
+
+    # Lines of the same file staged by a previous run
+    staged = cint(doc.statement_imported_rows) if doc.statement_imported_file == doc.statement_file else 0
+    parsed = 0
+    imported = 0
+    chunk = []
+    start_time = time.monotonic()
+
+    def publish(done=False, error=None):
+        elapsed = time.monotonic() - start_time
+        frappe.publish_realtime(
+            "bulk_bank_transaction_import",
+            {
+                "imported": imported,
+                "seconds": flt(elapsed, 2),
+                "rows_per_second": flt(imported / elapsed, 1) if elapsed else 0,
+                "done": done,
+                "error": error
+            },
+            doctype=doc.doctype,
+            docname=doc.name,
+            user=user
+        )
+
+    def write_chunk():
+        frappe.db.bulk_insert("Bank Transactions Table", fields, chunk)
+        # Committed with the rows, a re-run resumes after them
+        frappe.db.set_value(
+            doc.doctype, doc.name,
+            {"statement_imported_file": doc.statement_file, "statement_imported_rows": parsed},
+            update_modified=False)
+        frappe.db.commit()
+        chunk.clear()
+
+    try:
+        for row in parse_statement(file_path, statement_format):
+            parsed += 1
+            if parsed <= staged:
+                continue
+
+            idx += 1
+            chunk.append([
+                frappe.generate_hash(length=10), doc.name, doc.doctype, "bank_transactions_table", idx,
+                frappe.session.user, frappe.session.user, timestamp, timestamp, 0,
+                row["date"], row["deposit"], row["withdrawal"], row["description"], row["reference_number"]
+            ])
+            imported += 1
+
+            if len(chunk) >= chunk_size:
+                write_chunk()
+                publish()
+
+        if chunk:
+            write_chunk()
+
+        # Open forms are now stale, make them reload before saving
+        frappe.db.set_value(doc.doctype, doc.name, "modified", now(), update_modified=False)
+        frappe.db.commit()
+
+    except Exception as e:
+        frappe.db.rollback()
+        frappe.log_error(
+            "[bulk_bank_transaction.py] method: import_statement_rows", "Bulk Bank Transaction")
+
+        # Drop the chunks committed by this run
+        frappe.db.sql("""
+            DELETE FROM `tabBank Transactions Table`
+            WHERE parent = %(parent)s AND parenttype = 'Bulk Bank Transaction' AND idx > %(idx)s
+        """, {"parent": doc.name, "idx": start_idx})
+        frappe.db.set_value(
+            doc.doctype, doc.name,
+            {"statement_imported_file": doc.statement_imported_file,
+             "statement_imported_rows": doc.statement_imported_rows},
+            update_modified=False)
+        frappe.db.commit()
+
+        imported = 0
+        publish(done=True, error=_("Statement import failed at line {0}, no rows were imported: {1}").format(
+            parsed, str(e)))
+        return
+
+    publish(done=True)
+
+
+def make_bank_transaction(doc, row, company, currency):
+    """Insert a Draft Bank Transaction for a Bank Transactions Table row"""
+    bank_transaction = new_bank_transaction(doc, row, company, currency)
+
+    # Insert as Draft (don't submit)
+    bank_transaction.insert()
+
+    return bank_transaction
+
+
+def new_bank_transaction(doc, row, company, currency):
+    """New (unsaved) Bank Transaction for a Bank Transactions Table row"""
+    bank_transaction = frappe.new_doc("Bank Transaction")
+    bank_transaction.date = row.date
+    bank_transaction.bank_account = doc.bank_account
+    bank_transaction.company = company
+    bank_transaction.deposit = flt(row.deposit)
+    bank_transaction.withdrawal = flt(row.withdrawal)
+    bank_transaction.currency = currency
+    bank_transaction.description = row.description or ""
+    bank_transaction.reference_number = row.reference_number or ""
+    # Link to Bulk Bank Transaction
+    bank_transaction.custom_created_from = doc.name
+
+    return bank_transaction
+
+
+def insert_bank_transactions_fast(doc, rows, company, currency):
+    """
+    Fast path for creating Draft Bank Transactions.
+
+    The whole batch is validated up front (same controller and doc_events
+    validation as insert), names are taken from a block of naming series numbers
+    reserved at once, rows are written with multi-row inserts and the child table
+    links are back-filled with a single UPDATE. The post-insert methods of insert
+    then run per document (after_insert, on_update, on_change with their
+    doc_events, server scripts and webhooks), except the search trigrams and the
+    Version rows, which are written with one multi-row insert each. An exception
+    rolls the chunk back to the row by row path.
+
+    Returns (created count, errors).
+    """
+    errors = []
+    bank_transactions = []
+
+    if not can_insert_fast():
+        raise frappe.ValidationError(
+            _("Bank Transaction naming does not support fast insert"))
+
+    # Validate the whole batch up front
+    for idx, row in rows:
+        if not row.date:
+            errors.append(_("Row {0}: Date is required").format(idx))
+            continue
+
+        if not flt(row.deposit) and not flt(row.withdrawal):
+            errors.append(
+                _("Row {0}: Either Deposit or Withdrawal must be provided").format(idx))
+            continue
+
+        try:
+            bank_transaction = new_bank_transaction(
+                doc, row, company, currency)
+            bank_transaction.set_user_and_timestamp()
+            bank_transaction.run_method("before_insert")
+
+            # Same flags as Document.insert for the save lifecycle methods
+            bank_transaction._action = "save"
+            bank_transaction.flags.in_insert = True
+            bank_transaction.run_before_save_methods()
+            bank_transaction._validate()
+            bank_transaction.flags.in_insert = False
+
+            bank_transactions.append((row, bank_transaction))
+
+        except Exception as e:
+            errors.append(_("Row {0}: {1}").format(idx, str(e)))
+
+    if not bank_transactions:
+        return 0, errors
+
+    set_names_from_reserved_series(
+        [bank_transaction for row, bank_transaction in bank_transactions])
+
+    # Multi-row insert
+    values = [bank_transaction.get_valid_dict(convert_dates_to_str=True)
+              for row, bank_transaction in bank_transactions]
+    fields = list(values[0])
+    frappe.db.bulk_insert(
+        "Bank Transaction", fields, [[d.get(field) for field in fields] for d in values])
+
+    # Back-fill the child table links with a single UPDATE
+    set_bank_transaction_links(
+        [(row.name, bank_transaction.name) for row, bank_transaction in bank_transactions])
+
+    documents = [bank_transaction for row, bank_transaction in bank_transactions]
+    index_bank_transactions(documents)
+
+    # Post-insert methods of Document.insert, the trigram hook and save_version are batched
+    for bank_transaction in documents:
+        bank_transaction.flags.trigrams_indexed = True
+        bank_transaction.flags.ignore_version = True
+        bank_transaction.run_method("after_insert")
+        bank_transaction.flags.in_insert = True
+        bank_transaction.run_post_save_methods()
+        bank_transaction.flags.in_insert = False
+    insert_versions(documents)
+
+    for row, bank_transaction in bank_transactions:
+        row.bank_transaction = bank_transaction.name
+
+    return len(bank_transactions), errors
+
+
+def insert_versions(documents):
+    """Version rows of new documents (as Document.save_version on insert) with one multi-row insert"""
+    if not documents or not frappe.get_meta(documents[0].doctype).track_changes:
+        return
+
+    values = []
+    for document in documents:
+        version = frappe.new_doc("Version")
+        if version.update_version_info(None, document):
+            version.set_new_name()
+            version.set_user_and_timestamp()
+            values.append(version.get_valid_dict(convert_dates_to_str=True))
+
+    if values:
+        fields = list(values[0])
+        frappe.db.bulk_insert("Version", fields, [[d.get(field) for field in fields] for d in values])
+
+
+def set_bank_transaction_links(links):
+    """Set bank_transaction on Bank Transactions Table rows with a single UPDATE, links: [(row name, Bank Transaction)]"""
+    if not links:
+        return
+
+    frappe.db.sql("""
+        UPDATE `tabBank Transactions Table`
+        SET bank_transaction = CASE name {cases} END
+        WHERE name IN %s
+    """.format(cases=" ".join(["WHEN %s THEN %s"] * len(links))),
+        [value for link in links for value in link] + [tuple(name for name, bank_transaction in links)])
+
+
+def can_insert_fast():
+    """Fast insert only supports plain naming series naming (no Document Naming Rule)"""
+    autoname = frappe.get_meta("Bank Transaction").autoname or ""
+    if not autoname.startswith("naming_series:"):
+        return False
+
+    return not frappe.db.exists(
+        "Document Naming Rule", {"document_type": "Bank Transaction", "disabled": 0})
+
+
+def set_names_from_reserved_series(docs):
+    """Name docs from naming series, reserving one block of numbers per series prefix"""
+    placeholder = "\x00"
+    pending = {}
+
+    for doc in docs:
+        series = {}
+
+        def number_generator(prefix, digits):
+            series.update({"prefix": prefix, "digits": digits})
+            return placeholder
+
+        doc.name = parse_naming_series(
+            doc.naming_series + ".#####", doc=doc, number_generator=number_generator)
+        pending.setdefault((series["prefix"], series["digits"]), []).append(doc)
+
+    for (prefix, digits), series_docs in pending.items():
+        first = reserve_series(prefix, len(series_docs))
+        for number, doc in enumerate(series_docs, start=first):
+            doc.name = doc.name.replace(placeholder, str(number).zfill(digits))
+            doc.flags.name_set = True
+
+
+def reserve_series(prefix, count):
+    """Reserve count numbers of a naming series at once, returns the first one"""
+    current = frappe.db.sql(
+        "SELECT `current` FROM `tabSeries` WHERE `name` = %s FOR UPDATE", prefix)
+
+    if current and current[0][0] is not None:
+        frappe.db.sql(
+            "UPDATE `tabSeries` SET `current` = `current` + %s WHERE `name` = %s", (count, prefix))
+        return cint(current[0][0]) + 1
+
+    frappe.db.sql(
+        "INSERT INTO `tabSeries` (`name`, `current`) VALUES (%s, %s)", (prefix, count))
+    return 1
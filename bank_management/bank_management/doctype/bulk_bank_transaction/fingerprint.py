@@ -0,0 +1,70 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+"""
+Bank Transaction fingerprints for duplicate detection.
+
+The fingerprint is a hash of (bank_account, date, amount, direction,
+normalized reference number), stored in Bank Transaction.custom_fingerprint
+and indexed, so a whole batch of statement lines is checked with one IN query.
+"""
+
+import hashlib
+import re
+
+import frappe
+from frappe.utils import flt, getdate
+
+
+def get_fingerprint(bank_account, date, deposit, withdrawal, reference_number):
+    """Fingerprint of a statement line"""
+    amount = flt(deposit) - flt(withdrawal)
+    direction = "D" if amount >= 0 else "W"
+
+    key = "|".join([
+        bank_account or "",
+        str(getdate(date)),
+        "{0:.2f}".format(abs(amount)),
+        direction,
+        _get_fingerprint_reference(reference_number),
+    ])
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def _get_fingerprint_reference(reference_number):
+    """
+    Upper case reference with spaces and punctuation removed.
+
+    Fixed rules on purpose, not references.normalize_reference: fingerprints
+    are stored, so a change of the Bank Management Settings reference rules
+    would stop new statement lines from matching the existing ones.
+    """
+    return re.sub(r"[\W_]", "", reference_number or "").upper()
+
+
+def set_fingerprint(doc, method=None):
+    """Bank Transaction validate hook"""
+    if not doc.date or not doc.bank_account:
+        return
+
+    doc.custom_fingerprint = get_fingerprint(
+        doc.bank_account, doc.date, doc.deposit, doc.withdrawal, doc.reference_number)
+
+
+def get_existing_fingerprints(fingerprints):
+    """fingerprint -> Bank Transaction name for the non-cancelled ones that exist"""
+    if not fingerprints:
+        return {}
+
+    rows = frappe.db.sql("""
+        SELECT custom_fingerprint, name
+        FROM `tabBank Transaction`
+        WHERE custom_fingerprint IN %(fingerprints)s
+        AND docstatus < 2
+        ORDER BY creation
+    """, {"fingerprints": tuple(set(fingerprints))})
+
+    existing = {}
+    for fingerprint, name in rows:
+        existing.setdefault(fingerprint, name)
+    return existing
@@ -0,0 +1,360 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+"""
+Streaming bank statement parsers (CSV, OFX, MT940, CAMT.053).
+
+Every parser is a generator reading the file incrementally and yielding one
+dict per statement line with the Bank Transactions Table fields:
+date, deposit, withdrawal, description, reference_number.
+Memory stays constant whatever the file size.
+"""
+
+import csv
+import os
+import re
+import unicodedata
+import xml.etree.ElementTree as ElementTree
+
+from frappe.utils import flt, getdate
+
+STATEMENT_FORMATS = ("CSV", "OFX", "MT940", "CAMT.053")
+
+FORMAT_BY_EXTENSION = {
+    ".csv": "CSV",
+    ".ofx": "OFX",
+    ".qfx": "OFX",
+    ".sta": "MT940",
+    ".mt940": "MT940",
+    ".940": "MT940",
+    ".xml": "CAMT.053",
+    ".053": "CAMT.053",
+}
+
+# CSV header aliases (lower case) for each Bank Transactions Table field
+CSV_COLUMNS = {
+    "date": ("date", "transaction date", "posting date", "booking date", "value date"),
+    "deposit": ("deposit", "credit", "paid in", "money in"),
+    "withdrawal": ("withdrawal", "debit", "paid out", "money out"),
+    "amount": ("amount", "transaction amount"),
+    "description": ("description", "narration", "details", "memo", "particulars"),
+    "reference_number": ("reference number", "reference", "ref", "reference no", "cheque no",
+                         "check number", "transaction id"),
+}
+
+# 'DR' / 'CR' before or after an amount
+DEBIT_CREDIT_MARKER = re.compile(r"^(DR|CR)\.?(?![A-Za-z])|(?<![A-Za-z])(DR|CR)\.?$", re.IGNORECASE)
+
+# ISO currency code next to an amount
+CURRENCY_CODE = re.compile(r"(?<![A-Za-z])[A-Z]{3}(?![A-Za-z])")
+
+# Digits and separators once signs, currencies and markers are removed
+AMOUNT = re.compile(r"\d(?:[\d.,]*\d)?")
+
+# Integer part: plain digits, groups of three or Indian grouping (1,23,456)
+THOUSANDS = re.compile(r"\d+|\d{1,3}(?:([.,])\d{3})(?:\1\d{3})*|\d{1,2}(?:,\d{2})*,\d{3}")
+
+# Read size for the chunked OFX tokenizer
+READ_SIZE = 64 * 1024
+
+
+def get_statement_format(file_path, statement_format=None):
+    """Statement format from the selected value or the file extension"""
+    if statement_format:
+        return statement_format
+
+    extension = os.path.splitext(file_path)[1].lower()
+    return FORMAT_BY_EXTENSION.get(extension)
+
+
+def parse_statement(file_path, statement_format):
+    """Iterate over the statement lines of file_path"""
+    parsers = {
+        "CSV": parse_csv,
+        "OFX": parse_ofx,
+        "MT940": parse_mt940,
+        "CAMT.053": parse_camt053,
+    }
+    return parsers[statement_format](file_path)
+
+
+def make_row(date, amount=None, deposit=None, withdrawal=None, description=None, reference_number=None):
+    """Bank Transactions Table row from a signed amount or deposit/withdrawal"""
+    if amount is not None:
+        amount = flt(amount)
+        deposit = amount if amount > 0 else 0.0
+        withdrawal = -amount if amount < 0 else 0.0
+
+    return {
+        "date": getdate(date),
+        "deposit": abs(flt(deposit)),
+        "withdrawal": abs(flt(withdrawal)),
+        "description": (description or "").strip(),
+        "reference_number": (reference_number or "").strip(),
+    }
+
+
+def parse_amount(value):
+    """
+    Parse amounts like '1,234.50', '1.234.567', '1,23,456.00', '(12.00)', '-5',
+    '€ 10.00', 'EUR -10.00' or '100.00 DR' (debit, negative) / '100.00 CR'.
+    Raises ValueError for anything else, an empty value is 0.
+    """
+    text = (value or "").strip()
+    if not text:
+        return 0.0
+
+    # Debit / credit marker before or after the amount
+    negative = False
+    marker = DEBIT_CREDIT_MARKER.search(text)
+    if marker:
+        negative = (marker.group(1) or marker.group(2)).upper() == "DR"
+        text = text[:marker.start()] + text[marker.end():]
+
+    # Drop currency symbols and codes first, the sign may follow them ('€ -10.00'),
+    # and spaces or apostrophes used as thousands separators
+    text = "".join(c for c in text if unicodedata.category(c) != "Sc")
+    text = CURRENCY_CODE.sub("", text)
+    text = re.sub(r"[\s']", "", text)
+
+    if text.startswith("(") and text.endswith(")"):
+        negative, text = True, text[1:-1]
+    if text[:1] in ("-", "+"):
+        negative, text = negative or text[0] == "-", text[1:]
+    elif text.endswith("-"):
+        negative, text = True, text[:-1]
+
+    if text.startswith("."):
+        text = "0" + text
+    if not AMOUNT.fullmatch(text):
+        raise ValueError(f"Invalid amount: {value}")
+
+    # The last separator is the decimal one when both are used; a separator used
+    # several times, or a lone comma followed by three digits, groups thousands
+    dots, commas = text.count("."), text.count(",")
+    if dots and commas:
+        decimal = "." if text.rfind(".") > text.rfind(",") else ","
+    elif dots > 1 or commas > 1:
+        decimal = ""
+    elif commas:
+        decimal = "" if len(text) - text.rfind(",") == 4 else ","
+    else:
+        decimal = "."
+
+    integer, fraction = text.rsplit(decimal, 1) if decimal and decimal in text else (text, "")
+    if (fraction and not fraction.isdigit()) or not THOUSANDS.fullmatch(integer):
+        raise ValueError(f"Invalid amount: {value}")
+
+    amount = flt(re.sub(r"[.,]", "", integer) + "." + (fraction or "0"))
+    return -amount if negative else amount
+
+
+def parse_csv(file_path):
+    with open(file_path, newline="", encoding="utf-8-sig", errors="replace") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            return
+
+        columns = get_csv_columns(header)
+        if "date" not in columns:
+            raise ValueError("CSV statement has no date column")
+
+        def get(record, field):
+            index = columns.get(field)
+            return record[index] if index is not None and index < len(record) else ""
+
+        for record in reader:
+            if not any(record) or not get(record, "date").strip():
+                continue
+
+            if "deposit" in columns or "withdrawal" in columns:
+                row = make_row(
+                    get(record, "date"),
+                    deposit=parse_amount(get(record, "deposit")),
+                    withdrawal=parse_amount(get(record, "withdrawal")),
+                    description=get(record, "description"),
+                    reference_number=get(record, "reference_number"))
+            else:
+                row = make_row(
+                    get(record, "date"),
+                    amount=parse_amount(get(record, "amount")),
+                    description=get(record, "description"),
+                    reference_number=get(record, "reference_number"))
+
+            yield row
+
+
+def get_csv_columns(header):
+    """Field -> column index for a CSV header row"""
+    header = [(d or "").strip().lower() for d in header]
+    columns = {}
+    for field, aliases in CSV_COLUMNS.items():
+        for alias in aliases:
+            if alias in header:
+                columns[field] = header.index(alias)
+                break
+    return columns
+
+
+def parse_ofx(file_path):
+    """OFX 1.x (SGML) and 2.x (XML): tokenized in chunks, STMTTRN blocks yielded as they close"""
+    token_pattern = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+    transaction = None
+
+    with open(file_path, encoding="utf-8", errors="replace") as f:
+        buffer = ""
+        while True:
+            data = f.read(READ_SIZE)
+            buffer += data
+
+            # Keep the last (possibly incomplete) token for the next chunk
+            cut = buffer.rfind("<") if data else len(buffer)
+            text, buffer = buffer[:cut], buffer[cut:]
+
+            for closing, tag, value in token_pattern.findall(text):
+                tag = tag.upper()
+                if tag in ("STMTTRN", "BANKTRANLIST"):
+                    # SGML files may omit </STMTTRN>, the next transaction or the end of the list closes it
+                    if transaction:
+                        yield make_ofx_row(transaction)
+                    transaction = {} if tag == "STMTTRN" and not closing else None
+                elif transaction is not None and not closing:
+                    transaction[tag] = value.strip()
+
+            if not data:
+                break
+
+    if transaction:
+        yield make_ofx_row(transaction)
+
+
+def make_ofx_row(transaction):
+    description = " ".join(
+        d for d in (transaction.get("NAME"), transaction.get("MEMO")) if d)
+    reference_number = transaction.get("CHECKNUM") or transaction.get(
+        "REFNUM") or transaction.get("FITID")
+
+    return make_row(
+        transaction.get("DTPOSTED", "")[:8],
+        amount=parse_amount(transaction.get("TRNAMT")),
+        description=description,
+        reference_number=reference_number)
+
+
+# :61: statement line, e.g. 2501150115D1234,56NTRFINV-001//BANKREF
+MT940_STATEMENT_LINE = re.compile(
+    r"^(?P<date>\d{6})(?P<entry_date>\d{4})?(?P<mark>R?[DC])(?P<funds>[A-Z])?"
+    r"(?P<amount>\d+,\d*)(?P<type>[A-Z][A-Z0-9]{3})(?P<reference>[^/]*)(?://(?P<bank_reference>.*))?"
+)
+
+
+def parse_mt940(file_path):
+    """MT940: one transaction per :61: line, description from the following :86: field"""
+    transaction = None
+    field = None
+
+    with open(file_path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.rstrip("\r\n")
+            tag = re.match(r"^:(\d{2}[A-Z]?):(.*)$", line)
+
+            if tag:
+                field, value = tag.group(1), tag.group(2)
+                if field == "61":
+                    if transaction:
+                        yield make_mt940_row(transaction)
+                    transaction = {"line": value, "description": []}
+                elif field == "86" and transaction:
+                    transaction["description"].append(value)
+                elif transaction:
+                    # :62: closing balance etc. ends the transaction
+                    yield make_mt940_row(transaction)
+                    transaction = None
+            elif field == "86" and transaction and line and not line.startswith("-"):
+                # Continuation line of :86:
+                transaction["description"].append(line)
+
+    if transaction:
+        yield make_mt940_row(transaction)
+
+
+def make_mt940_row(transaction):
+    match = MT940_STATEMENT_LINE.match(transaction["line"])
+    if not match:
+        raise ValueError(f"Invalid MT940 statement line: {transaction['line']}")
+
+    amount = flt(match.group("amount").replace(",", "."))
+    # Debit (or reversal of credit) is a withdrawal
+    if match.group("mark") in ("D", "RC"):
+        amount = -amount
+
+    reference_number = match.group("reference").strip()
+    if reference_number.upper() == "NONREF":
+        reference_number = (match.group("bank_reference") or "").strip()
+
+    return make_row(
+        getdate("20" + match.group("date")),
+        amount=amount,
+        description=" ".join(d.strip() for d in transaction["description"]),
+        reference_number=reference_number)
+
+
+def parse_camt053(file_path):
+    """CAMT.053: Ntry elements parsed with iterparse and removed from the tree once read"""
+    parents = []
+
+    for event, element in ElementTree.iterparse(file_path, events=("start", "end")):
+        if event == "start":
+            parents.append(element)
+            continue
+
+        parents.pop()
+        if get_local_name(element.tag) != "Ntry":
+            continue
+
+        yield make_camt053_row(element)
+
+        # Drop the parsed entry so memory does not grow with the file
+        if parents:
+            parents[-1].remove(element)
+
+
+def get_local_name(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def find_text(element, path):
+    """Text of the first descendant matching a '/' separated path of local names"""
+    current = [element]
+    for name in path.split("/"):
+        current = [child for parent in current for child in parent if get_local_name(child.tag) == name]
+        if not current:
+            return None
+    return (current[0].text or "").strip() or None
+
+
+def make_camt053_row(entry):
+    amount = flt(find_text(entry, "Amt"))
+    if find_text(entry, "CdtDbtInd") == "DBIT":
+        amount = -amount
+
+    date = find_text(entry, "BookgDt/Dt") or find_text(entry, "BookgDt/DtTm") \
+        or find_text(entry, "ValDt/Dt") or find_text(entry, "ValDt/DtTm")
+
+    reference_number = None
+    for path in ("NtryDtls/TxDtls/Refs/EndToEndId", "NtryRef", "AcctSvcrRef",
+                 "NtryDtls/TxDtls/Refs/AcctSvcrRef"):
+        reference_number = find_text(entry, path)
+        if reference_number and reference_number.upper() != "NOTPROVIDED":
+            break
+        reference_number = None
+
+    description = find_text(entry, "AddtlNtryInf") or find_text(
+        entry, "NtryDtls/TxDtls/RmtInf/Ustrd") or find_text(entry, "NtryDtls/TxDtls/AddtlTxInf")
+
+    return make_row(
+        (date or "")[:10],
+        amount=amount,
+        description=description,
+        reference_number=reference_number)
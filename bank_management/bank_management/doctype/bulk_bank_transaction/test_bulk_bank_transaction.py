@@ -1,9 +1,224 @@
 # Copyright (c) 2025, abdopcnet@gmail.com and Contributors
 # See license.txt
 
-# import frappe
+import os
+import tempfile
+from unittest.mock import patch
+
+import frappe
 from frappe.tests.utils import FrappeTestCase
+from frappe.utils import getdate
+
+from bank_management.trigram_index import TRIGRAM_DOCTYPE
+from bank_management.bank_management.doctype.bulk_bank_transaction.bulk_bank_transaction import (
+	import_statement_rows,
+	insert_bank_transactions_fast,
+	make_bank_transaction,
+)
+from bank_management.bank_management.doctype.bulk_bank_transaction.fingerprint import get_fingerprint
+from bank_management.bank_management.doctype.bulk_bank_transaction.statement_import import (
+	get_statement_format,
+	parse_amount,
+	parse_statement,
+)
+from bank_management.bank_management.report.bank_reconcile_report.test_bank_reconcile_report import (
+	create_bank_account,
+)
+
+# Bank Transaction fields that must be stored the same by the fast and the row by row path
+COMPARED_FIELDS = [
+	"docstatus",
+	"status",
+	"date",
+	"bank_account",
+	"company",
+	"currency",
+	"deposit",
+	"withdrawal",
+	"allocated_amount",
+	"unallocated_amount",
+	"description",
+	"reference_number",
+	"custom_created_from",
+	"custom_normalized_reference",
+	"custom_fingerprint",
+]
+
+CSV_STATEMENT = """Date,Description,Reference,Amount
+2025-01-15,Customer payment,INV-001,"1,234.50"
+2025-01-16,Bank fee,,-12.00
+"""
+
+OFX_STATEMENT = """OFXHEADER:100
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20250115<TRNAMT>1234.50<FITID>F1<NAME>Customer payment
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20250116120000<TRNAMT>-12.00<FITID>F2<CHECKNUM>1001<MEMO>Cheque
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+MT940_STATEMENT = """:20:STATEMENT
+:25:NL00BANK0123456789
+:60F:C250114EUR1000,00
+:61:2501150115C1234,50NTRFINV-001//B1
+:86:Customer payment
+ January
+:61:250116D12,00NCHGNONREF//FEE-1
+:86:Bank fee
+:62F:C250116EUR2222,50
+-
+"""
+
+CAMT053_STATEMENT = """<?xml version="1.0" encoding="UTF-8"?>
+<Document xmlns="urn:iso:std:iso:20022:tech:xsd:camt.053.001.02"><BkToCstmrStmt><Stmt>
+<Ntry><Amt Ccy="EUR">1234.50</Amt><CdtDbtInd>CRDT</CdtDbtInd><BookgDt><Dt>2025-01-15</Dt></BookgDt>
+<NtryDtls><TxDtls><Refs><EndToEndId>INV-001</EndToEndId></Refs>
+<RmtInf><Ustrd>Customer payment</Ustrd></RmtInf></TxDtls></NtryDtls></Ntry>
+<Ntry><Amt Ccy="EUR">12.00</Amt><CdtDbtInd>DBIT</CdtDbtInd><BookgDt><Dt>2025-01-16</Dt></BookgDt>
+<AcctSvcrRef>FEE-1</AcctSvcrRef><AddtlNtryInf>Bank fee</AddtlNtryInf></Ntry>
+</Stmt></BkToCstmrStmt></Document>
+"""
 
 
 class TestBulkBankTransaction(FrappeTestCase):
-	pass
+	def parse(self, content, extension):
+		with tempfile.NamedTemporaryFile("w", suffix=extension, delete=False) as f:
+			f.write(content)
+		self.addCleanup(os.remove, f.name)
+		return list(parse_statement(f.name, get_statement_format(f.name)))
+
+	def assert_rows(self, rows):
+		self.assertEqual(len(rows), 2)
+		self.assertEqual(rows[0]["date"], getdate("2025-01-15"))
+		self.assertEqual(rows[0]["deposit"], 1234.5)
+		self.assertEqual(rows[0]["withdrawal"], 0)
+		self.assertIn("Customer payment", rows[0]["description"])
+		self.assertEqual(rows[1]["date"], getdate("2025-01-16"))
+		self.assertEqual(rows[1]["deposit"], 0)
+		self.assertEqual(rows[1]["withdrawal"], 12)
+
+	def test_parse_csv(self):
+		rows = self.parse(CSV_STATEMENT, ".csv")
+		self.assert_rows(rows)
+		self.assertEqual(rows[0]["reference_number"], "INV-001")
+
+	def test_parse_ofx(self):
+		rows = self.parse(OFX_STATEMENT, ".ofx")
+		self.assert_rows(rows)
+		self.assertEqual(rows[1]["reference_number"], "1001")
+
+	def test_parse_mt940(self):
+		rows = self.parse(MT940_STATEMENT, ".sta")
+		self.assert_rows(rows)
+		self.assertEqual(rows[0]["reference_number"], "INV-001")
+		self.assertEqual(rows[1]["reference_number"], "FEE-1")
+
+	def test_parse_camt053(self):
+		rows = self.parse(CAMT053_STATEMENT, ".xml")
+		self.assert_rows(rows)
+		self.assertEqual(rows[0]["reference_number"], "INV-001")
+		self.assertEqual(rows[1]["description"], "Bank fee")
+
+	def test_parse_amount(self):
+		self.assertEqual(parse_amount("1,234.50"), 1234.5)
+		self.assertEqual(parse_amount("1.234,50"), 1234.5)
+		self.assertEqual(parse_amount("12,50"), 12.5)
+		self.assertEqual(parse_amount("(12.00)"), -12)
+		# Sign after the currency symbol or code
+		self.assertEqual(parse_amount("€ -10.00"), -10)
+		self.assertEqual(parse_amount("-€10.00"), -10)
+		self.assertEqual(parse_amount("EUR 1.234,50-"), -1234.5)
+		self.assertEqual(parse_amount("(€ 12.00)"), -12)
+		self.assertEqual(parse_amount("€ 10.00"), 10)
+		self.assertEqual(parse_amount(""), 0)
+
+		# Repeated separators group thousands
+		self.assertEqual(parse_amount("1.234.567"), 1234567)
+		self.assertEqual(parse_amount("1,234,567"), 1234567)
+		self.assertEqual(parse_amount("1.234.567,89"), 1234567.89)
+		self.assertEqual(parse_amount("1,23,456.00"), 123456)
+		self.assertEqual(parse_amount("1 234,50"), 1234.5)
+
+		# Debit / credit markers
+		self.assertEqual(parse_amount("100.00 DR"), -100)
+		self.assertEqual(parse_amount("100.00 CR"), 100)
+		self.assertEqual(parse_amount("Dr 12,50"), -12.5)
+		self.assertEqual(parse_amount("EUR 1.234,50 Dr."), -1234.5)
+
+		# Not a number
+		for value in ("N/A", "12a", "1.2.3", "1,2345.6", "--5", "1.234,5.6"):
+			with self.assertRaises(ValueError):
+				parse_amount(value)
+
+	def test_fingerprint(self):
+		fingerprint = get_fingerprint("Bank - 1", "2025-01-15", 100, 0, "inv-001 ")
+		self.assertEqual(fingerprint, get_fingerprint("Bank - 1", getdate("2025-01-15"), "100.00", None, "INV 001"))
+		self.assertNotEqual(fingerprint, get_fingerprint("Bank - 1", "2025-01-15", 0, 100, "INV-001"))
+		self.assertNotEqual(fingerprint, get_fingerprint("Bank - 2", "2025-01-15", 100, 0, "INV-001"))
+
+		# Independent of the reference rules of Bank Management Settings
+		settings = frappe._dict(reference_ignore_case=0, reference_ignore_punctuation=0)
+		with patch("frappe.get_cached_doc", return_value=settings):
+			self.assertEqual(fingerprint, get_fingerprint("Bank - 1", "2025-01-15", 100, 0, "INV_001"))
+
+	def test_fast_insert_same_as_insert(self):
+		bank_account = create_bank_account()
+		row = {"date": "2025-02-03", "deposit": 250, "description": "Customer payment", "reference_number": "INV-7"}
+		doc = frappe.get_doc(
+			{
+				"doctype": "Bulk Bank Transaction",
+				"bank_account": bank_account.name,
+				"bank_transactions_table": [row, row],
+			}
+		).insert()
+		company, currency = doc.get_company_and_currency()
+
+		fast, slow = doc.bank_transactions_table
+		created, errors = insert_bank_transactions_fast(doc, [(fast.idx, fast)], company, currency)
+		self.assertEqual((created, errors), (1, []))
+		slow.bank_transaction = make_bank_transaction(doc, slow, company, currency).name
+
+		names = [fast.bank_transaction, slow.bank_transaction]
+		stored = [frappe.db.get_value("Bank Transaction", name, COMPARED_FIELDS, as_dict=True) for name in names]
+		self.assertEqual(stored[0], stored[1])
+
+		# Post-insert methods: search trigrams and Version rows
+		for name in names:
+			self.assertTrue(frappe.db.exists(TRIGRAM_DOCTYPE, {"bank_transaction": name}))
+		if frappe.get_meta("Bank Transaction").track_changes:
+			for name in names:
+				self.assertTrue(frappe.db.exists("Version", {"ref_doctype": "Bank Transaction", "docname": name}))
+
+	def test_import_resumes(self):
+		statement_file = frappe.get_doc(
+			{"doctype": "File", "file_name": "statement.csv", "content": CSV_STATEMENT, "is_private": 1}
+		).insert()
+		doc = frappe.get_doc(
+			{
+				"doctype": "Bulk Bank Transaction",
+				"bank_account": create_bank_account().name,
+				"statement_file": statement_file.file_url,
+			}
+		).insert()
+
+		def get_rows():
+			return frappe.get_all(
+				"Bank Transactions Table",
+				filters={"parent": doc.name, "parenttype": doc.doctype},
+				fields=["idx", "reference_number"],
+				order_by="idx",
+			)
+
+		# The job commits per chunk
+		with patch.object(frappe.db, "commit"):
+			import_statement_rows(doc.name)
+			self.assertEqual([d.reference_number for d in get_rows()], ["INV-001", ""])
+			self.assertEqual(frappe.db.get_value(doc.doctype, doc.name, "statement_imported_rows"), 2)
+
+			# A repeated run does not stage the lines again
+			import_statement_rows(doc.name)
+			self.assertEqual(len(get_rows()), 2)
+
+			# Interrupted after the first line: resumes with the second one
+			frappe.db.set_value(doc.doctype, doc.name, "statement_imported_rows", 1)
+			import_statement_rows(doc.name)
+			self.assertEqual([(d.idx, d.reference_number) for d in get_rows()][-1], (3, ""))
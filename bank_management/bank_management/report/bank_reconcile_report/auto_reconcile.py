@@ -0,0 +1,273 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+"""
+Auto reconcile of exact matches.
+
+A Bank Transaction is reconciled automatically only when it is untouched
+(unallocated amount equals its amount) and get_matched_vouchers finds an exact
+match: same reference number, same direction and an amount within 0.01, and
+no other open voucher with that reference, direction and amount, nor another
+open Bank Transaction of the bank account with that reference and direction
+(ambiguous matches are left to the user). Each voucher is used once per run. Matches are reconciled with ERPNext
+reconcile_vouchers in batches, one savepoint per Bank Transaction and one
+commit per batch. Counts and timings of every run are logged.
+"""
+
+import json
+import time
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, cint, flt, getdate
+from erpnext.accounts.doctype.bank_reconciliation_tool.bank_reconciliation_tool import (
+    reconcile_vouchers,
+)
+
+from bank_management.references import normalize_reference
+from bank_management.bank_management.report.bank_reconcile_report.bank_reconcile_report import (
+    get_matched_vouchers,
+)
+
+DEFAULT_BATCH_SIZE = 100
+
+# Amount tolerance of an exact match
+AMOUNT_TOLERANCE = 0.01
+
+
+@frappe.whitelist()
+def run_auto_reconcile(filters, dry_run=1):
+    """
+    On-demand auto reconcile for the report filters (company, bank account, dates).
+    A dry run returns the matches it would reconcile, otherwise a background job is queued.
+    """
+    if isinstance(filters, str):
+        filters = json.loads(filters)
+    filters = frappe._dict(filters or {})
+    frappe.has_permission("Bank Transaction", "write", throw=True)
+
+    kwargs = {
+        "company": filters.get("company"),
+        "bank_account": filters.get("bank_account"),
+        "from_date": filters.get("bank_statement_from_date") or filters.get("from_date"),
+        "to_date": filters.get("bank_statement_to_date") or filters.get("to_date"),
+    }
+
+    if cint(dry_run):
+        return auto_reconcile(dry_run=True, **kwargs)
+
+    frappe.enqueue(
+        auto_reconcile,
+        queue="long",
+        timeout=7200,
+        job_id=f"bank_auto_reconcile::{kwargs['company']}::{kwargs['bank_account']}",
+        deduplicate=True,
+        **kwargs
+    )
+    return {"queued": True}
+
+
+def scheduled_auto_reconcile():
+    """Scheduler: auto reconcile recent Bank Transactions of all companies when enabled"""
+    settings = frappe.get_cached_doc("Bank Management Settings")
+    if not cint(settings.enable_auto_reconcile):
+        return
+
+    from_date = None
+    if cint(settings.auto_reconcile_lookback_days):
+        from_date = add_days(getdate(), -cint(settings.auto_reconcile_lookback_days))
+
+    auto_reconcile(from_date=from_date,
+                   batch_size=cint(settings.auto_reconcile_batch_size) or DEFAULT_BATCH_SIZE)
+
+
+def auto_reconcile(company=None, bank_account=None, from_date=None, to_date=None,
+                   dry_run=False, batch_size=None):
+    """
+    Reconcile every exact match for the given scope.
+
+    Returns the run stats (candidates, matched, reconciled, failed, timings) and,
+    for a dry run, the list of matches that would be reconciled.
+    """
+    batch_size = cint(batch_size) or cint(frappe.db.get_single_value(
+        "Bank Management Settings", "auto_reconcile_batch_size")) or DEFAULT_BATCH_SIZE
+
+    stats = frappe._dict({
+        "company": company,
+        "bank_account": bank_account,
+        "dry_run": bool(dry_run),
+        "candidates": 0,
+        "matched": 0,
+        "reconciled": 0,
+        "failed": 0,
+        "match_seconds": 0.0,
+        "reconcile_seconds": 0.0,
+    })
+
+    start = time.monotonic()
+    bank_transactions = get_candidate_bank_transactions(
+        company, bank_account, from_date, to_date)
+    matches = get_exact_matches(bank_transactions)
+    stats.candidates = len(bank_transactions)
+    stats.matched = len(matches)
+    stats.match_seconds = flt(time.monotonic() - start, 3)
+
+    if dry_run:
+        stats.matches = matches
+        log_run(stats)
+        return stats
+
+    start = time.monotonic()
+    errors = []
+    for batch_start in range(0, len(matches), batch_size):
+        for match in matches[batch_start:batch_start + batch_size]:
+            try:
+                frappe.db.savepoint("bank_auto_reconcile")
+                reconcile_match(match)
+                stats.reconciled += 1
+            except Exception as e:
+                frappe.db.rollback(save_point="bank_auto_reconcile")
+                stats.failed += 1
+                errors.append(_("{0}: {1}").format(match["bank_transaction"], str(e)))
+
+        frappe.db.commit()
+
+    stats.reconcile_seconds = flt(time.monotonic() - start, 3)
+
+    if errors:
+        frappe.log_error(
+            "[auto_reconcile.py] method: auto_reconcile", "\n".join(errors))
+
+    log_run(stats)
+    return stats
+
+
+def get_candidate_bank_transactions(company=None, bank_account=None, from_date=None, to_date=None):
+    """Submitted Bank Transactions with a reference number and nothing allocated yet"""
+    conditions = [
+        "docstatus = 1",
+        "status IN ('Pending', 'Unreconciled')",
+        "unallocated_amount > 0",
+        "IFNULL(custom_normalized_reference, '') != ''",
+    ]
+    values = {}
+
+    if company:
+        conditions.append("company = %(company)s")
+        values["company"] = company
+    if bank_account:
+        conditions.append("bank_account = %(bank_account)s")
+        values["bank_account"] = bank_account
+    if from_date:
+        conditions.append("date >= %(from_date)s")
+        values["from_date"] = getdate(from_date)
+    if to_date:
+        conditions.append("date <= %(to_date)s")
+        values["to_date"] = getdate(to_date)
+
+    bank_transactions = frappe.db.sql("""
+        SELECT name, date, company, bank_account, deposit, withdrawal,
+            reference_number, custom_normalized_reference, unallocated_amount
+        FROM `tabBank Transaction`
+        WHERE {conditions}
+        ORDER BY date, name
+    """.format(conditions=" AND ".join(conditions)), values, as_dict=True)
+
+    # Partially allocated Bank Transactions need a human decision
+    return [
+        bt for bt in bank_transactions
+        if abs(flt(bt.unallocated_amount) - (flt(bt.deposit) or flt(bt.withdrawal))) < AMOUNT_TOLERANCE
+    ]
+
+
+def get_exact_matches(bank_transactions):
+    """Exact voucher match for each Bank Transaction, every voucher used once"""
+    matched_vouchers = get_matched_vouchers(bank_transactions, frappe._dict())
+    shared_references = get_shared_references(bank_transactions)
+
+    matches = []
+    used = set()
+    for bt in bank_transactions:
+        voucher = matched_vouchers.get(bt.name)
+        # Fuzzy (no reference) suggestions and ambiguous matches are never reconciled automatically
+        if not voucher or voucher.get("is_linked") or voucher.get("match_type") == "fuzzy" \
+                or voucher.get("is_ambiguous"):
+            continue
+
+        # Several Bank Transactions could take the voucher
+        if get_reference_key(bt) in shared_references:
+            continue
+
+        key = (voucher["doctype"], voucher["name"])
+        if key in used:
+            continue
+
+        amount = flt(bt.deposit) or flt(bt.withdrawal)
+        if abs(amount - flt(voucher.get("amount"))) >= AMOUNT_TOLERANCE:
+            continue
+
+        used.add(key)
+        matches.append({
+            "bank_transaction": bt.name,
+            "bank_account": bt.bank_account,
+            "date": bt.date,
+            "reference_number": bt.reference_number,
+            "amount": amount,
+            "voucher_doc_type": voucher["doctype"],
+            "voucher_name": voucher["name"],
+        })
+
+    return matches
+
+
+def get_reference_key(bt):
+    """(bank account, normalized reference, direction) of a Bank Transaction"""
+    reference = bt.get("custom_normalized_reference") or normalize_reference(bt.reference_number)
+    return (bt.bank_account, reference, "Deposit" if flt(bt.deposit) > 0 else "Withdrawal")
+
+
+def get_shared_references(bank_transactions):
+    """
+    Reference keys shared by several open Bank Transactions, in the batch or
+    outside of it (other dates, partially allocated)
+    """
+    keys = {get_reference_key(bt) for bt in bank_transactions}
+    references = {key[1] for key in keys if key[1]}
+    bank_accounts = {key[0] for key in keys}
+    if not references or not bank_accounts:
+        return set()
+
+    rows = frappe.db.sql("""
+        SELECT bank_account, custom_normalized_reference,
+            IF(deposit > 0, 'Deposit', 'Withdrawal') AS direction
+        FROM `tabBank Transaction`
+        WHERE docstatus = 1
+        AND status IN ('Pending', 'Unreconciled')
+        AND unallocated_amount > 0
+        AND bank_account IN %(bank_accounts)s
+        AND custom_normalized_reference IN %(references)s
+        GROUP BY bank_account, custom_normalized_reference, direction
+        HAVING COUNT(*) > 1
+    """, {"bank_accounts": tuple(bank_accounts), "references": tuple(references)})
+
+    return {tuple(row) for row in rows}
+
+
+def reconcile_match(match):
+    """Reconcile one Bank Transaction with its matched voucher (ERPNext reconcile_vouchers)"""
+    reconcile_vouchers(
+        match["bank_transaction"],
+        json.dumps([{
+            "payment_doctype": match["voucher_doc_type"],
+            "payment_name": match["voucher_name"],
+            "amount": match["amount"],
+        }])
+    )
+
+
+def log_run(stats):
+    """Per-run counts and timings in the bank_management log"""
+    frappe.logger("bank_management", allow_site=True).info({
+        "event": "auto_reconcile",
+        **{key: value for key, value in stats.items() if key != "matches"}
+    })
@@ -60,6 +60,19 @@ frappe.query_reports['Bank Reconcile Report'] = {
 			options: 'User',
 			columns: 2,
 		},
+		{
+			fieldname: 'reference_number',
+			label: __('Reference Number'),
+			fieldtype: 'Data',
+			description: __('Same reference after normalization (Bank Management Settings) or containing the text'),
+			columns: 2,
+		},
+		{
+			fieldname: 'description',
+			label: __('Description Contains'),
+			fieldtype: 'Data',
+			columns: 2,
+		},
 		{
 			fieldname: 'filter_by_reference_date',
 			label: __('Filter by Reference Date'),
@@ -93,9 +106,42 @@ frappe.query_reports['Bank Reconcile Report'] = {
 			),
 			columns: 2,
 		},
+		{
+			fieldname: 'paginate',
+			label: __('Load Rows Progressively'),
+			fieldtype: 'Check',
+			default: 0,
+			description: __(
+				'Load the first page of Bank Transactions and fetch further pages while scrolling. Use for large date ranges.',
+			),
+			columns: 2,
+		},
+		{
+			fieldname: 'columnar',
+			label: __('Compact Transfer'),
+			fieldtype: 'Check',
+			default: 0,
+			description: __(
+				'Send rows column by column instead of row by row. Smaller and faster responses for large statements.',
+			),
+			columns: 2,
+		},
+		{
+			fieldname: 'profile',
+			label: __('Profile Execution'),
+			fieldtype: 'Check',
+			default: 0,
+			description: __(
+				'Measure time, SQL queries and memory per report phase. Shown above the report and stored in Bank Reconcile Profile Log.',
+			),
+			columns: 2,
+		},
 	],
 
 	onload: function (report) {
+		// Decode columnar results before frappe builds the datatable rows
+		setup_columnar_decoding(report);
+
 		// Add buttons (direct buttons, not in dropdown)
 		report.page.add_inner_button(__('📖 General Ledger'), function () {
 			open_general_ledger(report);
@@ -105,6 +151,30 @@ frappe.query_reports['Bank Reconcile Report'] = {
 			open_bulk_bank_transaction(report);
 		});
 
+		report.page.add_inner_button(__('⏱ Run in Background'), function () {
+			run_report_in_background(report);
+		});
+
+		report.page.add_inner_button(__('🏢 Reconcile All Accounts'), function () {
+			run_company_reconciliation(report);
+		});
+
+		report.page.add_inner_button(__('🤖 Auto Reconcile'), function () {
+			run_auto_reconcile(report);
+		});
+
+		report.page.add_inner_button(__('✅ Reconcile Selected'), function () {
+			bulk_reconcile_selected(report);
+		});
+
+		report.page.add_inner_button(__('💡 Suggest Matches'), function () {
+			show_match_suggestions(report);
+		});
+
+		report.page.add_inner_button(__('🧩 Group Matches'), function () {
+			show_group_matches(report);
+		});
+
 		// Setup readonly logic for date fields based on filter_by_reference_date
 		setTimeout(() => {
 			let filter_by_ref_field = report.page.get_field('filter_by_reference_date');
@@ -174,42 +244,198 @@ frappe.query_reports['Bank Reconcile Report'] = {
 	},
 
 	formatter: function (value, row, column, data, default_formatter) {
-		value = default_formatter(value, row, column, data);
+		// Buttons are rendered from the row actions flags
+		if (BUTTON_COLUMNS[column.fieldname]) {
+			return data ? get_row_button(column.fieldname, data) : '';
+		}
 
-		// Format status column with colors
-		// Keep original status names, only apply colors
+		// Format status column with emoji and colors, keep original status names
 		if (column.fieldname === 'reconciled_status') {
-			if (value.includes('❌ Unmatched')) {
-				// Unmatched voucher: Red color with X emoji
-				value = '<span style="color: red; font-weight: bold;">' + value + '</span>';
-			} else if (value.includes('✅ Reconciled')) {
-				// Fully reconciled: Green color with checkmark and number
-				value = '<span style="color: green; font-weight: bold;">' + value + '</span>';
-			} else if (value.includes('Unreconciled')) {
-				// Partially reconciled (has voucher but still Unreconciled): Orange color with number
-				// Or Bank Transaction Unreconciled without voucher: Orange color with number
-				value = '<span style="color: orange; font-weight: bold;">' + value + '</span>';
-			} else if (value.includes('⏳')) {
-				// Pending: Gray color
-				value = '<span style="color: #666; font-weight: bold;">' + value + '</span>';
-			}
+			return format_row_status(value);
 		}
 
-		// Format button columns (already HTML)
-		if (['btn_reconcile', 'btn_create_pe', 'btn_create_je'].includes(column.fieldname)) {
-			// Buttons are already HTML
-			return value || '';
-		}
+		return default_formatter(value, row, column, data);
+	},
 
-		return value;
+	get_datatable_options(options) {
+		// Row selection for Reconcile Selected
+		return Object.assign(options, {
+			checkboxColumn: true,
+		});
 	},
 
 	after_datatable_render: function (report) {
 		// Setup event handlers for action buttons
 		setup_action_buttons(report);
+
+		// Fetch further pages while scrolling (paginated mode)
+		setup_pagination(report);
 	},
 };
 
+// Rows per page in paginated mode (keep in sync with PAGE_LENGTH in bank_reconcile_report.py)
+const PAGE_LENGTH = 500;
+
+// Row action flags (keep in sync with ACTION_* in bank_reconcile_report.py)
+const ROW_ACTIONS = {
+	reconcile: 1,
+	create_pe: 2,
+	create_je: 4,
+	create_bt: 8,
+};
+
+// Button column -> action flag
+const BUTTON_COLUMNS = {
+	btn_reconcile: ROW_ACTIONS.reconcile,
+	btn_create_pe: ROW_ACTIONS.create_pe,
+	btn_create_je: ROW_ACTIONS.create_je,
+	btn_create_bt: ROW_ACTIONS.create_bt,
+};
+
+const STATUS_STYLES = {
+	Unmatched: { emoji: '❌', color: 'red' },
+	Reconciled: { emoji: '1️⃣ ✅', color: 'green' },
+	Unreconciled: { emoji: '1️⃣', color: 'orange' },
+};
+
+function format_row_status(status) {
+	if (!status) {
+		return '';
+	}
+
+	// Pending and other statuses: gray with hourglass
+	const style = STATUS_STYLES[status] || { emoji: '1️⃣ ⏳', color: '#666' };
+	return `<span style="color: ${style.color}; font-weight: bold;">${style.emoji} ${__(status)}</span>`;
+}
+
+function get_row_button(fieldname, data) {
+	if (!(cint(data.actions) & BUTTON_COLUMNS[fieldname])) {
+		return '';
+	}
+
+	const bt = frappe.utils.escape_html(data.bt_name || '');
+	const voucher = frappe.utils.escape_html(data.voucher_name || '');
+	const doctype = frappe.utils.escape_html(data.voucher_doc_type || '');
+
+	if (fieldname === 'btn_reconcile') {
+		return `<button class="btn btn-xs btn-primary reconcile-btn" data-bt="${bt}" data-voucher="${voucher}" data-doctype="${doctype}">🔗 ${__('Reconcile')}</button>`;
+	}
+	if (fieldname === 'btn_create_pe') {
+		const reference_number = data.bt_reference_number
+			? ` data-reference-number="${frappe.utils.escape_html(data.bt_reference_number)}"`
+			: '';
+		const date = data.bt_date ? ` data-date="${data.bt_date}"` : '';
+		return `<button class="btn btn-xs btn-success create-pe-btn" data-bt="${bt}"${reference_number}${date}>➕ ${__('Payment Entry')}</button>`;
+	}
+	if (fieldname === 'btn_create_je') {
+		return `<button class="btn btn-xs btn-info create-je-btn" data-bt="${bt}">📝 ${__('Journal Entry')}</button>`;
+	}
+	return `<button class="btn btn-xs btn-warning create-bt-btn" data-doctype="${doctype}" data-voucher="${voucher}">➕ ${__('Bank Transaction')}</button>`;
+}
+
+function setup_pagination(report) {
+	const datatable = report.datatable;
+	if (!datatable || !datatable.bodyScrollable) {
+		return;
+	}
+
+	const $scrollable = $(datatable.bodyScrollable);
+	$scrollable.off('scroll.bank_reconcile_pagination');
+
+	if (!report.get_filter_value('paginate')) {
+		return;
+	}
+
+	// Initial page comes from execute(), more pages exist if it was full
+	const bt_rows = (report.data || []).filter((row) => row.bt_name);
+	report.pagination = {
+		after: bt_rows.length ? bt_rows[bt_rows.length - 1].bt_name : null,
+		has_more: bt_rows.length >= PAGE_LENGTH,
+		loading: false,
+	};
+
+	$scrollable.on('scroll.bank_reconcile_pagination', function () {
+		const el = this;
+		if (el.scrollTop + el.clientHeight >= el.scrollHeight - 200) {
+			load_next_page(report);
+		}
+	});
+}
+
+function load_next_page(report) {
+	const pagination = report.pagination;
+	if (!pagination || !pagination.has_more || pagination.loading) {
+		return;
+	}
+
+	pagination.loading = true;
+	frappe.call({
+		method: 'bank_management.bank_management.report.bank_reconcile_report.bank_reconcile_report.get_data_page',
+		args: {
+			filters: report.get_filter_values(),
+			after: pagination.after,
+			page_length: PAGE_LENGTH,
+		},
+		callback: function (r) {
+			pagination.loading = false;
+			if (r.exc || !r.message) {
+				return;
+			}
+
+			const page = r.message;
+			pagination.after = page.last || pagination.after;
+			pagination.has_more = page.has_more;
+
+			const rows = page.data && page.data.fields ? decode_columnar_rows(page.data) : page.data;
+			if (rows && rows.length) {
+				report.data.push(...rows);
+				report.datatable.appendRows(rows);
+			}
+		},
+		error: function () {
+			pagination.loading = false;
+		},
+	});
+}
+
+function setup_columnar_decoding(report) {
+	if (report.columnar_decoding || typeof report.prepare_data !== 'function') {
+		return;
+	}
+
+	report.columnar_decoding = true;
+	const prepare_data = report.prepare_data.bind(report);
+	report.prepare_data = function (data) {
+		return prepare_data(decode_columnar_result(data));
+	};
+}
+
+function decode_columnar_result(data) {
+	// execute() in columnar mode returns a single row carrying the encoded rows
+	if (data && data.length === 1 && data[0] && data[0].columnar) {
+		return decode_columnar_rows(data[0].columnar);
+	}
+	return data;
+}
+
+function decode_columnar_rows(payload) {
+	// Inverse of columnar.encode_rows: one array per field, dictionary encoded fields hold indexes
+	const rows = new Array(payload.length);
+	for (let i = 0; i < payload.length; i++) {
+		rows[i] = {};
+	}
+
+	payload.fields.forEach((field) => {
+		const column = payload.values[field];
+		const dictionary = payload.dictionaries[field];
+		for (let i = 0; i < payload.length; i++) {
+			rows[i][field] = dictionary ? dictionary[column[i]] : column[i];
+		}
+	});
+
+	return rows;
+}
+
 function setup_action_buttons(report) {
 	// Reconcile button handler
 	$(document)
@@ -560,6 +786,399 @@ function create_bank_transaction(voucher_doc_type, voucher_name, $btn) {
 	});
 }
 
+function run_report_in_background(report) {
+	frappe.call({
+		method: 'bank_management.bank_management.report.bank_reconcile_report.bank_reconcile_report.enqueue_report',
+		args: {
+			filters: report.get_filter_values(),
+		},
+		callback: function (r) {
+			if (r.exc || !r.message) {
+				return;
+			}
+
+			if (r.message.cached) {
+				// Result already cached for these filters
+				report.refresh();
+				return;
+			}
+
+			const key = r.message.key;
+			frappe.show_alert({
+				message: __('Report queued, you can keep working'),
+				indicator: 'blue',
+			});
+
+			frappe.realtime.off('bank_reconcile_report_progress');
+			frappe.realtime.on('bank_reconcile_report_progress', function (data) {
+				if (data.key !== key) {
+					return;
+				}
+
+				if (data.error) {
+					frappe.realtime.off('bank_reconcile_report_progress');
+					frappe.hide_progress();
+					frappe.msgprint(__('Report failed, please check the Error Log'));
+					return;
+				}
+
+				frappe.show_progress(__('Bank Reconcile Report'), data.percent, 100, data.message);
+
+				if (data.done) {
+					frappe.realtime.off('bank_reconcile_report_progress');
+					frappe.hide_progress();
+					// Picks up the cached result
+					report.refresh();
+				}
+			});
+		},
+	});
+}
+
+function run_company_reconciliation(report) {
+	const filters = report.get_filter_values();
+	if (!filters.company) {
+		frappe.msgprint(__('Please select Company first'));
+		return;
+	}
+
+	frappe.call({
+		method: 'bank_management.bank_management.report.bank_reconcile_report.company_run.enqueue_company_run',
+		args: {
+			filters: filters,
+		},
+		callback: function (r) {
+			if (r.exc || !r.message) {
+				return;
+			}
+
+			const run_id = r.message.run_id;
+			const total = r.message.accounts;
+			frappe.show_progress(__('Reconciling Bank Accounts'), 0, total, __('Queued'));
+
+			const show_result = function () {
+				frappe.call({
+					method: 'bank_management.bank_management.report.bank_reconcile_report.company_run.get_company_run',
+					args: { run_id: run_id },
+					callback: function (res) {
+						if (!res.message) {
+							return;
+						}
+						clearInterval(poll);
+						frappe.realtime.off('bank_reconcile_company_run');
+						frappe.hide_progress();
+						show_company_run_result(res.message);
+					},
+				});
+			};
+
+			// A run whose jobs stopped without finishing is merged by get_company_run
+			const poll = setInterval(show_result, 5 * 60 * 1000);
+
+			frappe.realtime.off('bank_reconcile_company_run');
+			frappe.realtime.on('bank_reconcile_company_run', function (data) {
+				if (data.run_id !== run_id) {
+					return;
+				}
+
+				if (!data.done) {
+					const done_count = total - data.pending;
+					frappe.show_progress(
+						__('Reconciling Bank Accounts'),
+						done_count,
+						total,
+						__('{0} of {1} accounts done', [done_count, total]),
+					);
+					return;
+				}
+
+				show_result();
+			});
+		},
+	});
+}
+
+function show_company_run_result(result) {
+	const rows = result.accounts
+		.map(function (d) {
+			if (d.error) {
+				return `<tr><td>${frappe.utils.escape_html(d.bank_account)}</td>
+					<td colspan="5" class="text-danger">${frappe.utils.escape_html(d.error)}</td></tr>`;
+			}
+			return `<tr>
+				<td>${frappe.utils.escape_html(d.bank_account)}</td>
+				<td class="text-right">${d.matched}</td>
+				<td class="text-right">${d.unmatched_bank_transactions}</td>
+				<td class="text-right">${d.unmatched_vouchers}</td>
+				<td class="text-right">${format_currency(d.difference, d.currency)}</td>
+				<td class="text-right">${format_currency(d.closing_balance, d.currency)}</td>
+			</tr>`;
+		})
+		.join('');
+
+	const totals = result.totals;
+	const missing = (result.missing || []).length
+		? `<p class="text-danger">${__('{0} account(s) did not finish, totals are partial', [result.missing.length])}</p>`
+		: '';
+	const dialog = new frappe.ui.Dialog({
+		title: __('Company Reconciliation'),
+		size: 'extra-large',
+		fields: [{ fieldtype: 'HTML', fieldname: 'summary' }],
+	});
+	dialog.fields_dict.summary.$wrapper.html(`
+		${missing}
+		<table class="table table-bordered table-sm">
+			<thead><tr>
+				<th>${__('Bank Account')}</th>
+				<th class="text-right">${__('Matched')}</th>
+				<th class="text-right">${__('Unmatched Bank Transactions')}</th>
+				<th class="text-right">${__('Unmatched Vouchers')}</th>
+				<th class="text-right">${__('Difference')}</th>
+				<th class="text-right">${__('Closing Balance')}</th>
+			</tr></thead>
+			<tbody>${rows}</tbody>
+			<tfoot><tr class="font-weight-bold">
+				<td>${__('Total')}</td>
+				<td class="text-right">${totals.matched}</td>
+				<td class="text-right">${totals.unmatched_bank_transactions}</td>
+				<td class="text-right">${totals.unmatched_vouchers}</td>
+				<td class="text-right">${format_number(totals.difference)}</td>
+				<td></td>
+			</tr></tfoot>
+		</table>
+	`);
+	dialog.show();
+}
+
+function run_auto_reconcile(report) {
+	const filters = report.get_filter_values();
+	const method =
+		'bank_management.bank_management.report.bank_reconcile_report.auto_reconcile.run_auto_reconcile';
+
+	// Dry run first, list the exact matches before reconciling anything
+	frappe.call({
+		method: method,
+		args: { filters: filters, dry_run: 1 },
+		freeze: true,
+		freeze_message: __('Finding exact matches...'),
+		callback: function (r) {
+			if (r.exc || !r.message) {
+				return;
+			}
+
+			const stats = r.message;
+			if (!stats.matched) {
+				frappe.msgprint(
+					__('No exact matches found in {0} unreconciled Bank Transaction(s)', [
+						stats.candidates,
+					]),
+				);
+				return;
+			}
+
+			const rows = stats.matches
+				.map(function (d) {
+					return `<tr>
+						<td>${frappe.utils.escape_html(d.bank_transaction)}</td>
+						<td>${frappe.datetime.str_to_user(d.date)}</td>
+						<td>${frappe.utils.escape_html(d.reference_number)}</td>
+						<td class="text-right">${format_number(d.amount)}</td>
+						<td>${__(d.voucher_doc_type)} ${frappe.utils.escape_html(d.voucher_name)}</td>
+					</tr>`;
+				})
+				.join('');
+
+			const dialog = new frappe.ui.Dialog({
+				title: __('Auto Reconcile: {0} exact match(es)', [stats.matched]),
+				size: 'extra-large',
+				fields: [{ fieldtype: 'HTML', fieldname: 'matches' }],
+				primary_action_label: __('Reconcile {0}', [stats.matched]),
+				primary_action: function () {
+					dialog.hide();
+					frappe.call({
+						method: method,
+						args: { filters: filters, dry_run: 0 },
+						callback: function (res) {
+							if (!res.exc) {
+								frappe.show_alert({
+									message: __('Auto reconcile queued'),
+									indicator: 'blue',
+								});
+							}
+						},
+					});
+				},
+			});
+			dialog.fields_dict.matches.$wrapper.html(`
+				<table class="table table-bordered table-sm">
+					<thead><tr>
+						<th>${__('Bank Transaction')}</th>
+						<th>${__('Date')}</th>
+						<th>${__('Reference')}</th>
+						<th class="text-right">${__('Amount')}</th>
+						<th>${__('Voucher')}</th>
+					</tr></thead>
+					<tbody>${rows}</tbody>
+				</table>
+			`);
+			dialog.show();
+		},
+	});
+}
+
+function show_match_suggestions(report) {
+	frappe.call({
+		method: 'bank_management.bank_management.report.bank_reconcile_report.scoring.get_match_suggestions',
+		args: {
+			filters: report.get_filter_values(),
+		},
+		freeze: true,
+		freeze_message: __('Scoring candidates...'),
+		callback: function (r) {
+			if (r.exc || !r.message) {
+				return;
+			}
+
+			const rows = [];
+			Object.keys(r.message).forEach(function (bt_name) {
+				r.message[bt_name].forEach(function (d, i) {
+					rows.push(`<tr>
+						<td>${i === 0 ? frappe.utils.escape_html(bt_name) : ''}</td>
+						<td>${__(d.doctype)} ${frappe.utils.escape_html(d.name)}</td>
+						<td>${frappe.datetime.str_to_user(d.posting_date)}</td>
+						<td class="text-right">${format_number(d.amount)}</td>
+						<td>${frappe.utils.escape_html(d.party || '')}</td>
+						<td class="text-right">${d.score}%</td>
+					</tr>`);
+				});
+			});
+
+			if (rows.length === 0) {
+				frappe.msgprint(__('No suggestions found for the unreconciled Bank Transactions'));
+				return;
+			}
+
+			const dialog = new frappe.ui.Dialog({
+				title: __('Match Suggestions'),
+				size: 'extra-large',
+				fields: [{ fieldtype: 'HTML', fieldname: 'suggestions' }],
+			});
+			dialog.fields_dict.suggestions.$wrapper.html(`
+				<table class="table table-bordered table-sm">
+					<thead><tr>
+						<th>${__('Bank Transaction')}</th>
+						<th>${__('Voucher')}</th>
+						<th>${__('Date')}</th>
+						<th class="text-right">${__('Amount')}</th>
+						<th>${__('Party')}</th>
+						<th class="text-right">${__('Score')}</th>
+					</tr></thead>
+					<tbody>${rows.join('')}</tbody>
+				</table>
+			`);
+			dialog.show();
+		},
+	});
+}
+
+function show_group_matches(report) {
+	const method_path = 'bank_management.bank_management.report.bank_reconcile_report.group_matching.';
+
+	frappe.call({
+		method: method_path + 'get_group_suggestions',
+		args: {
+			filters: report.get_filter_values(),
+		},
+		freeze: true,
+		freeze_message: __('Searching voucher groups...'),
+		callback: function (r) {
+			if (r.exc || !r.message) {
+				return;
+			}
+
+			const groups = r.message;
+			if (groups.length === 0) {
+				frappe.msgprint(__('No grouped matches found'));
+				return;
+			}
+
+			const describe = function (items, label) {
+				return items
+					.map(
+						(d) =>
+							`${label(d)} <span class="text-muted">${format_number(d.amount)}</span>`,
+					)
+					.join('<br>');
+			};
+			const rows = groups
+				.map(function (group, i) {
+					return `<tr>
+						<td><input type="checkbox" class="group-check" data-idx="${i}" checked></td>
+						<td>${__(group.type)}</td>
+						<td>${describe(group.bank_transactions, (d) => frappe.utils.escape_html(d.name))}</td>
+						<td>${describe(group.vouchers, (d) => `${__(d.doctype)} ${frappe.utils.escape_html(d.name)}`)}</td>
+					</tr>`;
+				})
+				.join('');
+
+			const dialog = new frappe.ui.Dialog({
+				title: __('Group Matches'),
+				size: 'extra-large',
+				fields: [{ fieldtype: 'HTML', fieldname: 'groups' }],
+				primary_action_label: __('Reconcile Selected Groups'),
+				primary_action: function () {
+					const selected = [];
+					dialog.$wrapper.find('.group-check:checked').each(function () {
+						selected.push(groups[$(this).data('idx')]);
+					});
+					if (selected.length === 0) {
+						return;
+					}
+
+					frappe.call({
+						method: method_path + 'reconcile_groups',
+						args: { groups: selected },
+						freeze: true,
+						freeze_message: __('Reconciling...'),
+						callback: function (res) {
+							if (res.exc || !res.message) {
+								return;
+							}
+							dialog.hide();
+							frappe.show_alert({
+								message: __('Reconciled {0} of {1} group(s)', [
+									res.message.reconciled_count,
+									selected.length,
+								]),
+								indicator: 'green',
+							});
+							const errors = res.message.results.filter((d) => d.status !== 'Reconciled');
+							if (errors.length > 0) {
+								frappe.msgprint(
+									errors.map((d) => frappe.utils.escape_html(d.message)).join('<br>'),
+								);
+							}
+							frappe.query_report.refresh();
+						},
+					});
+				},
+			});
+			dialog.fields_dict.groups.$wrapper.html(`
+				<table class="table table-bordered table-sm">
+					<thead><tr>
+						<th></th>
+						<th>${__('Type')}</th>
+						<th>${__('Bank Transactions')}</th>
+						<th>${__('Vouchers')}</th>
+					</tr></thead>
+					<tbody>${rows}</tbody>
+				</table>
+			`);
+			dialog.show();
+		},
+	});
+}
+
 function open_general_ledger(report) {
 	const filters = report.get_filter_values();
 
@@ -658,8 +1277,8 @@ function bulk_reconcile_selected(report) {
 	const checked_rows = [];
 
 	// Get checked rows from datatable
-	if (report.datatable && report.datatable.dt) {
-		const checked_indexes = report.datatable.dt.getCheckedRows();
+	if (report.datatable) {
+		const checked_indexes = report.datatable.rowmanager.getCheckedRows();
 		checked_indexes.forEach((idx) => {
 			if (data[idx]) {
 				checked_rows.push(data[idx]);
@@ -672,55 +1291,50 @@ function bulk_reconcile_selected(report) {
 		return;
 	}
 
-	const bank_transactions = [...new Set(checked_rows.map((row) => row.bt_name).filter(Boolean))];
-	const vouchers = [];
-
-	checked_rows.forEach((row) => {
-		if (row.voucher_name && row.voucher_doc_type) {
-			vouchers.push({
-				document_type: row.voucher_doc_type,
-				payment_entry: row.voucher_name,
-				paid_amount: row.voucher_amount || 0,
-			});
-		}
-	});
+	// One (Bank Transaction, voucher) pair per row, rows already linked are skipped
+	const rows = checked_rows
+		.filter((row) => row.bt_name && row.voucher_name && row.voucher_doc_type && cint(row.actions) & ROW_ACTIONS.reconcile)
+		.map((row) => ({
+			bank_transaction: row.bt_name,
+			voucher_doc_type: row.voucher_doc_type,
+			voucher_name: row.voucher_name,
+		}));
 
-	if (bank_transactions.length === 0) {
-		frappe.msgprint(__('Please select at least one Bank Transaction'));
+	if (rows.length === 0) {
+		frappe.msgprint(__('Please select rows with a Bank Transaction and a matched voucher'));
 		return;
 	}
 
-	if (vouchers.length === 0) {
-		frappe.msgprint(__('Please select rows with vouchers'));
-		return;
-	}
+	frappe.confirm(__('Reconcile {0} row(s)?', [rows.length]), function () {
+		frappe.call({
+			method: 'bank_management.bank_management.doctype.bank_reconcile.bank_reconcile.reconcile_selected',
+			args: {
+				rows: rows,
+			},
+			freeze: true,
+			freeze_message: __('Reconciling...'),
+			callback: function (r) {
+				if (r.exc || !r.message) {
+					return;
+				}
 
-	frappe.confirm(
-		__('Reconcile {0} bank transaction(s) with {1} voucher(s)?', [
-			bank_transactions.length,
-			vouchers.length,
-		]),
-		function () {
-			frappe.call({
-				method: 'bank_management.bank_management.doctype.bank_reconcile.bank_reconcile.reconcile_selected',
-				args: {
-					bank_transactions: bank_transactions,
-					vouchers: vouchers,
-				},
-				freeze: true,
-				freeze_message: __('Reconciling...'),
-				callback: function (r) {
-					if (!r.exc) {
-						frappe.show_alert({
-							message: __('Reconciled {0} transactions', [
-								r.message.reconciled_count || 0,
-							]),
-							indicator: 'green',
-						});
-						frappe.query_report.refresh();
-					}
-				},
-			});
-		},
-	);
+				frappe.show_alert({
+					message: __('Reconciled {0} transactions', [r.message.reconciled_count || 0]),
+					indicator: 'green',
+				});
+
+				const errors = r.message.results.filter((d) => d.status !== 'Reconciled');
+				if (errors.length > 0) {
+					frappe.msgprint({
+						title: __('{0} row(s) not reconciled', [errors.length]),
+						message: errors
+							.map((d) => `${d.bank_transaction}: ${frappe.utils.escape_html(d.message)}`)
+							.join('<br>'),
+						indicator: 'orange',
+					});
+				}
+				frappe.query_report.refresh();
+			},
+		});
+	});
 }
@@ -5,11 +5,51 @@ import frappe
 import json
 from frappe import _
 from frappe.utils import flt, getdate, add_days
-from erpnext.accounts.report.bank_reconciliation_statement.bank_reconciliation_statement import (
-    get_amounts_not_reflected_in_system,
-    get_entries,
+from bank_management.metadata import (
+    get_account_details,
+    get_bank_account_details,
+    get_bank_accounts_for_gl,
 )
-from erpnext.accounts.utils import get_account_currency, get_balance_on
+from bank_management.references import normalize_reference
+from bank_management.trigram_index import get_search_condition
+from bank_management.bank_management.doctype.bank_balance_checkpoint.bank_balance_checkpoint import (
+    get_amounts_not_reflected,
+    get_checkpoint_balance,
+    get_checkpoint_uncleared_amount,
+)
+from bank_management.bank_management.report.bank_reconcile_report.columnar import (
+    encode_rows,
+    get_columnar_data,
+)
+from bank_management.bank_management.report.bank_reconcile_report.matching import get_fuzzy_matches
+from bank_management.bank_management.report.bank_reconcile_report.match_state import (
+    MATCH_STATE_COLUMNS,
+    enqueue_update,
+    get_cleared_matches,
+    get_match_type,
+    get_stored_matches,
+)
+from bank_management.bank_management.report.bank_reconcile_report.profiling import (
+    get_profile_message,
+    profiled,
+    profiling,
+    save_profile_log,
+)
+from bank_management.bank_management.report.bank_reconcile_report.report_cache import (
+    get_cache_key,
+    get_cached_result,
+    get_data_version,
+    set_cached_result,
+)
+
+# Rows per page in paginated mode (keep in sync with bank_reconcile_report.js)
+PAGE_LENGTH = 500
+
+# Row action flags, buttons are rendered by the formatter (keep in sync with ROW_ACTIONS in bank_reconcile_report.js)
+ACTION_RECONCILE = 1
+ACTION_CREATE_PE = 2
+ACTION_CREATE_JE = 4
+ACTION_CREATE_BT = 8
 
 
 @frappe.whitelist()
@@ -60,7 +100,7 @@ def create_bank_transaction_from_voucher(voucher_doc_type, voucher_name, bank_ac
             # Get bank account from Journal Entry
             bank_accounts = []
             for account in voucher_doc.accounts:
-                if frappe.db.get_value("Account", account.account, "account_type") == "Bank":
+                if (get_account_details(account.account) or {}).get("account_type") == "Bank":
                     bank_accounts.append(account.account)
 
             if not bank_accounts:
@@ -101,7 +141,7 @@ def create_bank_transaction_from_voucher(voucher_doc_type, voucher_name, bank_ac
         bank_transaction.withdrawal = withdrawal
         bank_transaction.reference_number = reference_number
         bank_transaction.description = f"Created from {voucher_doc_type} {voucher_name}"
-        bank_transaction.currency = frappe.get_cached_value("Bank Account", target_bank_account, "default_currency") or frappe.get_cached_value(
+        bank_transaction.currency = (get_bank_account_details(target_bank_account) or {}).get("currency") or frappe.get_cached_value(
             "Company", voucher_doc.company, "default_currency")
         bank_transaction.party_type = party_type
         bank_transaction.party = party
@@ -130,20 +170,44 @@ def create_bank_transaction_from_voucher(voucher_doc_type, voucher_name, bank_ac
 
 def get_bank_account_from_account(account):
     """Get Bank Account name from GL Account"""
-    bank_accounts = frappe.get_all(
-        "Bank Account",
-        filters={"account": account},
-        limit=1
-    )
-    return bank_accounts[0].name if bank_accounts else None
+    bank_accounts = get_bank_accounts_for_gl(account)
+    return bank_accounts[0] if bank_accounts else None
 
 
 def execute(filters=None):
     if not filters:
         filters = {}
 
+    if filters.get("profile"):
+        # Always computed, the profile is shown in the report message
+        result = get_profiled_result(filters)
+    else:
+        # Same filters and no data change since the last run: return cached result
+        result = get_cached_result(filters)
+        if not result:
+            version = get_data_version(filters)
+            result = get_report_result(filters)
+            set_cached_result(filters, result, version)
+
+    if filters.get("columnar"):
+        # Rows encoded per column, decoded by the report JS
+        columns, data, message, chart, report_summary = result
+        result = columns, get_columnar_data(data), message, chart, report_summary
+
+    return result
+
+
+def get_report_result(filters, publish_progress=None):
     columns = get_columns(filters)
-    data = get_data(filters)
+    if filters.get("paginate"):
+        # First page only, further pages are loaded by the report JS (get_data_page).
+        # Rows stay row dicts here, execute() encodes them in columnar mode
+        data = get_data_page(frappe._dict(filters, columnar=0)).get("data")
+    else:
+        data = get_data(filters)
+
+    if publish_progress:
+        publish_progress(80, _("Calculating balances..."))
 
     # Calculate report summary (closing balances)
     report_summary = get_report_summary(filters, data)
@@ -151,6 +215,73 @@ def execute(filters=None):
     return columns, data, None, None, report_summary
 
 
+def get_profiled_result(filters):
+    """Report result with the per-phase profile in the message, stored as Bank Reconcile Profile Log"""
+    version = get_data_version(filters)
+    with profiling() as profile:
+        result = get_report_result(filters)
+    set_cached_result(filters, result, version)
+
+    columns, data, message, chart, report_summary = result
+    log_name = save_profile_log(filters, profile.result, len(data))
+    return columns, data, get_profile_message(profile.result, log_name), chart, report_summary
+
+
+@frappe.whitelist()
+def enqueue_report(filters):
+    """
+    Run the report in a background job. The result is cached under the filters and
+    the data-version stamp, progress and completion are pushed via realtime events
+    (bank_reconcile_report_progress). Re-running the report then returns the cached result.
+    """
+    if isinstance(filters, str):
+        filters = json.loads(filters)
+    filters = frappe._dict(filters or {})
+    frappe.has_permission("Bank Transaction", "read", throw=True)
+
+    if get_cached_result(filters):
+        return {"cached": True}
+
+    cache_key = get_cache_key(filters)
+    frappe.enqueue(
+        run_report_job,
+        queue="long",
+        timeout=3600,
+        job_id=cache_key,
+        deduplicate=True,
+        filters=filters,
+        cache_key=cache_key,
+        user=frappe.session.user
+    )
+
+    return {"cached": False, "key": cache_key}
+
+
+def run_report_job(filters, cache_key, user):
+    """Background job: build and cache the report result for filters"""
+    def publish_progress(percent, message, done=False):
+        frappe.publish_realtime(
+            "bank_reconcile_report_progress",
+            {"key": cache_key, "percent": percent, "message": message, "done": done},
+            user=user
+        )
+
+    try:
+        publish_progress(5, _("Loading Bank Transactions..."))
+        version = get_data_version(filters)
+        result = get_report_result(frappe._dict(filters), publish_progress)
+        set_cached_result(filters, result, version)
+        publish_progress(100, _("Report ready"), done=True)
+    except Exception:
+        frappe.log_error(
+            "[bank_reconcile_report.py] method: run_report_job", "Bank Reconcile Report")
+        frappe.publish_realtime(
+            "bank_reconcile_report_progress",
+            {"key": cache_key, "error": True, "done": True},
+            user=user
+        )
+
+
 def get_columns(filters):
     columns = [
         {
@@ -220,11 +351,17 @@ def get_columns(filters):
             "label": "Voucher Party",
             "fieldtype": "Data"
         },
+        {
+            "fieldname": "match_confidence",
+            "label": "Match Confidence",
+            "fieldtype": "Percent"
+        },
         {
             "fieldname": "reconciled_status",
             "label": "Status",
             "fieldtype": "Data"
         },
+        # Button columns carry no row values, the formatter renders them from the row actions flags
         {
             "fieldname": "btn_reconcile",
             "label": "Reconcile",
@@ -252,17 +389,79 @@ def get_columns(filters):
 
 
 def get_data(filters):
-    data = []
+    bank_transactions = get_bank_transactions(filters)
+
+    # Track all matched vouchers to exclude them when showing unmatched
+    all_matched_vouchers = set()
+
+    # First: Show all Bank Transactions with matched vouchers (one row per BT with matched voucher)
+    data = get_bank_transaction_rows(
+        bank_transactions, filters, all_matched_vouchers)
 
-    # Get Bank Transactions
-    bt_filters = {
-        "docstatus": 1
+    # Second & Third: Show unmatched Payment Entries and Journal Entries
+    data.extend(get_unmatched_voucher_rows(filters, all_matched_vouchers))
+
+    return data
+
+
+@frappe.whitelist()
+def get_data_page(filters, after=None, page_length=None):
+    """
+    Get one page of report rows using a keyset cursor on (date desc, reference_number, name).
+
+    `after` is the last Bank Transaction of the previous page. Matching only runs for
+    the Bank Transactions of the requested page. Unmatched vouchers are appended once
+    the Bank Transactions are exhausted, without matching the earlier pages again:
+    their matches are read from the match state. With the columnar filter the rows are
+    returned encoded per column (columnar.encode_rows).
+    """
+    if isinstance(filters, str):
+        filters = json.loads(filters)
+    filters = frappe._dict(filters or {})
+    frappe.has_permission("Bank Transaction", "read", throw=True)
+
+    page_length = int(page_length or PAGE_LENGTH)
+
+    cursor = None
+    if after:
+        cursor = frappe.db.get_value(
+            "Bank Transaction", after, ["date", "reference_number", "name"], as_dict=True)
+
+    bank_transactions = get_bank_transactions(
+        filters, cursor=cursor, page_length=page_length)
+
+    matched_vouchers = set()
+    data = get_bank_transaction_rows(bank_transactions, filters, matched_vouchers)
+
+    has_more = len(bank_transactions) == page_length
+    if not has_more:
+        # Vouchers matched on earlier pages are excluded by the anti-joins of the
+        # unmatched voucher queries (linked and stored matches), only this page is passed
+        data.extend(get_unmatched_voucher_rows(filters, matched_vouchers))
+
+    return {
+        "data": encode_rows(data) if filters.get("columnar") else data,
+        "last": bank_transactions[-1].name if bank_transactions else None,
+        "has_more": has_more
     }
 
+
+@profiled("bank_transactions")
+def get_bank_transactions(filters, cursor=None, page_length=None):
+    """
+    Get submitted Bank Transactions for the report filters ordered by
+    date desc, reference_number, name. With `cursor` (date, reference_number, name
+    of the last row of the previous page) only rows after it are returned.
+    """
+    conditions = ["bt.docstatus = 1"]
+    values = {}
+
     if filters.get("company"):
-        bt_filters["company"] = filters.get("company")
+        conditions.append("bt.company = %(company)s")
+        values["company"] = filters.get("company")
     if filters.get("bank_account"):
-        bt_filters["bank_account"] = filters.get("bank_account")
+        conditions.append("bt.bank_account = %(bank_account)s")
+        values["bank_account"] = filters.get("bank_account")
 
     # Use bank_statement_from_date/to_date or fallback to from_date/to_date
     from_date = filters.get(
@@ -270,70 +469,145 @@ def get_data(filters):
     to_date = filters.get(
         "bank_statement_to_date") or filters.get("to_date")
 
-    if from_date and to_date:
-        bt_filters["date"] = ["between", [from_date, to_date]]
-    elif from_date:
-        bt_filters["date"] = [">=", from_date]
-    elif to_date:
-        bt_filters["date"] = ["<=", to_date]
+    if from_date:
+        conditions.append("bt.date >= %(from_date)s")
+        values["from_date"] = from_date
+    if to_date:
+        conditions.append("bt.date <= %(to_date)s")
+        values["to_date"] = to_date
 
     # Filter by reference date if enabled
     if filters.get("filter_by_reference_date"):
-        from_ref_date = filters.get("from_reference_date")
-        to_ref_date = filters.get("to_reference_date")
-        if from_ref_date:
-            bt_filters["reference_date"] = [">=", from_ref_date]
-        if to_ref_date:
-            if "reference_date" in bt_filters and isinstance(bt_filters["reference_date"], list):
-                bt_filters["reference_date"].append(["<=", to_ref_date])
-            else:
-                bt_filters["reference_date"] = ["<=", to_ref_date]
+        if filters.get("from_reference_date"):
+            conditions.append("bt.reference_date >= %(from_reference_date)s")
+            values["from_reference_date"] = filters.get("from_reference_date")
+        if filters.get("to_reference_date"):
+            conditions.append("bt.reference_date <= %(to_reference_date)s")
+            values["to_reference_date"] = filters.get("to_reference_date")
+
+    # Indexed equality on the normalized reference, or substring (trigram index)
     if filters.get("reference_number"):
-        bt_filters["reference_number"] = [
-            "like", f"%{filters.get('reference_number')}%"]
+        search = get_search_condition(
+            "reference_number", filters.get("reference_number"), values, filters.get("bank_account"))
+        reference_key = normalize_reference(filters.get("reference_number"))
+        if reference_key:
+            conditions.append(f"(bt.custom_normalized_reference = %(reference_key)s OR {search})")
+            values["reference_key"] = reference_key
+        else:
+            conditions.append(search)
+
+    if filters.get("description"):
+        conditions.append(get_search_condition(
+            "description", filters.get("description"), values, filters.get("bank_account")))
 
     # Filter by created_by
     if filters.get("created_by"):
-        bt_filters["owner"] = filters.get("created_by")
+        conditions.append("bt.owner = %(created_by)s")
+        values["created_by"] = filters.get("created_by")
 
     # Filter by reconciliation status (if exists, keep for backward compatibility)
-    if filters.get("reconciliation_status"):
-        if filters.get("reconciliation_status") == "Reconciled":
-            bt_filters["status"] = "Reconciled"
-        elif filters.get("reconciliation_status") == "Unreconciled":
-            bt_filters["status"] = ["in", ["Pending", "Unreconciled"]]
-            bt_filters["unallocated_amount"] = [">", 0]
-
     # Filter: Show Unmatched Vouchers - only show Unreconciled Bank Transactions
-    if filters.get("show_unmatched_vouchers"):
-        bt_filters["status"] = ["in", ["Pending", "Unreconciled"]]
-        bt_filters["unallocated_amount"] = [">", 0]
-
-    bank_transactions = frappe.get_all(
-        "Bank Transaction",
-        fields=[
-            "name",
-            "date",
-            "deposit",
-            "withdrawal",
-            "reference_number",
-            "unallocated_amount",
-            "allocated_amount",
-            "status",
-            "party",
-            "party_type",
-            "currency",
-            "bank_account",
-            "company"
-        ],
-        filters=bt_filters,
-        order_by="date desc, reference_number"
-    )
+    if filters.get("show_unmatched_vouchers") or filters.get("reconciliation_status") == "Unreconciled":
+        conditions.append(
+            "bt.status IN ('Pending', 'Unreconciled') AND bt.unallocated_amount > 0")
+    elif filters.get("reconciliation_status") == "Reconciled":
+        conditions.append("bt.status = 'Reconciled'")
+
+    # Keyset cursor: rows after (date, reference_number, name) in report order
+    if cursor:
+        conditions.append("""(
+            bt.date < %(cursor_date)s
+            OR (bt.date = %(cursor_date)s AND (
+                {reference_after}
+                OR (bt.reference_number <=> %(cursor_reference)s AND bt.name > %(cursor_name)s)
+            ))
+        )""".format(
+            reference_after="bt.reference_number > %(cursor_reference)s" if cursor.reference_number is not None
+            else "bt.reference_number IS NOT NULL"
+        ))
+        values.update({
+            "cursor_date": cursor.date,
+            "cursor_reference": cursor.reference_number,
+            "cursor_name": cursor.name
+        })
+
+    limit = f"LIMIT {int(page_length)}" if page_length else ""
+
+    return frappe.db.sql("""
+        SELECT
+            bt.name,
+            bt.date,
+            bt.deposit,
+            bt.withdrawal,
+            bt.reference_number,
+            bt.unallocated_amount,
+            bt.allocated_amount,
+            bt.status,
+            bt.party,
+            bt.party_type,
+            bt.currency,
+            bt.bank_account,
+            bt.company,
+            {match_state_columns}
+        FROM `tabBank Transaction` bt
+        LEFT JOIN `tabBank Match State` ms ON ms.name = bt.name
+        WHERE {conditions}
+        ORDER BY bt.date DESC, bt.reference_number, bt.name
+        {limit}
+    """.format(
+        match_state_columns=MATCH_STATE_COLUMNS,
+        conditions=" AND ".join(conditions),
+        limit=limit
+    ), values, as_dict=True)
+
+
+def get_bank_transaction_matches(bank_transactions, filters):
+    """
+    Bank Transaction name -> matched voucher (or None) of Bank Transactions
+    selected by get_bank_transactions: the stored match state, the matching
+    rules run in one batch for Bank Transactions without state or whose stored
+    voucher has been cleared since (their bank accounts are stored again in the
+    background).
+
+    The state holds reference matches without voucher date window: with a window
+    in the filters, reference matches posted outside of it and Bank Transactions
+    with a reference but no match are resolved again within it. A stored match
+    posted within the window stands: it is the first voucher of its reference
+    overall, so also the first one within the window.
+    """
+    matched_vouchers, missing = get_stored_matches(bank_transactions)
 
-    # Track all matched vouchers to exclude them when showing unmatched
-    all_matched_vouchers = set()
+    cleared = get_cleared_matches(matched_vouchers)
+    missing += [bt for bt in bank_transactions if bt.name in cleared]
+    if missing:
+        matched_vouchers.update(get_matched_vouchers(missing, frappe._dict()))
+        enqueue_update({bt.bank_account for bt in missing})
+
+    from_date = filters.get("bank_statement_from_date") or filters.get("from_date")
+    to_date = filters.get("bank_statement_to_date") or filters.get("to_date")
+    if from_date or to_date:
+        outside = []
+        for bt in bank_transactions:
+            voucher = matched_vouchers.get(bt.name)
+            match_type = get_match_type(voucher)
+            if match_type == "Reference":
+                posting_date = getdate(voucher["posting_date"])
+                if (from_date and posting_date < getdate(from_date)) or (to_date and posting_date > getdate(to_date)):
+                    outside.append(bt)
+            elif not match_type and normalize_reference(bt.reference_number):
+                outside.append(bt)
+        if outside:
+            matched_vouchers.update(get_matched_vouchers(outside, filters))
+
+    return matched_vouchers
+
+
+@profiled("matching")
+def get_bank_transaction_rows(bank_transactions, filters, all_matched_vouchers):
+    """Build report rows for Bank Transactions, adding matched vouchers to all_matched_vouchers"""
+    data = []
+    matched_vouchers = get_bank_transaction_matches(bank_transactions, filters)
 
-    # First: Show all Bank Transactions with matched vouchers (one row per BT with matched voucher)
     for bt in bank_transactions:
         base_row = {
             "bt_name": bt.name,
@@ -345,7 +619,7 @@ def get_data(filters):
         }
 
         # Get matched voucher (linked or unmatched by reference_number)
-        matched_voucher = get_matched_voucher_for_bt(bt, filters)
+        matched_voucher = matched_vouchers.get(bt.name)
 
         if matched_voucher:
             # Case 1, 2, 3: BT with matched voucher - show in same row
@@ -360,11 +634,10 @@ def get_data(filters):
                 "voucher_amount": flt(matched_voucher.get("amount", 0)),
                 "voucher_party_type": matched_voucher.get("party_type", ""),
                 "voucher_party": matched_voucher.get("party", ""),
-                "reconciled_status": get_status_emoji(bt.status, flt(bt.unallocated_amount), has_voucher=True, is_matched=matched_voucher.get("is_linked", False), row_number=1),
-                "btn_reconcile": get_reconcile_button(bt.name, flt(bt.unallocated_amount), matched_voucher.get("name"), matched_voucher.get("doctype"), bt.status) if not matched_voucher.get("is_linked", False) else "",
-                "btn_create_pe": "",
-                "btn_create_je": "",
-                "btn_create_bt": ""
+                # Only suggestions without reference number (fuzzy match) have a confidence
+                "match_confidence": matched_voucher.get("confidence"),
+                "reconciled_status": get_row_status(bt.status, flt(bt.unallocated_amount), has_voucher=True, is_matched=matched_voucher.get("is_linked", False)),
+                "actions": ACTION_RECONCILE if can_reconcile(bt, matched_voucher) else 0
             })
             data.append(row)
         else:
@@ -378,15 +651,20 @@ def get_data(filters):
                 "voucher_amount": 0,
                 "voucher_party_type": "",
                 "voucher_party": "",
-                "reconciled_status": get_status_emoji(bt.status, flt(bt.unallocated_amount), has_voucher=False, is_matched=False, row_number=1),
-                "btn_reconcile": "",  # No reconcile button when no voucher exists
-                "btn_create_pe": get_create_pe_button(bt.name, flt(bt.unallocated_amount), bt.party_type, bt.party, bt.reference_number, bt.date),
-                "btn_create_je": get_create_je_button(bt.name, flt(bt.unallocated_amount)),
-                "btn_create_bt": ""
+                "reconciled_status": get_row_status(bt.status, flt(bt.unallocated_amount), has_voucher=False, is_matched=False),
+                # No reconcile button when no voucher exists
+                "actions": ACTION_CREATE_PE | ACTION_CREATE_JE if flt(bt.unallocated_amount) > 0 else 0
             })
             data.append(row)
 
-    # Second: Show unmatched Payment Entries (Case 5)
+    return data
+
+
+def get_unmatched_voucher_rows(filters, all_matched_vouchers):
+    """Build report rows for unmatched Payment Entries (Case 5) and Journal Entries (Case 4)"""
+    data = []
+
+    # Unmatched Payment Entries (Case 5)
     unmatched_payment_entries = get_unmatched_payment_entries(
         filters, all_matched_vouchers)
     for pe in unmatched_payment_entries:
@@ -404,15 +682,12 @@ def get_data(filters):
             "voucher_amount": flt(pe.get("amount", 0)),
             "voucher_party_type": pe.get("party_type", ""),
             "voucher_party": pe.get("party", ""),
-            "reconciled_status": "❌ Unmatched",
-            "btn_reconcile": "",
-            "btn_create_pe": "",
-            "btn_create_je": "",
-            "btn_create_bt": get_create_bt_button("Payment Entry", pe.get("name"), has_bt=False)
+            "reconciled_status": "Unmatched",
+            "actions": ACTION_CREATE_BT
         }
         data.append(row)
 
-    # Third: Show unmatched Journal Entries (Case 4)
+    # Unmatched Journal Entries (Case 4)
     unmatched_journal_entries = get_unmatched_journal_entries(
         filters, all_matched_vouchers)
     for je in unmatched_journal_entries:
@@ -430,11 +705,8 @@ def get_data(filters):
             "voucher_amount": flt(je.get("amount", 0)),
             "voucher_party_type": je.get("party_type", ""),
             "voucher_party": je.get("party", ""),
-            "reconciled_status": "❌ Unmatched",
-            "btn_reconcile": "",
-            "btn_create_pe": "",
-            "btn_create_je": "",
-            "btn_create_bt": get_create_bt_button("Journal Entry", je.get("name"), has_bt=False)
+            "reconciled_status": "Unmatched",
+            "actions": ACTION_CREATE_BT
         }
         data.append(row)
 
@@ -447,239 +719,401 @@ def get_matched_voucher_for_bt(bank_transaction, filters):
     - Case 1: BT withdrawal + PE payment_type = Pay + same reference_number
     - Case 2: BT deposit + PE payment_type = Receive + same reference_number
     - Case 3: BT withdrawal + JE cheque_no + same reference_number
+    References are compared as normalized keys (bank_management.references).
     """
-    if not bank_transaction.reference_number:
-        return None
+    return get_matched_vouchers([bank_transaction], filters).get(bank_transaction.name)
 
-    try:
-        bank_account_doc = frappe.get_doc(
-            "Bank Account", bank_transaction.bank_account)
-        bank_gl_account = bank_account_doc.account
 
-        # First: Check linked vouchers
-        linked = frappe.get_all(
-            "Bank Transaction Payments",
-            filters={"parent": bank_transaction.name},
-            fields=["payment_entry", "payment_document"],
-            limit=1
-        )
-
-        if linked:
-            link = linked[0]
-            try:
-                doc = frappe.get_cached_doc(
-                    link.payment_document, link.payment_entry)
-                voucher_data = {
-                    "doctype": link.payment_document,
-                    "name": link.payment_entry,
-                    "is_linked": True
-                }
-
-                if link.payment_document == "Payment Entry":
-                    voucher_data.update({
-                        "reference_no": doc.reference_no or "",
-                        "posting_date": doc.posting_date,
-                        "amount": flt(doc.base_paid_amount_after_tax),
-                        "party_type": doc.party_type or "",
-                        "party": doc.party or ""
-                    })
-                elif link.payment_document == "Journal Entry":
-                    voucher_data.update({
-                        "reference_no": doc.cheque_no or "",
-                        "posting_date": doc.posting_date,
-                        "amount": 0,  # Will calculate from accounts
-                        "party_type": "",  # Journal Entry doesn't have party_type at document level
-                        "party": doc.pay_to_recd_from or ""
-                    })
-
-                return voucher_data
-            except:
-                pass
-
-        # Second: Check unmatched vouchers by reference_number
-        # Case 1 & 2: Payment Entry matching
-        if bank_transaction.reference_number:
-            payment_type = "Receive" if bank_transaction.deposit > 0.0 else "Pay"
-
-            pe_filters = {
-                "company": bank_transaction.company,
-                "docstatus": 1,
-                "clearance_date": ["is", "not set"],
-                "reference_no": bank_transaction.reference_number,
-                "payment_type": payment_type
-            }
+def get_matched_vouchers(bank_transactions, filters):
+    """
+    Batch version of get_matched_voucher_for_bt.
 
-            # Date filters - use SQL for better control
-            from_date = filters.get(
-                "bank_statement_from_date") or filters.get("from_date")
-            to_date = filters.get(
-                "bank_statement_to_date") or filters.get("to_date")
-
-            payment_entries = frappe.db.sql("""
-                SELECT
-                    name,
-                    posting_date,
-                    reference_no,
-                    reference_date,
-                    party,
-                    party_type,
-                    base_paid_amount_after_tax as paid_amount
-                FROM `tabPayment Entry`
-                WHERE company = %(company)s
-                    AND docstatus = 1
-                    AND (clearance_date IS NULL OR clearance_date = '')
-                    AND reference_no = %(reference_no)s
-                    AND payment_type = %(payment_type)s
-                    AND (paid_to = %(bank_account)s OR paid_from = %(bank_account)s)
-                    AND (%(from_date)s IS NULL OR posting_date >= %(from_date)s)
-                    AND (%(to_date)s IS NULL OR posting_date <= %(to_date)s)
-                LIMIT 1
-            """, {
-                "company": bank_transaction.company,
-                "reference_no": bank_transaction.reference_number,
-                "payment_type": payment_type,
-                "bank_account": bank_gl_account,
-                "from_date": from_date or None,
-                "to_date": to_date or None
-            }, as_dict=True)
-
-            if payment_entries:
-                pe = payment_entries[0]
-                # Verify matching: Case 1 or Case 2 with amount check
-                amount_match = False
-                if bank_transaction.withdrawal > 0 and payment_type == "Pay":
-                    amount_match = abs(
-                        flt(bank_transaction.withdrawal) - flt(pe.paid_amount)) < 0.01
-                elif bank_transaction.deposit > 0 and payment_type == "Receive":
-                    amount_match = abs(
-                        flt(bank_transaction.deposit) - flt(pe.paid_amount)) < 0.01
-
-                if amount_match:
-                    return {
-                        "doctype": "Payment Entry",
-                        "name": pe.name,
-                        "reference_no": pe.reference_no or "",
-                        "posting_date": pe.posting_date,
-                        "amount": flt(pe.paid_amount),
-                        "party_type": pe.party_type or "",
-                        "party": pe.party or "",
-                        "is_linked": False
-                    }
-
-        # Case 3: Journal Entry matching (only for withdrawal)
-        if bank_transaction.withdrawal > 0 and bank_transaction.reference_number:
-            journal_entries = frappe.db.sql("""
-                SELECT DISTINCT
-                    je.name,
-                    je.posting_date,
-                    je.cheque_no,
-                    je.pay_to_recd_from as party,
-                    SUM(jea.debit_in_account_currency - jea.credit_in_account_currency) as amount
-                FROM `tabJournal Entry` je
-                INNER JOIN `tabJournal Entry Account` jea ON jea.parent = je.name
-                WHERE je.company = %(company)s
-                    AND je.docstatus = 1
-                    AND je.clearance_date IS NULL
-                    AND je.voucher_type != 'Opening Entry'
-                    AND je.cheque_no = %(cheque_no)s
-                    AND jea.account = %(bank_account)s
-                    AND (je.posting_date >= %(date_from)s OR %(date_from)s IS NULL)
-                    AND (je.posting_date <= %(date_to)s OR %(date_to)s IS NULL)
-                GROUP BY je.name
-                LIMIT 1
-            """, {
-                "company": bank_transaction.company,
-                "cheque_no": bank_transaction.reference_number,
-                "bank_account": bank_gl_account,
-                "date_from": filters.get("bank_statement_from_date") or filters.get("from_date") or None,
-                "date_to": filters.get("bank_statement_to_date") or filters.get("to_date") or None
-            }, as_dict=True)
-
-            if journal_entries:
-                je = journal_entries[0]
-                # Verify amount match for Journal Entry (withdrawal only)
-                je_amount = abs(flt(je.amount))
-                bt_withdrawal = flt(bank_transaction.withdrawal)
-                amount_match = abs(bt_withdrawal - je_amount) < 0.01
-
-                if amount_match:
-                    return {
-                        "doctype": "Journal Entry",
-                        "name": je.name,
-                        "reference_no": je.cheque_no or "",
-                        "posting_date": je.posting_date,
-                        "amount": je_amount,
-                        "party_type": "",  # Journal Entry doesn't have party_type at document level
-                        "party": je.party or "",
-                        "is_linked": False
-                    }
+    Candidate Payment Entries and Journal Entries are fetched once per
+    (company, bank account) with one query per voucher type, indexed in memory
+    and every Bank Transaction is then resolved with a hash lookup.
 
-        return None
+    Bank Transactions without reference number fall back to the amount / date
+    window matcher (matching.get_fuzzy_matches), whose vouchers carry a confidence.
 
-    except Exception as e:
-        frappe.log_error(
-            "[bank_reconcile_report.py] method: get_matched_voucher_for_bt", "Bank Reconcile Report")
-        return None
+    Returns a dict of Bank Transaction name -> matched voucher (or None).
+    """
+    matched = {}
+    groups = {}
+    fuzzy_groups = {}
+
+    for bank_transaction in bank_transactions:
+        matched[bank_transaction.name] = None
+        key = (bank_transaction.company, bank_transaction.bank_account)
+        if normalize_reference(bank_transaction.reference_number):
+            groups.setdefault(key, []).append(bank_transaction)
+        else:
+            fuzzy_groups.setdefault(key, []).append(bank_transaction)
 
+    bank_gl_accounts = get_bank_gl_accounts(
+        {bank_account for (company, bank_account) in list(groups) + list(fuzzy_groups)})
 
-def get_linked_vouchers(bank_transaction_name):
-    """Get vouchers linked to bank transaction"""
-    linked = frappe.get_all(
-        "Bank Transaction Payments",
-        fields=[
-            "payment_document",
-            "payment_entry",
-            "allocated_amount"
-        ],
-        filters={"parent": bank_transaction_name},
-        order_by="creation"
-    )
+    # Prefetch vouchers already linked to the Bank Transactions
+    linked_vouchers = get_linked_voucher_map(
+        [bt for group in list(groups.values()) + list(fuzzy_groups.values()) for bt in group], bank_gl_accounts)
 
-    vouchers = []
-    for link in linked:
+    for (company, bank_account), group in groups.items():
         try:
-            doc = frappe.get_cached_doc(
-                link.payment_document, link.payment_entry)
+            bank_gl_account = bank_gl_accounts.get(bank_account)
+            references = {normalize_reference(bt.reference_number) for bt in group}
+            voucher_index = get_voucher_index(
+                company, bank_gl_account, references, filters)
 
-            voucher_data = {
-                "doctype": link.payment_document,
-                "name": link.payment_entry,
-                "amount": link.allocated_amount
-            }
+            for bank_transaction in group:
+                linked = linked_vouchers.get(bank_transaction.name)
+                matched[bank_transaction.name] = dict(linked[0]) if linked else match_voucher_from_index(
+                    bank_transaction, voucher_index)
 
-            if link.payment_document == "Payment Entry":
-                voucher_data.update({
-                    "reference_no": doc.reference_no or "",
-                    "posting_date": doc.posting_date,
-                    "party": (doc.party or "") + (" (" + doc.party_type + ")" if doc.party_type else "")
-                })
-            elif link.payment_document == "Journal Entry":
-                voucher_data.update({
-                    "reference_no": doc.cheque_no or "",
-                    "posting_date": doc.posting_date,
-                    "party": doc.pay_to_recd_from or ""
-                })
+        except Exception as e:
+            frappe.log_error(
+                "[bank_reconcile_report.py] method: get_matched_vouchers", "Bank Reconcile Report")
+
+    for (company, bank_account), group in fuzzy_groups.items():
+        try:
+            unlinked = []
+            for bank_transaction in group:
+                linked = linked_vouchers.get(bank_transaction.name)
+                if linked:
+                    matched[bank_transaction.name] = dict(linked[0])
+                else:
+                    unlinked.append(bank_transaction)
+
+            matched.update(get_fuzzy_matches(
+                unlinked, company, bank_gl_accounts.get(bank_account)))
 
-            vouchers.append(voucher_data)
         except Exception as e:
             frappe.log_error(
-                "[bank_reconcile_report.py] method: get_linked_vouchers", "Bank Reconcile Report")
+                "[bank_reconcile_report.py] method: get_matched_vouchers (fuzzy)", "Bank Reconcile Report")
+
+    return matched
+
+
+def get_bank_gl_accounts(bank_accounts):
+    """Get GL Account for each Bank Account (metadata cache)"""
+    bank_gl_accounts = {}
+    for bank_account in set(bank_accounts):
+        details = get_bank_account_details(bank_account)
+        if details:
+            bank_gl_accounts[bank_account] = details.account
+    return bank_gl_accounts
+
+
+def get_linked_voucher_map(bank_transactions, bank_gl_accounts=None):
+    """
+    Prefetch vouchers linked to Bank Transactions (Bank Transaction Payments).
+
+    All links are loaded with one query, then only the needed voucher columns
+    with one projection query per voucher type. Journal Entry amount is computed
+    in the same pass from the rows posted to the Bank Transaction's GL account.
+
+    Returns a dict of Bank Transaction name -> list of linked vouchers.
+    """
+    linked_vouchers = {bt.name: [] for bt in bank_transactions}
+    if not linked_vouchers:
+        return linked_vouchers
+
+    links = frappe.db.sql("""
+        SELECT
+            parent,
+            payment_document,
+            payment_entry,
+            allocated_amount
+        FROM `tabBank Transaction Payments`
+        WHERE parenttype = 'Bank Transaction'
+            AND parent IN %(names)s
+        ORDER BY parent, idx
+    """, {"names": tuple(linked_vouchers)}, as_dict=True)
+
+    if not links:
+        return linked_vouchers
+
+    if bank_gl_accounts is None:
+        bank_gl_accounts = get_bank_gl_accounts(
+            {bt.bank_account for bt in bank_transactions})
+    bt_gl_accounts = {
+        bt.name: bank_gl_accounts.get(bt.bank_account) for bt in bank_transactions}
+
+    voucher_names = {
+        "Payment Entry": set(),
+        "Journal Entry": set()
+    }
+    for link in links:
+        if link.payment_document in voucher_names:
+            voucher_names[link.payment_document].add(link.payment_entry)
+
+    vouchers = {}
+
+    if voucher_names["Payment Entry"]:
+        payment_entries = frappe.db.sql("""
+            SELECT
+                name,
+                reference_no,
+                posting_date,
+                base_paid_amount_after_tax as amount,
+                party_type,
+                party
+            FROM `tabPayment Entry`
+            WHERE name IN %(names)s
+        """, {"names": tuple(voucher_names["Payment Entry"])}, as_dict=True)
+
+        for pe in payment_entries:
+            vouchers[("Payment Entry", pe.name)] = {
+                "reference_no": pe.reference_no or "",
+                "posting_date": pe.posting_date,
+                "amount": flt(pe.amount),
+                "party_type": pe.party_type or "",
+                "party": pe.party or ""
+            }
+
+    if voucher_names["Journal Entry"]:
+        gl_accounts = tuple({d for d in bt_gl_accounts.values() if d}) or ("",)
+        journal_entries = frappe.db.sql("""
+            SELECT
+                je.name,
+                je.cheque_no,
+                je.posting_date,
+                je.pay_to_recd_from as party,
+                jea.account,
+                SUM(jea.debit_in_account_currency - jea.credit_in_account_currency) as amount
+            FROM `tabJournal Entry` je
+            LEFT JOIN `tabJournal Entry Account` jea
+                ON jea.parent = je.name AND jea.account IN %(accounts)s
+            WHERE je.name IN %(names)s
+            GROUP BY je.name, jea.account
+        """, {
+            "names": tuple(voucher_names["Journal Entry"]),
+            "accounts": gl_accounts
+        }, as_dict=True)
+
+        for je in journal_entries:
+            voucher = vouchers.setdefault(("Journal Entry", je.name), {
+                "reference_no": je.cheque_no or "",
+                "posting_date": je.posting_date,
+                "amounts": {},
+                "party_type": "",  # Journal Entry doesn't have party_type at document level
+                "party": je.party or ""
+            })
+            if je.account:
+                voucher["amounts"][je.account] = abs(flt(je.amount))
+
+    for link in links:
+        voucher = vouchers.get((link.payment_document, link.payment_entry))
+        if not voucher:
             continue
 
+        voucher_data = {
+            "doctype": link.payment_document,
+            "name": link.payment_entry,
+            "allocated_amount": flt(link.allocated_amount),
+            "is_linked": True
+        }
+        voucher_data.update(voucher)
+        if "amounts" in voucher_data:
+            voucher_data["amount"] = voucher_data.pop(
+                "amounts").get(bt_gl_accounts.get(link.parent), 0)
+
+        linked_vouchers[link.parent].append(voucher_data)
+
+    return linked_vouchers
+
+
+def get_amount_key(amount):
+    """Amount in cents, used as hash key for amount matching"""
+    return int(round(flt(amount) * 100))
+
+
+def get_voucher_index(company, bank_gl_account, references, filters):
+    """
+    Fetch all open Payment Entries and Journal Entries for the bank GL account,
+    filter window and given normalized references (one query per voucher type) and
+    index them by (normalized reference, payment_type) and (normalized reference,),
+    each key listing its vouchers by posting_date, name.
+    """
+    voucher_index = {
+        "Payment Entry": {},
+        "Journal Entry": {}
+    }
+
+    if not bank_gl_account or not references:
+        return voucher_index
+
+    from_date = filters.get(
+        "bank_statement_from_date") or filters.get("from_date")
+    to_date = filters.get(
+        "bank_statement_to_date") or filters.get("to_date")
+
+    # Case 1 & 2: Payment Entries
+    payment_entries = frappe.db.sql("""
+        SELECT
+            name,
+            posting_date,
+            reference_no,
+            custom_normalized_reference,
+            reference_date,
+            party,
+            party_type,
+            payment_type,
+            base_paid_amount_after_tax as paid_amount
+        FROM `tabPayment Entry`
+        WHERE company = %(company)s
+            AND docstatus = 1
+            AND (clearance_date IS NULL OR clearance_date = '')
+            AND custom_normalized_reference IN %(references)s
+            AND payment_type IN ('Receive', 'Pay')
+            AND (paid_to = %(bank_account)s OR paid_from = %(bank_account)s)
+            AND (%(from_date)s IS NULL OR posting_date >= %(from_date)s)
+            AND (%(to_date)s IS NULL OR posting_date <= %(to_date)s)
+        ORDER BY posting_date, name
+    """, {
+        "company": company,
+        "references": tuple(references),
+        "bank_account": bank_gl_account,
+        "from_date": from_date or None,
+        "to_date": to_date or None
+    }, as_dict=True)
+
+    for pe in payment_entries:
+        key = (pe.custom_normalized_reference, pe.payment_type)
+        voucher_index["Payment Entry"].setdefault(key, []).append({
+            "doctype": "Payment Entry",
+            "name": pe.name,
+            "reference_no": pe.reference_no or "",
+            "posting_date": pe.posting_date,
+            "amount": flt(pe.paid_amount),
+            "party_type": pe.party_type or "",
+            "party": pe.party or "",
+            "is_linked": False
+        })
+
+    # Case 3: Journal Entries
+    journal_entries = frappe.db.sql("""
+        SELECT
+            je.name,
+            je.posting_date,
+            je.cheque_no,
+            je.custom_normalized_reference,
+            je.pay_to_recd_from as party,
+            SUM(jea.debit_in_account_currency - jea.credit_in_account_currency) as amount
+        FROM `tabJournal Entry` je
+        INNER JOIN `tabJournal Entry Account` jea ON jea.parent = je.name
+        WHERE je.company = %(company)s
+            AND je.docstatus = 1
+            AND je.clearance_date IS NULL
+            AND je.voucher_type != 'Opening Entry'
+            AND je.custom_normalized_reference IN %(references)s
+            AND jea.account = %(bank_account)s
+            AND (je.posting_date >= %(date_from)s OR %(date_from)s IS NULL)
+            AND (je.posting_date <= %(date_to)s OR %(date_to)s IS NULL)
+        GROUP BY je.name
+        ORDER BY je.posting_date, je.name
+    """, {
+        "company": company,
+        "references": tuple(references),
+        "bank_account": bank_gl_account,
+        "date_from": from_date or None,
+        "date_to": to_date or None
+    }, as_dict=True)
+
+    for je in journal_entries:
+        je_amount = abs(flt(je.amount))
+        key = (je.custom_normalized_reference,)
+        voucher_index["Journal Entry"].setdefault(key, []).append({
+            "doctype": "Journal Entry",
+            "name": je.name,
+            "reference_no": je.cheque_no or "",
+            "posting_date": je.posting_date,
+            "amount": je_amount,
+            "party_type": "",  # Journal Entry doesn't have party_type at document level
+            "party": je.party or "",
+            "is_linked": False
+        })
+
+    return voucher_index
+
+
+def lookup_voucher(index, key, amount):
+    """
+    First voucher of key (as the single-row LIMIT 1 query took it) if its amount
+    differs by less than 0.01, None otherwise
+    """
+    vouchers = index.get(key)
+    if vouchers and abs(flt(amount) - flt(vouchers[0].get("amount"))) < 0.01:
+        return dict(vouchers[0])
+    return None
+
+
+def count_candidates(index, key, amount):
+    """Vouchers of key whose amount differs by less than 0.01"""
+    return sum(1 for voucher in index.get(key) or [] if abs(flt(amount) - flt(voucher.get("amount"))) < 0.01)
+
+
+def match_voucher_from_index(bank_transaction, voucher_index):
+    """
+    Apply the exact matching rules (Case 1/2/3) against a prefetched voucher index.
+    The match is flagged is_ambiguous when another voucher of the rules has the
+    same reference, direction and amount (never reconciled automatically).
+    """
+    reference_key = normalize_reference(bank_transaction.reference_number)
+    amount = flt(bank_transaction.deposit) or flt(bank_transaction.withdrawal)
+    if not reference_key or amount <= 0:
+        return None
+
+    # Case 1 & 2: Payment Entry matching (amount must match)
+    key = (reference_key, "Receive" if flt(bank_transaction.deposit) > 0.0 else "Pay")
+    candidates = count_candidates(voucher_index["Payment Entry"], key, amount)
+    voucher = lookup_voucher(voucher_index["Payment Entry"], key, amount)
+
+    # Case 3: Journal Entry matching (only for withdrawal)
+    if flt(bank_transaction.withdrawal) > 0:
+        withdrawal = flt(bank_transaction.withdrawal)
+        candidates += count_candidates(voucher_index["Journal Entry"], (reference_key,), withdrawal)
+        voucher = voucher or lookup_voucher(voucher_index["Journal Entry"], (reference_key,), withdrawal)
+
+    if voucher and candidates > 1:
+        voucher["is_ambiguous"] = True
+    return voucher
+
+
+def get_linked_vouchers(bank_transaction_name):
+    """Get vouchers linked to bank transaction"""
+    bank_transaction = frappe.db.get_value(
+        "Bank Transaction", bank_transaction_name, ["name", "bank_account"], as_dict=True)
+    if not bank_transaction:
+        return []
+
+    vouchers = []
+    for voucher in get_linked_voucher_map([bank_transaction]).get(bank_transaction.name, []):
+        vouchers.append({
+            "doctype": voucher["doctype"],
+            "name": voucher["name"],
+            "amount": voucher["allocated_amount"],
+            "reference_no": voucher["reference_no"],
+            "posting_date": voucher["posting_date"],
+            "party": voucher["party"] + (" (" + voucher["party_type"] + ")" if voucher["party_type"] else "")
+        })
+
     return vouchers
 
 
+@profiled("unmatched_payment_entries")
 def get_unmatched_payment_entries(filters, matched_vouchers):
     """
     Get Payment Entries that are NOT matched to any Bank Transaction (Case 5)
+
+    Payment Entries having a Bank Transaction with the same normalized reference
+    and direction, linked to a Bank Transaction or stored as match of a Bank
+    Transaction of the report range (Bank Match State) are excluded in the same
+    query (NOT EXISTS anti-joins).
     """
     try:
         if not filters.get("bank_account") or not filters.get("company"):
             return []
 
-        bank_account_doc = frappe.get_doc(
-            "Bank Account", filters.get("bank_account"))
-        bank_gl_account = bank_account_doc.account
+        bank_gl_account = (get_bank_account_details(filters.get("bank_account")) or {}).get("account")
 
         from_date = filters.get(
             "bank_statement_from_date") or filters.get("from_date")
@@ -689,27 +1123,56 @@ def get_unmatched_payment_entries(filters, matched_vouchers):
         # Use SQL for better control and to handle filters correctly
         payment_entries = frappe.db.sql("""
             SELECT
-                name,
-                posting_date,
-                reference_no,
-                reference_date,
-                party,
-                party_type,
-                payment_type,
-                base_paid_amount_after_tax as paid_amount
-            FROM `tabPayment Entry`
-            WHERE company = %(company)s
-                AND docstatus = 1
-                AND (clearance_date IS NULL OR clearance_date = '')
-                AND reference_no IS NOT NULL
-                AND reference_no != ''
-                AND (paid_to = %(bank_account)s OR paid_from = %(bank_account)s)
-                AND (%(from_date)s IS NULL OR posting_date >= %(from_date)s)
-                AND (%(to_date)s IS NULL OR posting_date <= %(to_date)s)
-            ORDER BY posting_date DESC
+                pe.name,
+                pe.posting_date,
+                pe.reference_no,
+                pe.reference_date,
+                pe.party,
+                pe.party_type,
+                pe.payment_type,
+                pe.base_paid_amount_after_tax as paid_amount
+            FROM `tabPayment Entry` pe
+            WHERE pe.company = %(company)s
+                AND pe.docstatus = 1
+                AND (pe.clearance_date IS NULL OR pe.clearance_date = '')
+                AND pe.custom_normalized_reference IS NOT NULL
+                AND pe.custom_normalized_reference != ''
+                AND (pe.paid_to = %(bank_account)s OR pe.paid_from = %(bank_account)s)
+                AND (%(from_date)s IS NULL OR pe.posting_date >= %(from_date)s)
+                AND (%(to_date)s IS NULL OR pe.posting_date <= %(to_date)s)
+                AND NOT EXISTS (
+                    SELECT 1
+                    FROM `tabBank Transaction` bt
+                    WHERE bt.custom_normalized_reference = pe.custom_normalized_reference
+                        AND bt.company = %(company)s
+                        AND bt.bank_account = %(bank_transaction_account)s
+                        AND bt.docstatus = 1
+                        AND (
+                            (bt.deposit > 0 AND pe.payment_type = 'Receive') OR
+                            (bt.withdrawal > 0 AND pe.payment_type = 'Pay')
+                        )
+                )
+                AND NOT EXISTS (
+                    SELECT 1
+                    FROM `tabBank Transaction Payments` btp
+                    WHERE btp.payment_document = 'Payment Entry'
+                        AND btp.payment_entry = pe.name
+                        AND btp.docstatus = 1
+                )
+                AND NOT EXISTS (
+                    SELECT 1
+                    FROM `tabBank Match State` ms
+                    WHERE ms.voucher_type = 'Payment Entry'
+                        AND ms.voucher_name = pe.name
+                        AND ms.bank_account = %(bank_transaction_account)s
+                        AND (%(from_date)s IS NULL OR ms.date >= %(from_date)s)
+                        AND (%(to_date)s IS NULL OR ms.date <= %(to_date)s)
+                )
+            ORDER BY pe.posting_date DESC
         """, {
             "company": filters.get("company"),
             "bank_account": bank_gl_account,
+            "bank_transaction_account": filters.get("bank_account"),
             "from_date": from_date or None,
             "to_date": to_date or None
         }, as_dict=True)
@@ -717,39 +1180,17 @@ def get_unmatched_payment_entries(filters, matched_vouchers):
         # Filter out matched vouchers
         unmatched = []
         for pe in payment_entries:
-            match_key = ("Payment Entry", pe.name)
-            if match_key not in matched_vouchers:
-                # Check if this PE has a matching BT by reference_number and payment_type
-                # Use SQL to check matching based on exact rules
-                matching_bt = frappe.db.sql("""
-                    SELECT name, deposit, withdrawal
-                    FROM `tabBank Transaction`
-                    WHERE reference_number = %(reference_no)s
-                        AND company = %(company)s
-                        AND bank_account = %(bank_account)s
-                        AND docstatus = 1
-                        AND (
-                            (deposit > 0 AND %(payment_type)s = 'Receive') OR
-                            (withdrawal > 0 AND %(payment_type)s = 'Pay')
-                        )
-                    LIMIT 1
-                """, {
-                    "reference_no": pe.reference_no,
-                    "company": filters.get("company"),
-                    "bank_account": filters.get("bank_account"),
-                    "payment_type": pe.get("payment_type", "")
-                }, as_dict=True)
-
-                # If no matching BT found, add to unmatched
-                if not matching_bt:
-                    unmatched.append({
-                        "name": pe.name,
-                        "posting_date": pe.posting_date,
-                        "reference_no": pe.reference_no or "",
-                        "amount": flt(pe.paid_amount),
-                        "party_type": pe.party_type or "",
-                        "party": pe.party or ""
-                    })
+            if ("Payment Entry", pe.name) in matched_vouchers:
+                continue
+
+            unmatched.append({
+                "name": pe.name,
+                "posting_date": pe.posting_date,
+                "reference_no": pe.reference_no or "",
+                "amount": flt(pe.paid_amount),
+                "party_type": pe.party_type or "",
+                "party": pe.party or ""
+            })
 
         return unmatched
 
@@ -759,17 +1200,21 @@ def get_unmatched_payment_entries(filters, matched_vouchers):
         return []
 
 
+@profiled("unmatched_journal_entries")
 def get_unmatched_journal_entries(filters, matched_vouchers):
     """
     Get Journal Entries that are NOT matched to any Bank Transaction (Case 4)
+
+    Journal Entries having a withdrawal Bank Transaction with the same
+    normalized reference (Case 3), linked to a Bank Transaction or stored as match
+    of a Bank Transaction of the report range (Bank Match State) are excluded in
+    the same query (NOT EXISTS anti-joins).
     """
     try:
         if not filters.get("bank_account") or not filters.get("company"):
             return []
 
-        bank_account_doc = frappe.get_doc(
-            "Bank Account", filters.get("bank_account"))
-        bank_gl_account = bank_account_doc.account
+        bank_gl_account = (get_bank_account_details(filters.get("bank_account")) or {}).get("account")
 
         from_date = filters.get(
             "bank_statement_from_date") or filters.get("from_date")
@@ -777,7 +1222,7 @@ def get_unmatched_journal_entries(filters, matched_vouchers):
             "bank_statement_to_date") or filters.get("to_date")
 
         journal_entries = frappe.db.sql("""
-            SELECT DISTINCT
+            SELECT
                 je.name,
                 je.posting_date,
                 je.cheque_no,
@@ -790,52 +1235,60 @@ def get_unmatched_journal_entries(filters, matched_vouchers):
                 AND je.docstatus = 1
                 AND je.clearance_date IS NULL
                 AND je.voucher_type != 'Opening Entry'
-                AND je.cheque_no IS NOT NULL
-                AND je.cheque_no != ''
+                AND je.custom_normalized_reference IS NOT NULL
+                AND je.custom_normalized_reference != ''
                 AND jea.account = %(bank_account)s
                 AND (je.posting_date >= %(date_from)s OR %(date_from)s IS NULL)
                 AND (je.posting_date <= %(date_to)s OR %(date_to)s IS NULL)
+                AND NOT EXISTS (
+                    SELECT 1
+                    FROM `tabBank Transaction` bt
+                    WHERE bt.custom_normalized_reference = je.custom_normalized_reference
+                        AND bt.company = %(company)s
+                        AND bt.bank_account = %(bank_transaction_account)s
+                        AND bt.docstatus = 1
+                        AND bt.withdrawal > 0
+                )
+                AND NOT EXISTS (
+                    SELECT 1
+                    FROM `tabBank Transaction Payments` btp
+                    WHERE btp.payment_document = 'Journal Entry'
+                        AND btp.payment_entry = je.name
+                        AND btp.docstatus = 1
+                )
+                AND NOT EXISTS (
+                    SELECT 1
+                    FROM `tabBank Match State` ms
+                    WHERE ms.voucher_type = 'Journal Entry'
+                        AND ms.voucher_name = je.name
+                        AND ms.bank_account = %(bank_transaction_account)s
+                        AND (ms.date >= %(date_from)s OR %(date_from)s IS NULL)
+                        AND (ms.date <= %(date_to)s OR %(date_to)s IS NULL)
+                )
             GROUP BY je.name
             ORDER BY je.posting_date DESC
         """, {
             "company": filters.get("company"),
             "bank_account": bank_gl_account,
+            "bank_transaction_account": filters.get("bank_account"),
             "date_from": from_date or None,
             "date_to": to_date or None
         }, as_dict=True)
 
-        # Filter out matched vouchers and check for matching BT
+        # Filter out matched vouchers
         unmatched = []
         for je in journal_entries:
-            match_key = ("Journal Entry", je.name)
-            if match_key not in matched_vouchers:
-                # Check if this JE has a matching BT by cheque_no
-                # JE matches BT withdrawal only (Case 3)
-                matching_bt = frappe.db.sql("""
-                    SELECT name
-                    FROM `tabBank Transaction`
-                    WHERE reference_number = %(cheque_no)s
-                        AND company = %(company)s
-                        AND bank_account = %(bank_account)s
-                        AND docstatus = 1
-                        AND withdrawal > 0
-                    LIMIT 1
-                """, {
-                    "cheque_no": je.cheque_no,
-                    "company": filters.get("company"),
-                    "bank_account": filters.get("bank_account")
-                }, as_dict=True)
-
-                # If no matching BT found, add to unmatched
-                if not matching_bt:
-                    unmatched.append({
-                        "name": je.name,
-                        "posting_date": je.posting_date,
-                        "cheque_no": je.cheque_no or "",
-                        "amount": abs(flt(je.amount)),
-                        "party_type": je.party_type or "",
-                        "party": je.party or ""
-                    })
+            if ("Journal Entry", je.name) in matched_vouchers:
+                continue
+
+            unmatched.append({
+                "name": je.name,
+                "posting_date": je.posting_date,
+                "cheque_no": je.cheque_no or "",
+                "amount": abs(flt(je.amount)),
+                "party_type": je.party_type or "",
+                "party": je.party or ""
+            })
 
         return unmatched
 
@@ -858,13 +1311,12 @@ def get_unmatched_vouchers(bank_transaction, filters):
     vouchers = []
 
     # If no reference_number, cannot match
-    if not bank_transaction.reference_number:
+    reference_key = normalize_reference(bank_transaction.reference_number)
+    if not reference_key:
         return vouchers
 
     try:
-        bank_account_doc = frappe.get_doc(
-            "Bank Account", bank_transaction.bank_account)
-        bank_gl_account = bank_account_doc.account
+        bank_gl_account = (get_bank_account_details(bank_transaction.bank_account) or {}).get("account")
 
         # Determine payment type based on deposit/withdrawal
         payment_type = "Receive" if bank_transaction.deposit > 0.0 else "Pay"
@@ -885,7 +1337,7 @@ def get_unmatched_vouchers(bank_transaction, filters):
             "company": bank_transaction.company,
             "docstatus": 1,
             "clearance_date": ["is", "not set"],
-            "reference_no": bank_transaction.reference_number,
+            "custom_normalized_reference": reference_key,
             "payment_type": ["in", [payment_type, "Internal Transfer"]]
         }
 
@@ -942,7 +1394,7 @@ def get_unmatched_vouchers(bank_transaction, filters):
 				AND je.docstatus = 1
 				AND je.clearance_date IS NULL
 				AND je.voucher_type != 'Opening Entry'
-				AND je.cheque_no = %(cheque_no)s
+				AND je.custom_normalized_reference = %(reference_key)s
 				AND jea.account = %(bank_account)s
 				AND (je.posting_date >= %(date_from)s OR %(date_from)s IS NULL)
 				AND (je.posting_date <= %(date_to)s OR %(date_to)s IS NULL)
@@ -950,7 +1402,7 @@ def get_unmatched_vouchers(bank_transaction, filters):
 			ORDER BY je.posting_date DESC
 		""", {
             "company": bank_transaction.company,
-            "cheque_no": bank_transaction.reference_number,
+            "reference_key": reference_key,
             "bank_account": bank_gl_account,
             "date_from": filters.get("bank_statement_from_date") or filters.get("from_date") or None,
             "date_to": filters.get("bank_statement_to_date") or filters.get("to_date") or None
@@ -976,143 +1428,56 @@ def get_unmatched_vouchers(bank_transaction, filters):
         return []
 
 
-def get_status_emoji(status, unallocated_amount, has_voucher=False, is_matched=False, row_number=0):
+def get_row_status(status, unallocated_amount, has_voucher=False, is_matched=False):
     """
-    Get status with emoji and number. Keep original Bank Transaction status name.
-    Colors are applied in JavaScript formatter.
+    Row status: Reconciled, Unreconciled, Pending or Unmatched.
+    Emoji and colors are applied in the JavaScript formatter.
 
     Args:
             status: Bank Transaction status (original name: Reconciled, Unreconciled, Pending)
             unallocated_amount: Unallocated amount
             has_voucher: Whether row has a voucher
             is_matched: Whether voucher is matched to Bank Transaction
-            row_number: Row number for same reference (1, 2, 3...)
     """
-    # Number emoji mapping
-    number_emoji = {
-        1: "1️⃣",
-        2: "2️⃣",
-        3: "3️⃣",
-        4: "4️⃣",
-        5: "5️⃣",
-        6: "6️⃣",
-        7: "7️⃣",
-        8: "8️⃣",
-        9: "9️⃣",
-        10: "🔟"
-    }
-
-    emoji = number_emoji.get(row_number, f"{row_number}.")
+    # If voucher exists but not matched: Unmatched
+    if has_voucher and not is_matched:
+        return "Unmatched"
 
-    # Get original status name
-    status_name = status if status else "Unreconciled"
+    if status == "Reconciled" or unallocated_amount == 0:
+        return "Reconciled"
 
-    # If voucher exists and is matched: Show status with checkmark and number
-    if has_voucher and is_matched:
-        # Status is usually "Unreconciled" (partial) or "Reconciled" (full)
-        if status == "Reconciled" or unallocated_amount == 0:
-            return f"{emoji} ✅ {status_name}"
-        else:
-            # Partially reconciled - still Unreconciled
-            return f"{emoji} {status_name}"
+    # Original Bank Transaction status (Unreconciled also when partially reconciled)
+    return status or "Unreconciled"
 
-    # If voucher exists but not matched: Show "Unmatched" with X
-    if has_voucher and not is_matched:
-        return f"❌ Unmatched"
 
-    # If no voucher: Show Bank Transaction status with appropriate emoji
-    if status == "Reconciled" or unallocated_amount == 0:
-        return f"{emoji} ✅ {status_name}"
-    elif status == "Unreconciled" and unallocated_amount > 0:
-        return f"{emoji} {status_name}"
-    else:
-        return f"{emoji} ⏳ {status_name}"
-
-
-def get_reconcile_button(bt_name, unallocated_amount, voucher_name=None, voucher_doc_type=None, status=None):
-    # Show button only if status is NOT "Reconciled"
-    if status == "Reconciled":
-        return ""
-
-    # Don't show reconcile button if no voucher is provided (Case 3)
-    # Reconcile button should only appear when there's a matched voucher to reconcile
-    if not voucher_name or not voucher_doc_type:
-        return ""
-
-    if unallocated_amount <= 0:
-        return ""
-
-    return f'<button class="btn btn-xs btn-primary reconcile-btn" data-bt="{bt_name}" data-voucher="{voucher_name}" data-doctype="{voucher_doc_type}">🔗 Reconcile</button>'
-
-
-def get_create_pe_button(bt_name, unallocated_amount, party_type, party, reference_number=None, date=None, has_voucher=False, voucher_type=None):
-    """Button to create Payment Entry - show if voucher_type is NOT Payment Entry or no voucher exists"""
-    if voucher_type == "Payment Entry":
-        return ""
-    if has_voucher and voucher_type and voucher_type != "Payment Entry":
-        # Show button even if voucher exists but it's not Payment Entry
-        pass
-    elif has_voucher:
-        return ""
-    if unallocated_amount <= 0:
-        return ""
-    # Remove party requirement check - party will be selected in dialog
-    ref_no_attr = f' data-reference-number="{reference_number}"' if reference_number else ""
-    date_attr = f' data-date="{date}"' if date else ""
-    return f'<button class="btn btn-xs btn-success create-pe-btn" data-bt="{bt_name}"{ref_no_attr}{date_attr}>➕ Payment Entry</button>'
-
-
-def get_create_je_button(bt_name, unallocated_amount, has_voucher=False, voucher_type=None):
-    """Button to create Journal Entry - show if voucher_type is NOT Journal Entry or no voucher exists"""
-    if voucher_type == "Journal Entry":
-        return ""
-    if has_voucher and voucher_type and voucher_type != "Journal Entry":
-        # Show button even if voucher exists but it's not Journal Entry
-        pass
-    elif has_voucher:
-        return ""
-    if unallocated_amount <= 0:
-        return ""
-    return f'<button class="btn btn-xs btn-info create-je-btn" data-bt="{bt_name}">📝 Journal Entry</button>'
-
-
-def get_create_bt_button(voucher_doc_type, voucher_name, has_bt=False):
-    """Button to create Bank Transaction from Payment Entry or Journal Entry - only show if bt_name is null (no Bank Transaction exists)"""
-    if has_bt:
-        return ""
-    if not voucher_doc_type or not voucher_name:
-        return ""
-    return f'<button class="btn btn-xs btn-warning create-bt-btn" data-doctype="{voucher_doc_type}" data-voucher="{voucher_name}">➕ Bank Transaction</button>'
+def can_reconcile(bank_transaction, matched_voucher):
+    """Reconcile button: suggested (not linked) voucher and amount left on a Bank Transaction not Reconciled"""
+    return (
+        not matched_voucher.get("is_linked", False)
+        and bank_transaction.status != "Reconciled"
+        and bool(matched_voucher.get("name") and matched_voucher.get("doctype"))
+        and flt(bank_transaction.unallocated_amount) > 0
+    )
 
 
 def get_account_balance(bank_account, till_date, company):
-    """Returns account balance till the specified date (from ERPNext Bank Reconciliation Tool)"""
-    account = frappe.db.get_value("Bank Account", bank_account, "account")
+    """
+    Returns account balance till the specified date (as ERPNext Bank Reconciliation Tool):
+    GL balance - uncleared vouchers + amounts not reflected in system, the first
+    two from the nearest month end checkpoints plus the vouchers after them
+    """
+    account = (get_bank_account_details(bank_account) or {}).get("account")
     if not account:
         return 0.0
 
-    filters = frappe._dict({
-        "account": account,
-        "report_date": till_date,
-        "include_pos_transactions": 1,
-        "company": company,
-    })
-
-    data = get_entries(filters)
-    balance_as_per_system = get_balance_on(
-        filters["account"], filters["report_date"])
+    balance_as_per_system = get_checkpoint_balance(account, till_date)
+    uncleared_amount = get_checkpoint_uncleared_amount(account, company, till_date)
+    amounts_not_reflected_in_system = get_amounts_not_reflected(account, company, till_date)
 
-    total_debit, total_credit = 0.0, 0.0
-    for d in data:
-        total_debit += flt(d.debit)
-        total_credit += flt(d.credit)
-
-    amounts_not_reflected_in_system = get_amounts_not_reflected_in_system(
-        filters)
-
-    return flt(balance_as_per_system) - flt(total_debit) + flt(total_credit) + amounts_not_reflected_in_system
+    return flt(balance_as_per_system) - flt(uncleared_amount) + flt(amounts_not_reflected_in_system)
 
 
+@profiled("summary")
 def get_report_summary(filters, data):
     """Calculate and return report summary with opening and closing balances"""
     summary = []
@@ -1121,12 +1486,11 @@ def get_report_summary(filters, data):
         return summary
 
     # Get account currency
-    account = frappe.db.get_value(
-        "Bank Account", filters.get("bank_account"), "account")
-    if not account:
+    bank_account_details = get_bank_account_details(filters.get("bank_account"))
+    if not bank_account_details or not bank_account_details.account:
         return summary
 
-    currency = get_account_currency(account) or frappe.db.get_value(
+    currency = bank_account_details.currency or frappe.get_cached_value(
         "Company", filters.get("company"), "default_currency")
 
     # Get account opening balance (before from_date by 1 day, like bank_reconciliation_tool)
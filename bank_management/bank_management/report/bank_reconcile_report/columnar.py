@@ -0,0 +1,65 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+"""
+Columnar response format for large report results.
+
+A list of row dicts repeats every key name in every row. In columnar mode the
+rows are sent as one array per field, and low-cardinality fields are
+dictionary encoded (distinct values once, rows hold an index). Dates are sent
+as ISO strings so the JSON encoder does not call its fallback handler per value.
+The report JS decodes the payload back into row dicts (decode_columnar_result).
+"""
+
+import datetime
+
+# Fields with few distinct values, sent as indexes into a dictionary
+DICTIONARY_FIELDS = ("voucher_doc_type", "voucher_party_type", "reconciled_status")
+
+# Key of the single row carrying the payload in execute() results
+COLUMNAR_KEY = "columnar"
+
+
+def encode_rows(rows):
+    """
+    {"length", "fields", "values": {field: [value per row]}, "dictionaries": {field: [distinct values]}}
+    Fields missing in a row are None.
+    """
+    fields = list(dict.fromkeys(key for row in rows for key in row))
+    values = {}
+    dictionaries = {}
+
+    for field in fields:
+        column = [row.get(field) for row in rows]
+        if field in DICTIONARY_FIELDS:
+            codes = {}
+            column = [codes.setdefault(value, len(codes)) for value in column]
+            dictionaries[field] = list(codes)
+        elif any(isinstance(value, datetime.date) for value in column):
+            column = [value.isoformat() if isinstance(value, datetime.date) else value for value in column]
+        values[field] = column
+
+    return {
+        "length": len(rows),
+        "fields": fields,
+        "values": values,
+        "dictionaries": dictionaries,
+    }
+
+
+def decode_rows(payload):
+    """Row dicts of an encode_rows payload"""
+    columns = []
+    for field in payload["fields"]:
+        column = payload["values"][field]
+        dictionary = payload["dictionaries"].get(field)
+        if dictionary is not None:
+            column = [dictionary[code] for code in column]
+        columns.append(column)
+
+    return [dict(zip(payload["fields"], values)) for values in zip(*columns)]
+
+
+def get_columnar_data(rows):
+    """Report data in columnar mode: a single row carrying the encoded rows"""
+    return [{COLUMNAR_KEY: encode_rows(rows)}]
@@ -0,0 +1,250 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+"""
+Company-wide reconciliation run.
+
+One background job per company bank account is enqueued on the long queue,
+so accounts are processed in parallel by the available RQ workers. Each job
+stores its account summary in a redis hash and decrements a pending counter,
+the job taking the counter to zero merges the summaries and publishes the
+result (bank_reconcile_company_run).
+
+The counter is decremented whatever happens in the job. A job that never
+finishes (worker killed) cannot decrement it: once no account has finished
+for STALE_AFTER seconds, get_company_run merges the summaries received so far
+and flags the missing accounts.
+"""
+
+import hashlib
+import json
+import time
+
+import frappe
+from frappe import _
+from frappe.utils import flt, now
+
+from bank_management.bank_management.report.bank_reconcile_report.bank_reconcile_report import get_report_result
+from bank_management.bank_management.report.bank_reconcile_report.report_cache import (
+    CACHE_EXPIRY,
+    get_cached_result,
+    get_data_version,
+    set_cached_result,
+)
+
+
+# Seconds an account job may run
+ACCOUNT_JOB_TIMEOUT = 3600
+
+# Seconds without a finished account after which a run is merged as it is
+STALE_AFTER = ACCOUNT_JOB_TIMEOUT + 300
+
+
+def get_run_key(run_id, suffix):
+    return f"bank_reconcile_report:company_run:{run_id}:{suffix}"
+
+
+@frappe.whitelist()
+def enqueue_company_run(filters):
+    """Queue one reconciliation job per bank account of the company, returns the run id"""
+    if isinstance(filters, str):
+        filters = json.loads(filters)
+    filters = frappe._dict(filters or {})
+    frappe.has_permission("Bank Transaction", "read", throw=True)
+
+    if not filters.get("company"):
+        frappe.throw(_("Company is required"))
+
+    bank_accounts = frappe.get_all(
+        "Bank Account",
+        filters={"company": filters.company,
+                 "is_company_account": 1, "disabled": 0},
+        pluck="name",
+        order_by="name"
+    )
+    if not bank_accounts:
+        frappe.throw(
+            _("No company Bank Accounts found for {0}").format(filters.company))
+
+    # Account specific filters do not apply to a company-wide run
+    for key in ("bank_account", "bank_statement_closing_balance", "paginate"):
+        filters.pop(key, None)
+
+    run_id = hashlib.sha1(
+        f"{frappe.session.user}:{now()}:{json.dumps(filters, sort_keys=True, default=str)}".encode()
+    ).hexdigest()[:16]
+
+    pending_key = frappe.cache.make_key(get_run_key(run_id, "pending"))
+    frappe.cache.set(pending_key, len(bank_accounts), ex=CACHE_EXPIRY)
+    frappe.cache.set_value(
+        get_run_key(run_id, "run"),
+        {"accounts": bank_accounts, "user": frappe.session.user},
+        expires_in_sec=CACHE_EXPIRY)
+    frappe.cache.set_value(get_run_key(run_id, "updated"), time.time(), expires_in_sec=CACHE_EXPIRY)
+
+    for bank_account in bank_accounts:
+        frappe.enqueue(
+            run_account_job,
+            queue="long",
+            timeout=ACCOUNT_JOB_TIMEOUT,
+            job_id=f"bank_reconcile_company_run::{run_id}::{bank_account}",
+            deduplicate=True,
+            run_id=run_id,
+            filters=filters,
+            bank_account=bank_account,
+            user=frappe.session.user
+        )
+
+    return {"run_id": run_id, "accounts": len(bank_accounts)}
+
+
+def run_account_job(run_id, filters, bank_account, user):
+    """Background job: reconcile one bank account and merge once all accounts are done"""
+    filters = frappe._dict(filters)
+    filters.bank_account = bank_account
+    summary = {"bank_account": bank_account, "error": _("Not finished")}
+
+    try:
+        # Reuses (and fills) the report result cache of the account
+        result = get_cached_result(filters)
+        if not result:
+            version = get_data_version(filters)
+            result = get_report_result(filters)
+            set_cached_result(filters, result, version)
+
+        summary = get_account_summary(bank_account, result)
+    except Exception as e:
+        frappe.log_error(
+            "[company_run.py] method: run_account_job", "Bank Reconcile Report")
+        summary = {"bank_account": bank_account, "error": str(e)}
+    finally:
+        # Also on job timeout, otherwise the run never completes
+        finish_account(run_id, bank_account, summary, user)
+
+
+def finish_account(run_id, bank_account, summary, user):
+    """Store the account summary, decrement the pending counter and merge after the last account"""
+    try:
+        frappe.cache.hset(get_run_key(run_id, "accounts"), bank_account, summary)
+        # Do not leak the hash if a job of the run never finishes
+        frappe.cache.expire(frappe.cache.make_key(
+            get_run_key(run_id, "accounts")), CACHE_EXPIRY)
+        frappe.cache.set_value(get_run_key(run_id, "updated"), time.time(), expires_in_sec=CACHE_EXPIRY)
+    finally:
+        pending = frappe.cache.decr(
+            frappe.cache.make_key(get_run_key(run_id, "pending")))
+
+    frappe.publish_realtime(
+        "bank_reconcile_company_run",
+        {"run_id": run_id, "pending": pending, "done": False},
+        user=user
+    )
+
+    if pending <= 0:
+        merge_company_run(run_id, user)
+
+
+def get_account_summary(bank_account, result):
+    """matched, unmatched and difference (unallocated amount) of one account report result"""
+    data = result[1]
+    report_summary = result[4] or []
+
+    summary = {
+        "bank_account": bank_account,
+        "matched": 0,
+        "unmatched_bank_transactions": 0,
+        "unmatched_vouchers": 0,
+        "difference": 0.0,
+        "closing_balance": 0.0,
+    }
+
+    for row in data:
+        if row.get("bt_name"):
+            if row.get("voucher_name"):
+                summary["matched"] += 1
+            else:
+                summary["unmatched_bank_transactions"] += 1
+
+            # Signed amount of the Bank Transaction not yet allocated to vouchers
+            sign = 1 if flt(row.get("bt_deposit")) else -1
+            summary["difference"] += sign * \
+                flt(row.get("bt_unallocated_amount"))
+        elif row.get("voucher_name"):
+            summary["unmatched_vouchers"] += 1
+
+    # Account Closing Balance (system), second entry of the report summary
+    if len(report_summary) > 1:
+        summary["closing_balance"] = flt(report_summary[1].get("value"))
+        summary["currency"] = report_summary[1].get("currency")
+
+    summary["difference"] = flt(summary["difference"], 2)
+    return summary
+
+
+def merge_company_run(run_id, user):
+    """
+    Merge the account summaries into the run result and publish it (once per run).
+    Accounts of the run without summary are flagged as missing.
+    """
+    # The last job and a stale check may both get here
+    merged_key = frappe.cache.make_key(get_run_key(run_id, "merged"))
+    if not frappe.cache.set(merged_key, 1, ex=CACHE_EXPIRY, nx=True):
+        return
+
+    accounts_key = get_run_key(run_id, "accounts")
+    summaries = frappe.cache.hgetall(accounts_key) or {}
+
+    run = frappe.cache.get_value(get_run_key(run_id, "run")) or {}
+    missing = [d for d in run.get("accounts") or [] if d not in summaries]
+    for bank_account in missing:
+        summaries[bank_account] = {"bank_account": bank_account, "error": _("Did not finish")}
+
+    summaries = sorted(summaries.values(), key=lambda d: d["bank_account"])
+
+    totals = {"matched": 0, "unmatched_bank_transactions": 0,
+              "unmatched_vouchers": 0, "difference": 0.0}
+    for summary in summaries:
+        for key in totals:
+            totals[key] += summary.get(key) or 0
+    totals["difference"] = flt(totals["difference"], 2)
+
+    result = {
+        "run_id": run_id,
+        "accounts": summaries,
+        "totals": totals,
+        "errors": [d for d in summaries if d.get("error")],
+        "missing": missing,
+    }
+
+    frappe.cache.set_value(get_run_key(run_id, "result"),
+                           result, expires_in_sec=CACHE_EXPIRY)
+    frappe.cache.delete_value(accounts_key)
+
+    frappe.publish_realtime(
+        "bank_reconcile_company_run",
+        {"run_id": run_id, "pending": 0, "done": True},
+        user=user
+    )
+
+
+@frappe.whitelist()
+def get_company_run(run_id):
+    """
+    Merged result of a company run, None while accounts are still running.
+    A stale run is merged with the accounts finished so far.
+    """
+    frappe.has_permission("Bank Transaction", "read", throw=True)
+
+    result = frappe.cache.get_value(get_run_key(run_id, "result"))
+    if result is None and is_stale(run_id):
+        run = frappe.cache.get_value(get_run_key(run_id, "run")) or {}
+        merge_company_run(run_id, run.get("user") or frappe.session.user)
+        result = frappe.cache.get_value(get_run_key(run_id, "result"))
+
+    return result
+
+
+def is_stale(run_id):
+    """No account of the run finished for STALE_AFTER seconds"""
+    updated = frappe.cache.get_value(get_run_key(run_id, "updated"))
+    return bool(updated) and time.time() - flt(updated) > STALE_AFTER
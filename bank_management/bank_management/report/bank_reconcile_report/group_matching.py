@@ -0,0 +1,330 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+"""
+Grouped amount matching.
+
+Many-to-one: one Bank Transaction (e.g. a deposit of several customer receipts)
+matched with a subset of open vouchers whose amounts sum to it.
+One-to-many: one voucher (e.g. a payment split into principal plus charges)
+matched with a subset of Bank Transactions summing to it.
+
+Subsets are found with a meet-in-the-middle subset-sum search on amounts in
+cents. Every search is bounded: at most MAX_CANDIDATES candidates (closest
+posting dates first), at most MAX_GROUP_SIZE items per group and a time budget
+per target. Candidates are kept per direction sorted by date, so each target
+walks the DATE_WINDOW slice found by bisect instead of scanning the pool. A call
+stops searching after TOTAL_TIME_BUDGET and returns the groups found so far.
+Groups are reconciled through ERPNext reconcile_vouchers with a voucher list.
+"""
+
+import json
+import time
+from bisect import bisect_left, bisect_right
+from itertools import combinations
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, flt, getdate
+from erpnext.accounts.doctype.bank_reconciliation_tool.bank_reconciliation_tool import (
+    reconcile_vouchers,
+)
+
+from bank_management.metadata import get_bank_account_details
+from bank_management.bank_management.doctype.bank_reconcile.bank_reconcile import (
+    get_bank_gl_accounts,
+    get_bank_transactions,
+    get_remaining_amount,
+    get_vouchers,
+)
+from bank_management.bank_management.report.bank_reconcile_report.bank_reconcile_report import (
+    get_matched_vouchers,
+)
+from bank_management.bank_management.report.bank_reconcile_report.matching import (
+    get_amount_key,
+    get_direction,
+    get_open_vouchers,
+)
+from bank_management.bank_management.report.bank_reconcile_report.scoring import (
+    get_unreconciled_bank_transactions,
+)
+
+# Search budgets per target amount
+MAX_GROUP_SIZE = 5
+MAX_CANDIDATES = 30
+TIME_BUDGET = 0.05
+
+# Search budget (seconds) of all targets of one call
+TOTAL_TIME_BUDGET = 5.0
+
+# Candidates must be posted within this many days of the target
+DATE_WINDOW = 7
+
+# Sums may differ by one cent (rounding of the parts)
+TOLERANCE_CENTS = 1
+
+
+def find_subset(target, items, max_size=MAX_GROUP_SIZE, time_budget=TIME_BUDGET):
+    """
+    Indexes of a subset of items (amounts in cents) with 2..max_size elements summing
+    to target (within TOLERANCE_CENTS), or None.
+
+    Meet in the middle: subset sums of each half are enumerated by size up to
+    max_size, the sums of the second half are hashed and each sum of the first half
+    looks up its complement. Each half stops when its share of the time budget is
+    exhausted (the first half also gets the time the second half left).
+    """
+    start = time.monotonic()
+    items = [(amount, index) for index, amount in enumerate(items) if 0 < amount <= target + TOLERANCE_CENTS]
+    if len(items) < 2:
+        return None
+
+    middle = len(items) // 2
+    first, second = items[:middle], items[middle:]
+
+    def subset_sums(half, deadline):
+        """sum -> smallest subset (tuple of indexes) of half, sizes 0..max_size, until the deadline"""
+        sums = {0: ()}
+        for size in range(1, min(max_size, len(half)) + 1):
+            for count, subset in enumerate(combinations(half, size)):
+                if count % 1024 == 0 and time.monotonic() > deadline:
+                    return sums
+                total = sum(amount for amount, index in subset)
+                if total <= target + TOLERANCE_CENTS:
+                    sums.setdefault(total, tuple(index for amount, index in subset))
+        return sums
+
+    second_sums = subset_sums(second, start + time_budget / 2)
+    first_sums = subset_sums(first, start + time_budget)
+
+    best = None
+    for total, subset in first_sums.items():
+        for difference in range(-TOLERANCE_CENTS, TOLERANCE_CENTS + 1):
+            other = second_sums.get(target - total + difference)
+            if other is None:
+                continue
+
+            group = subset + other
+            if 2 <= len(group) <= max_size and (best is None or len(group) < len(best)):
+                best = group
+        if best and len(best) == 2:
+            break
+
+    return list(best) if best else None
+
+
+class DateIndex:
+    """Items per direction sorted by date ordinal, for range queries on the date window (bisect)"""
+
+    def __init__(self, items, get_direction, get_date):
+        self.items = {}
+        self.days = {}
+        for day, item in sorted(((getdate(get_date(d)).toordinal(), d) for d in items), key=lambda d: d[0]):
+            direction = get_direction(item)
+            self.items.setdefault(direction, []).append(item)
+            self.days.setdefault(direction, []).append(day)
+
+    def get_closest(self, direction, date, is_available):
+        """
+        Available items of direction within DATE_WINDOW days of date, at most
+        MAX_CANDIDATES, closest first: walks outwards from the bisect position
+        inside the window slice.
+        """
+        items = self.items.get(direction) or []
+        days = self.days.get(direction) or []
+        day = getdate(date).toordinal()
+
+        low = bisect_left(days, day - DATE_WINDOW)
+        high = bisect_right(days, day + DATE_WINDOW)
+        left = bisect_left(days, day, low, high) - 1
+        right = left + 1
+
+        closest = []
+        while len(closest) < MAX_CANDIDATES and (left >= low or right < high):
+            if right >= high or (left >= low and day - days[left] <= days[right] - day):
+                index, left = left, left - 1
+            else:
+                index, right = right, right + 1
+            if is_available(items[index]):
+                closest.append(items[index])
+        return closest
+
+
+def get_group_matches(bank_transactions, company, bank_gl_account, matched_vouchers=(), deadline=None):
+    """
+    Many-to-one and one-to-many groups for Bank Transactions without a 1:1 match.
+    Every Bank Transaction and voucher is used in at most one group, vouchers
+    matched 1:1 to another Bank Transaction (matched_vouchers: (doctype, name)) in none.
+    The search stops at deadline (time.monotonic), by default TOTAL_TIME_BUDGET from now.
+    """
+    if not bank_transactions or not bank_gl_account:
+        return []
+
+    if deadline is None:
+        deadline = time.monotonic() + TOTAL_TIME_BUDGET
+
+    dates = [getdate(bt.date) for bt in bank_transactions]
+    vouchers = get_open_vouchers(
+        company, bank_gl_account, add_days(min(dates), -DATE_WINDOW), add_days(max(dates), DATE_WINDOW))
+
+    groups = []
+    used_vouchers = set(matched_vouchers)
+    used_bank_transactions = set()
+
+    # Many-to-one: one Bank Transaction, several vouchers
+    voucher_index = DateIndex(vouchers, lambda v: v["direction"], lambda v: v["posting_date"])
+    for bt in bank_transactions:
+        time_budget = min(TIME_BUDGET, deadline - time.monotonic())
+        if time_budget <= 0:
+            return groups
+
+        pool = voucher_index.get_closest(
+            get_direction(bt.deposit, bt.withdrawal), bt.date,
+            lambda v: (v["doctype"], v["name"]) not in used_vouchers)
+
+        subset = find_subset(
+            get_amount_key(bt.unallocated_amount), [get_amount_key(v["amount"]) for v in pool],
+            time_budget=time_budget)
+        if not subset:
+            continue
+
+        group_vouchers = [pool[i] for i in subset]
+        used_vouchers.update((v["doctype"], v["name"]) for v in group_vouchers)
+        used_bank_transactions.add(bt.name)
+        groups.append(make_group("Many to One", [bt], group_vouchers))
+
+    # One-to-many: one voucher, several Bank Transactions
+    bank_transaction_index = DateIndex(
+        [bt for bt in bank_transactions if bt.name not in used_bank_transactions],
+        lambda bt: get_direction(bt.deposit, bt.withdrawal), lambda bt: bt.date)
+    for voucher in vouchers:
+        if (voucher["doctype"], voucher["name"]) in used_vouchers:
+            continue
+
+        time_budget = min(TIME_BUDGET, deadline - time.monotonic())
+        if time_budget <= 0:
+            return groups
+
+        pool = bank_transaction_index.get_closest(
+            voucher["direction"], voucher["posting_date"], lambda bt: bt.name not in used_bank_transactions)
+
+        subset = find_subset(
+            get_amount_key(voucher["amount"]), [get_amount_key(bt.unallocated_amount) for bt in pool],
+            time_budget=time_budget)
+        if not subset:
+            continue
+
+        group_bank_transactions = [pool[i] for i in subset]
+        used_bank_transactions.update(bt.name for bt in group_bank_transactions)
+        used_vouchers.add((voucher["doctype"], voucher["name"]))
+        groups.append(make_group("One to Many", group_bank_transactions, [voucher]))
+
+    return groups
+
+
+def make_group(group_type, bank_transactions, vouchers):
+    return {
+        "type": group_type,
+        "bank_transactions": [
+            {"name": bt.name, "date": bt.date, "amount": flt(bt.unallocated_amount)} for bt in bank_transactions
+        ],
+        "vouchers": [
+            {"doctype": v["doctype"], "name": v["name"], "posting_date": v["posting_date"],
+             "amount": flt(v["amount"]), "party": v["party"]} for v in vouchers
+        ],
+    }
+
+
+@frappe.whitelist()
+def get_group_suggestions(filters):
+    """Group matches for the unreconciled Bank Transactions of the report filters without a 1:1 match"""
+    if isinstance(filters, str):
+        filters = json.loads(filters)
+    filters = frappe._dict(filters or {})
+    frappe.has_permission("Bank Transaction", "read", throw=True)
+
+    bank_transactions = get_unreconciled_bank_transactions(filters)
+    matched = get_matched_vouchers(bank_transactions, frappe._dict())
+    # Vouchers matched 1:1 anywhere in the statement are not offered in groups
+    matched_vouchers = {(voucher["doctype"], voucher["name"]) for voucher in matched.values() if voucher}
+
+    groups = {}
+    for bt in bank_transactions:
+        if not matched.get(bt.name) and get_direction(bt.deposit, bt.withdrawal):
+            groups.setdefault((bt.company, bt.bank_account), []).append(bt)
+
+    # One search budget for all bank accounts
+    deadline = time.monotonic() + TOTAL_TIME_BUDGET
+    suggestions = []
+    for (company, bank_account), group in groups.items():
+        bank_gl_account = (get_bank_account_details(bank_account) or {}).get("account")
+        suggestions.extend(get_group_matches(group, company, bank_gl_account, matched_vouchers, deadline))
+
+    return suggestions
+
+
+@frappe.whitelist()
+def reconcile_groups(groups):
+    """
+    Reconcile proposed groups through reconcile_vouchers. Amounts are re-read from
+    the database and every group must still sum up. One savepoint per group.
+    Returns per group results (status, message).
+    """
+    if isinstance(groups, str):
+        groups = json.loads(groups)
+    frappe.has_permission("Bank Transaction", "write", throw=True)
+
+    results = []
+    for group in groups or []:
+        try:
+            frappe.db.savepoint("bank_group_reconcile")
+            reconcile_group(group)
+            results.append({"status": "Reconciled", "message": ""})
+        except Exception as e:
+            frappe.db.rollback(save_point="bank_group_reconcile")
+            results.append({"status": "Error", "message": str(e)})
+
+    return {
+        "reconciled_count": len([d for d in results if d["status"] == "Reconciled"]),
+        "results": results
+    }
+
+
+def reconcile_group(group):
+    bank_transaction_names = [d["name"] for d in group.get("bank_transactions") or []]
+    voucher_rows = [
+        frappe._dict(voucher_doc_type=d["doctype"], voucher_name=d["name"]) for d in group.get("vouchers") or []]
+
+    bank_transactions = get_bank_transactions(set(bank_transaction_names))
+    bank_gl_accounts = get_bank_gl_accounts(bank_transactions)
+    vouchers = get_vouchers(voucher_rows, bank_transactions, bank_gl_accounts)
+    if len(bank_transactions) != len(bank_transaction_names) or len(vouchers) != len(voucher_rows):
+        frappe.throw(_("Bank Transactions or vouchers of the group are no longer available"))
+
+    # Groups are built per bank account, every voucher must be posted to its GL account
+    gl_accounts = {bank_gl_accounts.get(bt.bank_account) for bt in bank_transactions.values()}
+    gl_account = gl_accounts.pop() if len(gl_accounts) == 1 else None
+    if not gl_account or not all(flt(v.accounts.get(gl_account)) for v in vouchers.values()):
+        frappe.throw(_("Bank Transactions and vouchers of the group must share one bank account"))
+    for voucher in vouchers.values():
+        voucher.remaining_amount = get_remaining_amount(voucher, gl_account)
+
+    bank_total = sum(flt(bt.unallocated_amount) for bt in bank_transactions.values())
+    voucher_total = sum(flt(v.remaining_amount) for v in vouchers.values())
+    if abs(bank_total - voucher_total) > TOLERANCE_CENTS / 100 + 0.001:
+        frappe.throw(_("Group amounts do not match: {0} against {1}").format(bank_total, voucher_total))
+
+    if len(bank_transactions) == 1:
+        # Many to one: all vouchers in the voucher list of the Bank Transaction
+        reconcile_vouchers(bank_transaction_names[0], json.dumps([
+            {"payment_doctype": v.doctype, "payment_name": v.name, "amount": flt(v.remaining_amount)}
+            for v in vouchers.values()
+        ]))
+    else:
+        # One to many: the voucher is allocated to each Bank Transaction in turn
+        voucher = next(iter(vouchers.values()))
+        for name in bank_transaction_names:
+            reconcile_vouchers(name, json.dumps([
+                {"payment_doctype": voucher.doctype, "payment_name": voucher.name,
+                 "amount": flt(bank_transactions[name].unallocated_amount)}
+            ]))
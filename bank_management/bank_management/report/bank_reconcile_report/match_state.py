@@ -0,0 +1,392 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+"""
+Persistent match state of the Bank Reconcile Report.
+
+One Bank Match State per Bank Transaction (named after it) holds the voucher
+the matching rules resolved for it: linked, same reference number or fuzzy
+suggestion, or no voucher. get_bank_transactions reads it with a LEFT JOIN, so
+a report view only runs the matching rules for Bank Transactions without state;
+their state is stored by a background job.
+
+The state does not depend on the report filters: reference matches are
+stored without voucher date window. With a window the report matches again
+the Bank Transactions with a reference whose stored voucher is outside of it or
+that have no match (the first voucher of the reference within the window can
+differ from the first one overall), see get_bank_transaction_matches.
+Reference numbers are compared as normalized keys (bank_management.references).
+doc_events keep it current: submitting, cancelling or updating a Bank
+Transaction, Payment Entry or Journal Entry (an amendment is a cancel and a
+submit) deletes the state rows it can change: by Bank Transaction, by voucher,
+by reference number and, for rows without reference number, by date window.
+Clearance dates set without doc_events (Bank Clearance) are checked when
+reading. A deduplicated background job per bank account, queued after the
+commit, matches the Bank Transactions without state or with a cleared voucher
+(the next view matches them until it has run). rebuild_match_state recomputes
+a bank account and date range.
+"""
+
+import frappe
+from frappe.utils import add_days, flt, getdate, now
+
+from bank_management.metadata import get_bank_accounts_for_gl
+from bank_management.references import normalize_reference
+from bank_management.bank_management.report.bank_reconcile_report.matching import get_fuzzy_settings
+
+STATE_DOCTYPE = "Bank Match State"
+
+# Bank Transactions matched and stored per batch (and database transaction)
+BATCH_SIZE = 5000
+
+# Columns selected by get_bank_transactions from the joined state (alias ms)
+MATCH_STATE_COLUMNS = """
+            ms.name AS match_state,
+            ms.match_type AS match_type,
+            ms.confidence AS match_confidence,
+            ms.voucher_type AS match_voucher_type,
+            ms.voucher_name AS match_voucher_name,
+            ms.voucher_reference_no AS match_reference_no,
+            ms.voucher_posting_date AS match_posting_date,
+            ms.voucher_amount AS match_amount,
+            ms.voucher_party_type AS match_party_type,
+            ms.voucher_party AS match_party"""
+
+STATE_FIELDS = [
+    "name", "owner", "modified_by", "creation", "modified", "docstatus",
+    "bank_transaction", "company", "bank_account", "date", "reference_key",
+    "match_type", "confidence", "voucher_type", "voucher_name", "voucher_reference_no",
+    "voucher_posting_date", "voucher_amount", "voucher_party_type", "voucher_party",
+]
+
+
+def get_stored_matches(bank_transactions):
+    """
+    Matched vouchers of Bank Transactions selected with MATCH_STATE_COLUMNS.
+    Returns (Bank Transaction name -> voucher or None, Bank Transactions without state).
+    """
+    matched = {}
+    missing = []
+    for bt in bank_transactions:
+        if bt.get("match_state"):
+            matched[bt.name] = get_state_voucher(bt)
+        else:
+            missing.append(bt)
+    return matched, missing
+
+
+def get_state_voucher(bt):
+    """Voucher dict (as get_matched_vouchers returns it) of a joined state row"""
+    if not bt.match_voucher_name:
+        return None
+
+    voucher = {
+        "doctype": bt.match_voucher_type,
+        "name": bt.match_voucher_name,
+        "reference_no": bt.match_reference_no or "",
+        "posting_date": bt.match_posting_date,
+        "amount": flt(bt.match_amount),
+        "party_type": bt.match_party_type or "",
+        "party": bt.match_party or "",
+        "is_linked": bt.match_type == "Linked",
+    }
+    if bt.match_type == "Fuzzy":
+        voucher.update({"confidence": flt(bt.match_confidence), "match_type": "fuzzy"})
+    return voucher
+
+
+def get_match_type(voucher):
+    if not voucher:
+        return ""
+    if voucher.get("is_linked"):
+        return "Linked"
+    if voucher.get("match_type") == "fuzzy":
+        return "Fuzzy"
+    return "Reference"
+
+
+def enqueue_update(bank_accounts):
+    """
+    Store the missing and outdated state of the bank accounts in the background,
+    one deduplicated job per bank account
+    """
+    for bank_account in sorted({d for d in bank_accounts if d}):
+        frappe.enqueue(
+            "bank_management.bank_management.report.bank_reconcile_report.match_state.update_bank_account_state",
+            queue="long",
+            job_id=f"bank_match_state::{bank_account}",
+            deduplicate=True,
+            bank_account=bank_account,
+            enqueue_after_commit=True,
+        )
+
+
+def update_bank_account_state(bank_account):
+    """
+    Match the Bank Transactions of a bank account without state, and those
+    whose stored voucher has been cleared since (Bank Clearance sets the
+    clearance date without doc_events). The job reads what is missing itself,
+    so a deduplicated request loses nothing.
+    """
+    names = frappe.db.sql_list(f"""
+        SELECT bt.name
+        FROM `tabBank Transaction` bt
+        LEFT JOIN `tab{STATE_DOCTYPE}` ms ON ms.name = bt.name
+        WHERE bt.company = %(company)s
+            AND bt.bank_account = %(bank_account)s
+            AND bt.docstatus = 1
+            AND ms.name IS NULL
+        ORDER BY bt.date, bt.name
+    """, {
+        "company": frappe.get_cached_value("Bank Account", bank_account, "company"),
+        "bank_account": bank_account,
+    })
+
+    names += frappe.db.sql_list(f"""
+        SELECT ms.name
+        FROM `tab{STATE_DOCTYPE}` ms
+        LEFT JOIN `tabPayment Entry` pe
+            ON ms.voucher_type = 'Payment Entry' AND pe.name = ms.voucher_name
+        LEFT JOIN `tabJournal Entry` je
+            ON ms.voucher_type = 'Journal Entry' AND je.name = ms.voucher_name
+        WHERE ms.bank_account = %(bank_account)s
+            AND ms.match_type IN ('Reference', 'Fuzzy')
+            AND (pe.clearance_date IS NOT NULL OR je.clearance_date IS NOT NULL)
+        ORDER BY ms.date, ms.name
+    """, {"bank_account": bank_account})
+
+    update_match_state(names)
+
+
+def get_cleared_matches(matched_vouchers):
+    """
+    Bank Transaction names whose stored reference or fuzzy voucher has a
+    clearance date (one query per voucher type)
+    """
+    names = {}
+    for bt_name, voucher in matched_vouchers.items():
+        if get_match_type(voucher) in ("Reference", "Fuzzy"):
+            names.setdefault(voucher["doctype"], {}).setdefault(voucher["name"], []).append(bt_name)
+
+    cleared = set()
+    for doctype, vouchers in names.items():
+        for name in frappe.get_all(
+            doctype,
+            filters={"name": ["in", list(vouchers)], "clearance_date": ["is", "set"]},
+            pluck="name",
+        ):
+            cleared.update(vouchers[name])
+    return cleared
+
+
+def update_match_state(bank_transactions):
+    """Run the matching rules for Bank Transactions (names) and store the result"""
+    from bank_management.bank_management.report.bank_reconcile_report.bank_reconcile_report import (
+        get_matched_vouchers,
+    )
+
+    for start in range(0, len(bank_transactions), BATCH_SIZE):
+        batch = get_bank_transactions(bank_transactions[start:start + BATCH_SIZE])
+        try:
+            save_matches(batch, get_matched_vouchers(batch, frappe._dict()))
+            frappe.db.commit()
+        except Exception:
+            frappe.db.rollback()
+            frappe.log_error(
+                "[match_state.py] method: update_match_state", "Bank Reconcile Report")
+
+
+def get_bank_transactions(names):
+    """Submitted Bank Transactions with the columns used by the matching rules (one query)"""
+    if not names:
+        return []
+
+    return frappe.db.sql("""
+        SELECT name, date, deposit, withdrawal, reference_number, unallocated_amount,
+            allocated_amount, status, bank_account, company
+        FROM `tabBank Transaction`
+        WHERE name IN %(names)s AND docstatus = 1
+    """, {"names": tuple(names)}, as_dict=True)
+
+
+def save_matches(bank_transactions, matched):
+    """Replace the state of Bank Transactions with their matched vouchers (None for no match)"""
+    if not bank_transactions:
+        return
+
+    timestamp = now()
+    user = frappe.session.user
+    rows = []
+    for bt in bank_transactions:
+        voucher = matched.get(bt.name) or {}
+        match_type = get_match_type(voucher)
+        rows.append([
+            bt.name, user, user, timestamp, timestamp, 0,
+            bt.name, bt.company, bt.bank_account, bt.date, normalize_reference(bt.reference_number),
+            match_type, flt(voucher.get("confidence")) if match_type == "Fuzzy" else 0,
+            voucher.get("doctype"), voucher.get("name"), voucher.get("reference_no"),
+            voucher.get("posting_date"), flt(voucher.get("amount")),
+            voucher.get("party_type") or None, voucher.get("party") or None,
+        ])
+
+    clear_match_state(bank_transactions=[bt.name for bt in bank_transactions], recompute=False)
+    frappe.db.bulk_insert(STATE_DOCTYPE, STATE_FIELDS, rows, ignore_duplicates=True)
+
+
+def clear_match_state(bank_transactions=(), vouchers=(), bank_accounts=(), references=(), dates=(),
+                      recompute=True):
+    """
+    Delete state rows:
+    - of the Bank Transactions (names)
+    - matched to the vouchers ((doctype, name))
+    - of the bank_accounts with one of the references (normalized), or without reference key
+      within twice the fuzzy date window of one of the dates (rows competing for
+      the same vouchers)
+    With recompute, their bank accounts are matched again in the background.
+    """
+    conditions = []
+    values = {}
+
+    if bank_transactions:
+        conditions.append("name IN %(bank_transactions)s")
+        values["bank_transactions"] = tuple(bank_transactions)
+
+    voucher_names = {}
+    for doctype, name in vouchers:
+        if doctype and name:
+            voucher_names.setdefault(doctype, set()).add(name)
+    for i, (doctype, names) in enumerate(voucher_names.items()):
+        conditions.append(f"(voucher_type = %(voucher_type_{i})s AND voucher_name IN %(voucher_names_{i})s)")
+        values.update({f"voucher_type_{i}": doctype, f"voucher_names_{i}": tuple(names)})
+
+    bank_accounts = {d for d in bank_accounts if d}
+    references = {normalize_reference(d) for d in references if d}
+    references.discard("")
+    dates = [getdate(d) for d in dates if d]
+    if bank_accounts:
+        values["bank_accounts"] = tuple(bank_accounts)
+        if references:
+            conditions.append("(bank_account IN %(bank_accounts)s AND reference_key IN %(references)s)")
+            values["references"] = tuple(references)
+        if dates:
+            window = get_fuzzy_settings()[1] * 2
+            conditions.append("""(bank_account IN %(bank_accounts)s AND reference_key = ''
+                AND date BETWEEN %(from_date)s AND %(to_date)s)""")
+            values.update({
+                "from_date": add_days(min(dates), -window),
+                "to_date": add_days(max(dates), window),
+            })
+
+    if not conditions:
+        return
+
+    rows = frappe.db.sql(
+        f"SELECT name, bank_account FROM `tab{STATE_DOCTYPE}` WHERE {' OR '.join(conditions)}",
+        values, as_dict=True)
+    names = [d.name for d in rows]
+    if names:
+        frappe.db.sql(f"DELETE FROM `tab{STATE_DOCTYPE}` WHERE name IN %(names)s", {"names": tuple(names)})
+
+    if recompute:
+        # The Bank Transactions cleared by name may have had no state yet
+        bank_accounts = {d.bank_account for d in rows}
+        others = set(bank_transactions) - set(names)
+        if others:
+            bank_accounts.update(frappe.get_all(
+                "Bank Transaction", filters={"name": ["in", list(others)]}, pluck="bank_account"))
+        enqueue_update(bank_accounts)
+
+
+def clear_bank_transaction_state(doc, method=None):
+    """Bank Transaction doc_events: submit, cancel, update after submit (allocations, clearance)"""
+    try:
+        vouchers = [(d.payment_document, d.payment_entry) for d in doc.get("payment_entries") or []]
+        references = [doc.reference_number]
+        previous = doc.get_doc_before_save()
+        if previous:
+            vouchers += [(d.payment_document, d.payment_entry) for d in previous.get("payment_entries") or []]
+            references.append(previous.reference_number)
+
+        clear_match_state(
+            bank_transactions=[doc.name],
+            vouchers=vouchers,
+            bank_accounts=[doc.bank_account],
+            references=references,
+            dates=[] if normalize_reference(doc.reference_number) else [doc.date],
+        )
+    except Exception:
+        frappe.log_error(
+            "[match_state.py] method: clear_bank_transaction_state", "Bank Reconcile Report")
+
+
+def clear_voucher_state(doc, method=None):
+    """Payment Entry / Journal Entry doc_events: submit, cancel, update after submit (clearance_date)"""
+    try:
+        if doc.doctype == "Payment Entry":
+            accounts = [doc.paid_from, doc.paid_to]
+            reference_field = "reference_no"
+        else:
+            accounts = [d.account for d in doc.get("accounts") or []]
+            reference_field = "cheque_no"
+
+        bank_accounts = {
+            bank_account
+            for account in set(accounts) if account
+            for bank_account in get_bank_accounts_for_gl(account)
+        }
+        references = [doc.get(reference_field)]
+        previous = doc.get_doc_before_save()
+        if previous:
+            references.append(previous.get(reference_field))
+
+        clear_match_state(
+            vouchers=[(doc.doctype, doc.name)],
+            bank_accounts=bank_accounts,
+            references=references,
+            dates=[doc.posting_date],
+        )
+    except Exception:
+        frappe.log_error(
+            "[match_state.py] method: clear_voucher_state", "Bank Reconcile Report")
+
+
+def clear_fuzzy_match_state():
+    """Delete the state of Bank Transactions without reference key (fuzzy settings changed)"""
+    frappe.db.sql(f"DELETE FROM `tab{STATE_DOCTYPE}` WHERE reference_key = ''")
+
+
+def clear_all_match_state():
+    """Delete all state rows (reference normalization changed)"""
+    frappe.db.sql(f"DELETE FROM `tab{STATE_DOCTYPE}`")
+
+
+@frappe.whitelist()
+def rebuild_match_state(bank_account, from_date=None, to_date=None):
+    """
+    Recompute the match state of a bank account, optionally for a date range.
+
+    bench --site <site> execute bank_management.bank_management.report.bank_reconcile_report.match_state.rebuild_match_state --kwargs "{'bank_account': '<Bank Account>'}"
+    """
+    frappe.only_for("System Manager")
+
+    conditions = ["bank_account = %(bank_account)s"]
+    values = {"bank_account": bank_account}
+    if from_date:
+        conditions.append("date >= %(from_date)s")
+        values["from_date"] = getdate(from_date)
+    if to_date:
+        conditions.append("date <= %(to_date)s")
+        values["to_date"] = getdate(to_date)
+    conditions = " AND ".join(conditions)
+
+    # Also drops rows of Bank Transactions cancelled in the meantime
+    frappe.db.sql(f"DELETE FROM `tab{STATE_DOCTYPE}` WHERE {conditions}", values)
+
+    names = frappe.db.sql_list(f"""
+        SELECT name FROM `tabBank Transaction`
+        WHERE docstatus = 1 AND {conditions}
+        ORDER BY date, name
+    """, values)
+    update_match_state(names)
+
+    return len(names)
@@ -0,0 +1,213 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+"""
+Fallback matcher for Bank Transactions without a reference number.
+
+Open vouchers of the bank GL account are kept per direction in arrays sorted
+by (amount, posting date). Every Bank Transaction is resolved with a binary
+search range query on the amount (amount tolerance) and the posting date window
+is checked on the small slice found, so n Bank Transactions against m vouchers
+cost O((n + m) log m). Candidate pairs are then assigned greedily by confidence,
+each voucher to at most one Bank Transaction.
+"""
+
+from bisect import bisect_left, bisect_right
+
+import frappe
+from frappe.utils import add_days, cint, date_diff, flt, getdate
+
+DEFAULT_AMOUNT_TOLERANCE = 0.01
+DEFAULT_DATE_WINDOW = 5
+
+# Weight of the amount closeness in the confidence, the rest is date closeness
+AMOUNT_WEIGHT = 0.6
+
+
+def get_amount_key(amount):
+    """Amount in cents"""
+    return int(round(flt(amount) * 100))
+
+
+def get_direction(deposit, withdrawal):
+    return "Deposit" if flt(deposit) > 0 else "Withdrawal" if flt(withdrawal) > 0 else None
+
+
+def get_fuzzy_settings():
+    """(amount tolerance, date window in days) from Bank Management Settings"""
+    settings = frappe.get_cached_doc("Bank Management Settings")
+    amount_tolerance = settings.fuzzy_amount_tolerance
+    date_window = settings.fuzzy_date_window
+    return (
+        DEFAULT_AMOUNT_TOLERANCE if amount_tolerance in (None, "") else flt(amount_tolerance),
+        DEFAULT_DATE_WINDOW if date_window in (None, "") else cint(date_window),
+    )
+
+
+class VoucherIndex:
+    """Open vouchers per direction, sorted by (amount in cents, posting date)"""
+
+    def __init__(self, vouchers):
+        self.vouchers = {}
+        self.amounts = {}
+
+        for direction in ("Deposit", "Withdrawal"):
+            items = sorted(
+                (d for d in vouchers if d["direction"] == direction),
+                key=lambda d: (get_amount_key(d["amount"]), getdate(d["posting_date"]), d["name"])
+            )
+            self.vouchers[direction] = items
+            self.amounts[direction] = [get_amount_key(d["amount"]) for d in items]
+
+    def get_candidates(self, direction, amount, amount_tolerance):
+        """Vouchers of direction with amount within tolerance (binary search range query)"""
+        amounts = self.amounts.get(direction) or []
+        tolerance = get_amount_key(amount_tolerance)
+        cents = get_amount_key(amount)
+        start = bisect_left(amounts, cents - tolerance)
+        end = bisect_right(amounts, cents + tolerance)
+        return self.vouchers[direction][start:end]
+
+
+def get_confidence(amount_difference, day_difference, amount_tolerance, date_window):
+    """Match confidence in percent, 100 for the same amount on the same day"""
+    amount_score = 1 - amount_difference / amount_tolerance if amount_tolerance > 0 else 1
+    date_score = 1 - day_difference / (date_window + 1)
+    return flt(100 * (AMOUNT_WEIGHT * max(amount_score, 0) + (1 - AMOUNT_WEIGHT) * max(date_score, 0)), 1)
+
+
+def get_fuzzy_matches(bank_transactions, company, bank_gl_account, amount_tolerance=None, date_window=None):
+    """
+    Best open voucher by amount tolerance and posting date window for each Bank
+    Transaction (without reference number). Returns Bank Transaction name -> voucher
+    with confidence (percent) and match_type "fuzzy".
+    """
+    bank_transactions = [
+        bt for bt in bank_transactions
+        if get_direction(bt.deposit, bt.withdrawal) and flt(bt.get("unallocated_amount", 1)) > 0
+    ]
+    if not bank_transactions or not bank_gl_account:
+        return {}
+
+    if amount_tolerance is None or date_window is None:
+        amount_tolerance, date_window = get_fuzzy_settings()
+
+    dates = [getdate(bt.date) for bt in bank_transactions]
+    vouchers = get_open_vouchers(
+        company, bank_gl_account, add_days(min(dates), -date_window), add_days(max(dates), date_window))
+    index = VoucherIndex(vouchers)
+
+    pairs = []
+    for bt in bank_transactions:
+        direction = get_direction(bt.deposit, bt.withdrawal)
+        amount = flt(bt.deposit) if direction == "Deposit" else flt(bt.withdrawal)
+
+        for voucher in index.get_candidates(direction, amount, amount_tolerance):
+            day_difference = abs(date_diff(voucher["posting_date"], bt.date))
+            if day_difference > date_window:
+                continue
+
+            confidence = get_confidence(
+                abs(amount - flt(voucher["amount"])), day_difference, amount_tolerance, date_window)
+            pairs.append((confidence, day_difference, bt.name, voucher))
+
+    # Greedy assignment, best pairs first, each Bank Transaction and voucher used once
+    pairs.sort(key=lambda d: (-d[0], d[1], d[2], d[3]["name"]))
+    matched = {}
+    used = set()
+    for confidence, day_difference, bt_name, voucher in pairs:
+        key = (voucher["doctype"], voucher["name"])
+        if bt_name in matched or key in used:
+            continue
+
+        used.add(key)
+        matched[bt_name] = dict(voucher, confidence=confidence, match_type="fuzzy")
+
+    return matched
+
+
+def get_open_vouchers(company, bank_gl_account, from_date, to_date):
+    """Uncleared Payment Entries and Journal Entries of the bank GL account not linked to a Bank Transaction"""
+    values = {
+        "company": company,
+        "account": bank_gl_account,
+        "from_date": from_date,
+        "to_date": to_date,
+    }
+
+    payment_entries = frappe.db.sql("""
+        SELECT
+            'Payment Entry' AS doctype,
+            pe.name,
+            pe.posting_date,
+            pe.reference_no,
+            pe.party_type,
+            pe.party,
+            CASE WHEN pe.paid_to = %(account)s THEN 'Deposit' ELSE 'Withdrawal' END AS direction,
+            pe.base_paid_amount_after_tax AS amount
+        FROM `tabPayment Entry` pe
+        WHERE pe.company = %(company)s
+            AND pe.docstatus = 1
+            AND pe.clearance_date IS NULL
+            AND (pe.paid_to = %(account)s OR pe.paid_from = %(account)s)
+            AND pe.posting_date BETWEEN %(from_date)s AND %(to_date)s
+            AND NOT EXISTS (
+                SELECT 1
+                FROM `tabBank Transaction Payments` btp
+                WHERE btp.payment_document = 'Payment Entry'
+                    AND btp.payment_entry = pe.name
+                    AND btp.docstatus = 1
+            )
+    """, values, as_dict=True)
+
+    journal_entries = frappe.db.sql("""
+        SELECT
+            'Journal Entry' AS doctype,
+            je.name,
+            je.posting_date,
+            je.cheque_no AS reference_no,
+            MAX(jea.party_type) AS party_type,
+            je.pay_to_recd_from AS party,
+            SUM(jea.debit_in_account_currency - jea.credit_in_account_currency) AS amount
+        FROM `tabJournal Entry` je
+        INNER JOIN `tabJournal Entry Account` jea ON jea.parent = je.name
+        WHERE je.company = %(company)s
+            AND je.docstatus = 1
+            AND je.clearance_date IS NULL
+            AND je.voucher_type != 'Opening Entry'
+            AND jea.account = %(account)s
+            AND je.posting_date BETWEEN %(from_date)s AND %(to_date)s
+            AND NOT EXISTS (
+                SELECT 1
+                FROM `tabBank Transaction Payments` btp
+                WHERE btp.payment_document = 'Journal Entry'
+                    AND btp.payment_entry = je.name
+                    AND btp.docstatus = 1
+            )
+        GROUP BY je.name
+    """, values, as_dict=True)
+
+    vouchers = []
+    for pe in payment_entries:
+        vouchers.append(make_voucher(pe, pe.direction, pe.amount))
+    for je in journal_entries:
+        if flt(je.amount):
+            vouchers.append(make_voucher(
+                je, "Deposit" if flt(je.amount) > 0 else "Withdrawal", abs(flt(je.amount))))
+
+    return vouchers
+
+
+def make_voucher(row, direction, amount):
+    """Voucher dict in the shape used by the report matching"""
+    return {
+        "doctype": row.doctype,
+        "name": row.name,
+        "reference_no": row.reference_no or "",
+        "posting_date": row.posting_date,
+        "amount": flt(amount),
+        "direction": direction,
+        "party_type": row.party_type or "",
+        "party": row.party or "",
+        "is_linked": False
+    }
@@ -0,0 +1,248 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+"""
+Opt-in per-phase profiling of the Bank Reconcile Report (profile filter).
+
+Phases (Bank Transaction fetch, matching, unmatched Payment Entries and
+Journal Entries, summary balances) are wrapped in profile_phase() or the
+profiled() decorator. While a
+profile is running each phase records wall time, SQL query count and time
+(frappe.db.sql is wrapped) and peak Python memory (tracemalloc). The slowest
+statements can be captured as well (Bank Management Settings). The result is
+returned in the report message and stored as a Bank Reconcile Profile Log.
+For nested phases time and memory are inclusive, queries are counted in the
+innermost phase. Outside profiling() a phase costs one attribute lookup.
+"""
+
+import functools
+import heapq
+import itertools
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import frappe
+from frappe import _
+from frappe.utils import cint, flt
+
+# Characters of a captured SQL statement
+MAX_QUERY_LENGTH = 2000
+
+
+@contextmanager
+def trace_queries(on_query):
+    """Call on_query(query, values, seconds) after every frappe.db.sql call"""
+    sql = frappe.db.sql
+    # An enclosing tracer, restored afterwards
+    outer_sql = frappe.db.__dict__.get("sql")
+
+    def traced_sql(query, values=(), *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return sql(query, values, *args, **kwargs)
+        finally:
+            on_query(query, values, time.perf_counter() - start)
+
+    frappe.db.sql = traced_sql
+    try:
+        yield
+    finally:
+        if outer_sql:
+            frappe.db.sql = outer_sql
+        else:
+            # Back to the class method
+            del frappe.db.sql
+
+
+def get_profile():
+    return getattr(frappe.local, "bank_reconcile_profile", None)
+
+
+@contextmanager
+def profiling(slow_queries=None):
+    """
+    Profile the block. slow_queries: slowest statements kept (default from settings).
+    Yields the profile, its summary is in profile.result after the block.
+    """
+    if slow_queries is None:
+        slow_queries = frappe.db.get_single_value("Bank Management Settings", "profiling_slow_queries")
+
+    profile = frappe._dict({
+        "phases": {},
+        "stack": [],
+        "slow_queries": [],
+        "slow_query_limit": cint(slow_queries),
+        "sequence": itertools.count(),
+        "queries": 0,
+        "query_seconds": 0.0,
+        "started": time.perf_counter(),
+        "result": None,
+    })
+    own_tracemalloc = not tracemalloc.is_tracing()
+    if own_tracemalloc:
+        tracemalloc.start()
+
+    frappe.local.bank_reconcile_profile = profile
+    try:
+        with trace_queries(record_query):
+            yield profile
+    finally:
+        frappe.local.bank_reconcile_profile = None
+        if own_tracemalloc:
+            tracemalloc.stop()
+        profile.result = get_profile_result(profile)
+
+
+def record_query(query, values, seconds):
+    profile = get_profile()
+    if not profile:
+        return
+
+    profile.queries += 1
+    profile.query_seconds += seconds
+    phase = profile.stack[-1]["phase"] if profile.stack else None
+    if phase:
+        phase["queries"] += 1
+        phase["query_seconds"] += seconds
+
+    if profile.slow_query_limit:
+        item = (seconds, next(profile.sequence), str(query), values, phase["name"] if phase else None)
+        if len(profile.slow_queries) < profile.slow_query_limit:
+            heapq.heappush(profile.slow_queries, item)
+        elif seconds > profile.slow_queries[0][0]:
+            heapq.heapreplace(profile.slow_queries, item)
+
+
+@contextmanager
+def profile_phase(name):
+    """Record wall time, SQL queries and peak memory of the block when profiling"""
+    profile = get_profile()
+    if not profile:
+        yield
+        return
+
+    phase = profile.phases.setdefault(name, {
+        "name": name, "seconds": 0.0, "queries": 0, "query_seconds": 0.0, "peak_memory": 0})
+    current, peak = tracemalloc.get_traced_memory()
+    # Peak of the enclosing phase so far, before the reset below
+    if profile.stack:
+        profile.stack[-1]["peak"] = max(profile.stack[-1]["peak"], peak)
+    tracemalloc.reset_peak()
+
+    frame = {"phase": phase, "start_memory": current, "peak": current}
+    profile.stack.append(frame)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        phase["seconds"] += time.perf_counter() - start
+        profile.stack.pop()
+
+        peak = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+        phase["peak_memory"] = max(phase["peak_memory"], peak - frame["start_memory"])
+        if profile.stack:
+            profile.stack[-1]["peak"] = max(profile.stack[-1]["peak"], peak)
+
+
+def profiled(name):
+    """Decorator: run the function as profile phase name"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            if not get_profile():
+                return method(*args, **kwargs)
+            with profile_phase(name):
+                return method(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def get_profile_result(profile):
+    """Phases, totals and slowest statements of a finished profile"""
+    return {
+        "seconds": flt(time.perf_counter() - profile.started, 4),
+        "queries": profile.queries,
+        "query_seconds": flt(profile.query_seconds, 4),
+        "phases": [
+            {
+                "phase": phase["name"],
+                "seconds": flt(phase["seconds"], 4),
+                "queries": phase["queries"],
+                "query_seconds": flt(phase["query_seconds"], 4),
+                "peak_memory_kb": flt(phase["peak_memory"] / 1024, 1),
+            }
+            for phase in profile.phases.values()
+        ],
+        "slow_queries": [
+            {
+                "seconds": flt(seconds, 4),
+                "phase": phase,
+                "query": " ".join(query.split())[:MAX_QUERY_LENGTH],
+                "values": json.dumps(values, default=str)[:MAX_QUERY_LENGTH] if values else None,
+            }
+            for seconds, sequence, query, values, phase in sorted(profile.slow_queries, reverse=True)
+        ],
+    }
+
+
+def save_profile_log(filters, profile, rows):
+    """Store the profile as a Bank Reconcile Profile Log, returns its name"""
+    try:
+        log = frappe.get_doc({
+            "doctype": "Bank Reconcile Profile Log",
+            "company": filters.get("company"),
+            "bank_account": filters.get("bank_account"),
+            "user": frappe.session.user,
+            "rows": rows,
+            "total_seconds": profile["seconds"],
+            "total_queries": profile["queries"],
+            "total_query_seconds": profile["query_seconds"],
+            "filters": json.dumps(filters, default=str, indent=1),
+            "slow_queries": json.dumps(profile["slow_queries"], indent=1) if profile["slow_queries"] else None,
+            "phases": profile["phases"],
+        })
+        log.insert(ignore_permissions=True)
+        return log.name
+    except Exception:
+        frappe.log_error(
+            "[profiling.py] method: save_profile_log", "Bank Reconcile Report")
+        return None
+
+
+def get_profile_message(profile, log_name=None):
+    """Debug section of the report (report message): phase table and slowest statements"""
+    rows = "".join(
+        "<tr><td>{0}</td><td>{1:.3f}</td><td>{2}</td><td>{3:.3f}</td><td>{4:,.0f}</td></tr>".format(
+            frappe.utils.escape_html(phase["phase"]), phase["seconds"], phase["queries"],
+            phase["query_seconds"], phase["peak_memory_kb"])
+        for phase in profile["phases"]
+    )
+    html = """
+        <div class="bank-reconcile-profile">
+            <b>{title}</b> {total}
+            <table class="table table-bordered table-condensed">
+                <thead><tr><th>{phase}</th><th>{seconds}</th><th>{queries}</th><th>{query_seconds}</th><th>{memory}</th></tr></thead>
+                <tbody>{rows}</tbody>
+            </table>
+    """.format(
+        title=_("Profile"),
+        total=_("{0} s, {1} queries ({2} s)").format(
+            profile["seconds"], profile["queries"], profile["query_seconds"]),
+        phase=_("Phase"), seconds=_("Seconds"), queries=_("Queries"),
+        query_seconds=_("Query Seconds"), memory=_("Peak Memory (KB)"), rows=rows,
+    )
+
+    if profile["slow_queries"]:
+        html += "<b>{0}</b><ol>{1}</ol>".format(_("Slowest Queries"), "".join(
+            "<li>{0:.4f} s ({1}): <code>{2}</code></li>".format(
+                d["seconds"], frappe.utils.escape_html(d["phase"] or ""),
+                frappe.utils.escape_html(d["query"][:300]))
+            for d in profile["slow_queries"]
+        ))
+
+    if log_name:
+        html += '<a href="/app/bank-reconcile-profile-log/{0}">{1}</a>'.format(log_name, _("Open Profile Log"))
+
+    return html + "</div>"
@@ -0,0 +1,120 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+import hashlib
+import json
+import time
+
+import frappe
+
+from bank_management import metadata
+
+# Cached results expire after 6 hours even if nothing changed
+CACHE_EXPIRY = 6 * 60 * 60
+
+# Bank Account -> data version (hash)
+VERSION_KEY = "bank_reconcile_report:data_version"
+
+# Filters changing only the response format (or profiling), not the cached result
+FORMAT_FILTERS = ("columnar", "profile")
+
+
+def get_cache_key(filters):
+    """Hash of the normalized filters (empty values and format filters dropped, keys sorted)"""
+    normalized = {key: value for key, value in (filters or {}).items()
+                  if value not in (None, "", 0, []) and key not in FORMAT_FILTERS}
+    filters_json = json.dumps(normalized, sort_keys=True, default=str)
+    return "bank_reconcile_report:result:" + hashlib.sha1(filters_json.encode()).hexdigest()
+
+
+def get_data_version(filters):
+    """
+    Data-version stamp for the filters: the latest change recorded for the bank
+    account. It is not scoped to the report window: the unmatched voucher
+    anti-joins and the stored match state are not bounded by it, so a Bank
+    Transaction or voucher of any date can change the result.
+    Returns None when the filters cannot be cached (no bank account).
+    """
+    bank_account = filters.get("bank_account")
+    if not bank_account:
+        return None
+
+    return frappe.cache.hget(VERSION_KEY, bank_account) or 0
+
+
+def get_cached_result(filters):
+    """Cached report result for filters, if its data-version stamp is still current"""
+    version = get_data_version(filters)
+    if version is None:
+        return None
+
+    cached = frappe.cache.get_value(get_cache_key(filters))
+    if cached and cached.get("version") == version:
+        return cached.get("result")
+
+    return None
+
+
+def set_cached_result(filters, result, version):
+    """
+    Cache result under version, the data-version stamp read (get_data_version)
+    before the result was computed: a change committed meanwhile invalidates it.
+    """
+    if version is None:
+        return
+
+    frappe.cache.set_value(
+        get_cache_key(filters),
+        {"version": version, "result": result},
+        expires_in_sec=CACHE_EXPIRY
+    )
+
+
+def bump_data_version(doc, method=None):
+    """
+    doc_events: Bank Transaction, Payment Entry, Journal Entry
+    (on_submit, on_cancel, on_update_after_submit)
+
+    Record a new data version for every bank account touched by the document,
+    once the transaction is committed.
+    """
+    try:
+        bank_accounts = get_affected_bank_accounts(doc)
+    except Exception:
+        frappe.log_error(
+            "[report_cache.py] method: bump_data_version", "Bank Reconcile Report")
+        return
+
+    bump_bank_accounts(bank_accounts)
+
+
+def bump_bank_accounts(bank_accounts):
+    """Record a new data version for the bank accounts once the transaction is committed"""
+    bank_accounts = {d for d in bank_accounts if d}
+    if not bank_accounts:
+        return
+
+    def set_versions():
+        version = time.time_ns()
+        for bank_account in bank_accounts:
+            frappe.cache.hset(VERSION_KEY, bank_account, version)
+
+    frappe.db.after_commit.add(set_versions)
+
+
+def get_affected_bank_accounts(doc):
+    """Bank Accounts whose report results the document can change"""
+    if doc.doctype == "Bank Transaction":
+        return [doc.bank_account]
+    if doc.doctype == "Payment Entry":
+        return get_bank_accounts_for_gl([doc.paid_from, doc.paid_to])
+    if doc.doctype == "Journal Entry":
+        return get_bank_accounts_for_gl([d.account for d in doc.accounts])
+    return []
+
+
+def get_bank_accounts_for_gl(accounts):
+    """Bank Accounts linked to any of the GL accounts (metadata cache)"""
+    return list({
+        name for account in set(accounts) if account for name in metadata.get_bank_accounts_for_gl(account)
+    })
@@ -0,0 +1,241 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+"""
+Match suggestions for a whole statement, scored in bulk with NumPy.
+
+For a block of Bank Transactions and the open vouchers posted around it,
+feature matrices (Bank Transaction x voucher) are built at once: relative
+amount difference, day difference, party / description token similarity,
+reference equality and direction agreement. The weighted score matrix is
+reduced to the top-k vouchers per Bank Transaction with np.argpartition.
+
+Bank Transactions are scored in date ordered blocks against the slice of
+vouchers within CANDIDATE_WINDOW days of the block, and tokens are hashed into
+HASH_BUCKETS columns, so a block costs BLOCK_SIZE x (vouchers in the slice)
+for the features and (vouchers in the slice) x HASH_BUCKETS for the tokens,
+whatever the vocabulary. One call scores at most MAX_BANK_TRANSACTIONS Bank
+Transactions.
+"""
+
+import json
+import re
+import zlib
+
+import numpy as np
+
+import frappe
+from frappe.utils import add_days, cint, flt, getdate
+
+from bank_management.metadata import get_bank_account_details
+from bank_management.references import normalize_reference
+from bank_management.bank_management.report.bank_reconcile_report.matching import get_open_vouchers
+
+DEFAULT_TOP_K = 5
+
+# Open vouchers posted within this many days of the Bank Transactions are candidates
+CANDIDATE_WINDOW = 30
+
+# Bank Transactions scored per block (block x vouchers matrices)
+BLOCK_SIZE = 256
+
+# Feature columns of the party / description tokens (hashed)
+HASH_BUCKETS = 1024
+
+# Most recent unreconciled Bank Transactions scored per call
+MAX_BANK_TRANSACTIONS = 5000
+
+WEIGHTS = {
+    "amount": 0.45,
+    "date": 0.2,
+    "text": 0.15,
+    "reference": 0.2,
+}
+
+# exp(-AMOUNT_DECAY * relative difference): 1% difference scores 0.37
+AMOUNT_DECAY = 100
+# exp(-day difference / DATE_DECAY)
+DATE_DECAY = 7.0
+
+# Suggestions scoring below this (percent) are dropped
+MIN_SCORE = 20
+
+
+@frappe.whitelist()
+def get_match_suggestions(filters, top_k=DEFAULT_TOP_K):
+    """
+    Top-k voucher suggestions for the unreconciled Bank Transactions of the
+    report filters, the MAX_BANK_TRANSACTIONS most recent ones.
+    Returns Bank Transaction name -> [voucher with score].
+    """
+    if isinstance(filters, str):
+        filters = json.loads(filters)
+    filters = frappe._dict(filters or {})
+    frappe.has_permission("Bank Transaction", "read", throw=True)
+
+    bank_transactions = get_unreconciled_bank_transactions(filters, limit=MAX_BANK_TRANSACTIONS)
+    groups = {}
+    for bt in bank_transactions:
+        groups.setdefault((bt.company, bt.bank_account), []).append(bt)
+
+    suggestions = {}
+    for (company, bank_account), group in groups.items():
+        bank_gl_account = (get_bank_account_details(bank_account) or {}).get("account")
+        if not bank_gl_account:
+            continue
+
+        dates = [getdate(bt.date) for bt in group]
+        vouchers = get_open_vouchers(
+            company, bank_gl_account,
+            add_days(min(dates), -CANDIDATE_WINDOW), add_days(max(dates), CANDIDATE_WINDOW))
+        suggestions.update(score_candidates(group, vouchers, cint(top_k) or DEFAULT_TOP_K))
+
+    return suggestions
+
+
+def get_unreconciled_bank_transactions(filters, limit=None):
+    """Unreconciled Bank Transactions of the filters by date, with limit the most recent ones"""
+    conditions = [
+        "docstatus = 1",
+        "status IN ('Pending', 'Unreconciled')",
+        "unallocated_amount > 0",
+    ]
+    values = {}
+
+    for field in ("company", "bank_account"):
+        if filters.get(field):
+            conditions.append(f"{field} = %({field})s")
+            values[field] = filters.get(field)
+
+    from_date = filters.get("bank_statement_from_date") or filters.get("from_date")
+    to_date = filters.get("bank_statement_to_date") or filters.get("to_date")
+    if from_date:
+        conditions.append("date >= %(from_date)s")
+        values["from_date"] = from_date
+    if to_date:
+        conditions.append("date <= %(to_date)s")
+        values["to_date"] = to_date
+
+    bank_transactions = frappe.db.sql("""
+        SELECT name, date, company, bank_account, deposit, withdrawal, unallocated_amount,
+            reference_number, description, party, bank_party_name
+        FROM `tabBank Transaction`
+        WHERE {conditions}
+        ORDER BY date DESC, name DESC
+        {limit}
+    """.format(
+        conditions=" AND ".join(conditions),
+        limit=f"LIMIT {cint(limit)}" if limit else ""
+    ), values, as_dict=True)
+
+    bank_transactions.reverse()
+    return bank_transactions
+
+
+def get_tokens(*texts):
+    """Lower case words of 3+ characters"""
+    return set(re.findall(r"[a-z0-9]{3,}", " ".join(t or "" for t in texts).lower()))
+
+
+def get_token_buckets(tokens):
+    """Feature columns of tokens: stable hash (crc32) into HASH_BUCKETS buckets"""
+    return sorted({zlib.crc32(token.encode("utf-8")) % HASH_BUCKETS for token in tokens})
+
+
+def get_token_matrix(token_buckets):
+    """0/1 matrix (rows x HASH_BUCKETS) of bucket lists"""
+    matrix = np.zeros((len(token_buckets), HASH_BUCKETS), dtype=np.float32)
+    for row, buckets in enumerate(token_buckets):
+        matrix[row, buckets] = 1
+    return matrix
+
+
+def score_candidates(bank_transactions, vouchers, top_k=DEFAULT_TOP_K):
+    """
+    Score every Bank Transaction against the vouchers posted within
+    CANDIDATE_WINDOW days of it and keep the top_k vouchers per Bank Transaction.
+    The amount scored is the unallocated amount. Returns name -> [voucher with
+    score (percent), amount_difference and day_difference], best first.
+    """
+    suggestions = {bt.name: [] for bt in bank_transactions}
+    if not bank_transactions or not vouchers:
+        return suggestions
+
+    # Vouchers and Bank Transactions by date: each block is scored against the
+    # slice of vouchers within CANDIDATE_WINDOW days of it (bisect)
+    vouchers = sorted(vouchers, key=lambda v: (getdate(v["posting_date"]), v["name"]))
+    bank_transactions = sorted(bank_transactions, key=lambda bt: getdate(bt.date))
+
+    # Voucher features
+    v_amount = np.array([flt(v["amount"]) for v in vouchers])
+    v_direction = np.array([1 if v["direction"] == "Deposit" else -1 for v in vouchers])
+    v_day = np.array([getdate(v["posting_date"]).toordinal() for v in vouchers])
+
+    references = {}
+    v_reference = np.array([
+        references.setdefault(normalize_reference(v["reference_no"]), len(references))
+        if normalize_reference(v["reference_no"]) else -1
+        for v in vouchers
+    ])
+    v_buckets = [get_token_buckets(get_tokens(v["party"], v["reference_no"])) for v in vouchers]
+
+    for start in range(0, len(bank_transactions), BLOCK_SIZE):
+        block = bank_transactions[start:start + BLOCK_SIZE]
+
+        # Bank Transaction features
+        amount = np.array([
+            flt(bt.get("unallocated_amount")) or flt(bt.deposit) or flt(bt.withdrawal) for bt in block])
+        direction = np.array([1 if flt(bt.deposit) > 0 else -1 for bt in block])
+        day = np.array([getdate(bt.date).toordinal() for bt in block])
+        # -2 never equals a voucher reference code (missing voucher references are -1)
+        reference = np.array([
+            references.get(normalize_reference(bt.reference_number), -2) for bt in block])
+
+        first = int(np.searchsorted(v_day, day[0] - CANDIDATE_WINDOW, side="left"))
+        last = int(np.searchsorted(v_day, day[-1] + CANDIDATE_WINDOW, side="right"))
+        if first == last:
+            continue
+        candidates = slice(first, last)
+        k = min(top_k, last - first)
+
+        bt_matrix = get_token_matrix([
+            get_token_buckets(get_tokens(bt.description, bt.party, bt.bank_party_name)) for bt in block])
+        v_matrix = get_token_matrix(v_buckets[candidates])
+
+        # Feature matrices (block x voucher slice)
+        amount_difference = np.abs(amount[:, None] - v_amount[None, candidates])
+        relative_difference = amount_difference / np.maximum(amount[:, None], 0.01)
+        day_difference = np.abs(day[:, None] - v_day[None, candidates])
+        intersection = bt_matrix @ v_matrix.T
+        union = bt_matrix.sum(axis=1)[:, None] + v_matrix.sum(axis=1)[None, :] - intersection
+        text_similarity = np.divide(
+            intersection, union, out=np.zeros_like(intersection), where=union > 0)
+        reference_equal = reference[:, None] == v_reference[None, candidates]
+        direction_agrees = direction[:, None] == v_direction[None, candidates]
+
+        score = 100 * (
+            WEIGHTS["amount"] * np.exp(-AMOUNT_DECAY * relative_difference)
+            + WEIGHTS["date"] * np.exp(-day_difference / DATE_DECAY)
+            + WEIGHTS["text"] * text_similarity
+            + WEIGHTS["reference"] * reference_equal
+        )
+        score[~direction_agrees | (day_difference > CANDIDATE_WINDOW)] = -np.inf
+
+        # Top-k per row: partial sort, then order the k selected
+        top = np.argpartition(-score, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(score, top, axis=1)
+        top = np.take_along_axis(top, np.argsort(-top_scores, axis=1), axis=1)
+
+        for row, bt in enumerate(block):
+            for column in top[row]:
+                if score[row, column] < MIN_SCORE:
+                    break
+
+                suggestions[bt.name].append(dict(
+                    vouchers[first + column],
+                    score=flt(score[row, column], 1),
+                    amount_difference=flt(amount_difference[row, column], 2),
+                    day_difference=int(day_difference[row, column]),
+                ))
+
+    return suggestions
@@ -0,0 +1,387 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import flt, getdate
+
+from bank_management.references import normalize_reference
+from bank_management.bank_management.report.bank_reconcile_report import bank_reconcile_report
+from bank_management.bank_management.report.bank_reconcile_report.auto_reconcile import get_exact_matches
+from bank_management.bank_management.report.bank_reconcile_report.bank_reconcile_report import (
+	get_data,
+	get_data_page,
+	get_matched_vouchers,
+	get_unmatched_journal_entries,
+	get_unmatched_payment_entries,
+)
+from bank_management.bank_management.report.bank_reconcile_report.match_state import (
+	STATE_DOCTYPE,
+	save_matches,
+	update_bank_account_state,
+)
+
+TEST_BANK = "Bank Management Test Bank"
+
+
+def get_test_company():
+	return frappe.defaults.get_user_default("Company") or frappe.get_all(
+		"Company", pluck="name", order_by="creation", limit=1
+	)[0]
+
+
+def create_bank_account(company=None):
+	"""Bank Account with its own GL account (rolled back with the test)"""
+	company = company or get_test_company()
+	account_name = "Test Bank " + frappe.generate_hash(length=8)
+
+	if not frappe.db.exists("Bank", TEST_BANK):
+		frappe.get_doc({"doctype": "Bank", "bank_name": TEST_BANK}).insert(ignore_permissions=True)
+
+	parent_account = frappe.db.get_value(
+		"Account", {"company": company, "is_group": 1, "account_type": "Bank"}
+	) or frappe.db.get_value("Account", {"company": company, "is_group": 1, "root_type": "Asset"})
+	gl_account = frappe.get_doc(
+		{
+			"doctype": "Account",
+			"account_name": account_name,
+			"company": company,
+			"parent_account": parent_account,
+			"account_type": "Bank",
+		}
+	).insert(ignore_permissions=True)
+
+	return frappe.get_doc(
+		{
+			"doctype": "Bank Account",
+			"account_name": account_name,
+			"bank": TEST_BANK,
+			"account": gl_account.name,
+			"company": company,
+			"is_company_account": 1,
+		}
+	).insert(ignore_permissions=True)
+
+
+def make_bank_transaction(bank_account, date, deposit=0, withdrawal=0, reference_number=None, **kwargs):
+	"""Submitted Bank Transaction written without controller (no allocation)"""
+	amount = flt(deposit) or flt(withdrawal)
+	doc = frappe.get_doc(
+		{
+			"doctype": "Bank Transaction",
+			"name": "TEST-BT-" + frappe.generate_hash(length=10),
+			"docstatus": 1,
+			"date": getdate(date),
+			"status": "Unreconciled",
+			"bank_account": bank_account.name,
+			"company": bank_account.company,
+			"currency": frappe.get_cached_value("Company", bank_account.company, "default_currency"),
+			"deposit": deposit,
+			"withdrawal": withdrawal,
+			"reference_number": reference_number,
+			"custom_normalized_reference": normalize_reference(reference_number),
+			"allocated_amount": 0,
+			"unallocated_amount": amount,
+			**kwargs,
+		}
+	)
+	doc.db_insert()
+	return doc
+
+
+def make_payment_entry(bank_account, posting_date, payment_type, amount, reference_no=None, **kwargs):
+	"""Submitted Payment Entry from (Pay) or to (Receive) the bank GL account, without GL Entries"""
+	is_receive = payment_type == "Receive"
+	doc = frappe.get_doc(
+		{
+			"doctype": "Payment Entry",
+			"name": "TEST-PE-" + frappe.generate_hash(length=10),
+			"docstatus": 1,
+			"posting_date": getdate(posting_date),
+			"company": bank_account.company,
+			"payment_type": payment_type,
+			"party_type": "Customer" if is_receive else "Supplier",
+			"party": "_Test Party",
+			"paid_from": None if is_receive else bank_account.account,
+			"paid_to": bank_account.account if is_receive else None,
+			"paid_amount": amount,
+			"received_amount": amount,
+			"base_paid_amount_after_tax": amount,
+			"reference_no": reference_no,
+			"custom_normalized_reference": normalize_reference(reference_no),
+			"reference_date": getdate(posting_date),
+			**kwargs,
+		}
+	)
+	doc.db_insert()
+	return doc
+
+
+def make_journal_entry(bank_account, posting_date, amount, cheque_no=None, deposit=False):
+	"""Submitted Journal Entry with one row on the bank GL account (credit, or debit for a deposit)"""
+	doc = frappe.get_doc(
+		{
+			"doctype": "Journal Entry",
+			"name": "TEST-JE-" + frappe.generate_hash(length=10),
+			"docstatus": 1,
+			"posting_date": getdate(posting_date),
+			"company": bank_account.company,
+			"voucher_type": "Bank Entry",
+			"cheque_no": cheque_no,
+			"custom_normalized_reference": normalize_reference(cheque_no),
+			"cheque_date": getdate(posting_date),
+			"total_debit": amount,
+			"total_credit": amount,
+			"accounts": [
+				{
+					"account": bank_account.account,
+					"debit_in_account_currency": amount if deposit else 0,
+					"credit_in_account_currency": 0 if deposit else amount,
+					"debit": amount if deposit else 0,
+					"credit": 0 if deposit else amount,
+					"docstatus": 1,
+				}
+			],
+		}
+	)
+	doc.db_insert()
+	for row in doc.accounts:
+		row.db_insert()
+	return doc
+
+
+class TestBankReconcileReport(FrappeTestCase):
+	def setUp(self):
+		self.bank_account = create_bank_account()
+		self.filters = frappe._dict(
+			company=self.bank_account.company,
+			bank_account=self.bank_account.name,
+			from_date=getdate("2025-01-01"),
+			to_date=getdate("2025-12-31"),
+		)
+
+	def has_matching_bank_transaction(self, reference_key, direction):
+		"""Per-voucher probe replaced by the NOT EXISTS anti-join (direction: deposit or withdrawal)"""
+		return bool(
+			frappe.db.sql(
+				f"""
+			SELECT name FROM `tabBank Transaction`
+			WHERE custom_normalized_reference = %(reference_key)s
+				AND company = %(company)s
+				AND bank_account = %(bank_account)s
+				AND docstatus = 1
+				AND `{direction}` > 0
+			LIMIT 1
+		""",
+				{
+					"reference_key": reference_key,
+					"company": self.filters.company,
+					"bank_account": self.filters.bank_account,
+				},
+			)
+		)
+
+	def test_unmatched_payment_entries_anti_join(self):
+		make_bank_transaction(self.bank_account, "2025-03-01", deposit=100, reference_number="inv 001")
+		make_bank_transaction(self.bank_account, "2025-03-02", deposit=50, reference_number="INV-002")
+		make_bank_transaction(create_bank_account(), "2025-03-03", deposit=70, reference_number="INV-003")
+
+		# Same normalized reference and direction: excluded
+		matched = make_payment_entry(self.bank_account, "2025-03-01", "Receive", 100, "INV-001")
+		# Other direction, Bank Transaction of another bank account, no Bank Transaction: kept
+		other_direction = make_payment_entry(self.bank_account, "2025-03-02", "Pay", 50, "INV-002")
+		other_bank_account = make_payment_entry(self.bank_account, "2025-03-03", "Receive", 70, "INV-003")
+		unmatched = make_payment_entry(self.bank_account, "2025-03-04", "Receive", 80, "INV-004")
+		# Outside the window
+		make_payment_entry(self.bank_account, "2026-01-01", "Receive", 90, "INV-005")
+
+		names = {pe["name"] for pe in get_unmatched_payment_entries(self.filters, set())}
+		self.assertEqual(names, {other_direction.name, other_bank_account.name, unmatched.name})
+
+		# Same result as probing every open voucher
+		candidates = frappe.get_all(
+			"Payment Entry",
+			filters={
+				"company": self.filters.company,
+				"docstatus": 1,
+				"paid_to": self.bank_account.account,
+				"posting_date": ["between", [self.filters.from_date, self.filters.to_date]],
+			},
+			fields=["name", "payment_type", "custom_normalized_reference"],
+		) + frappe.get_all(
+			"Payment Entry",
+			filters={
+				"company": self.filters.company,
+				"docstatus": 1,
+				"paid_from": self.bank_account.account,
+				"posting_date": ["between", [self.filters.from_date, self.filters.to_date]],
+			},
+			fields=["name", "payment_type", "custom_normalized_reference"],
+		)
+		probed = {
+			pe.name
+			for pe in candidates
+			if not self.has_matching_bank_transaction(
+				pe.custom_normalized_reference, "deposit" if pe.payment_type == "Receive" else "withdrawal"
+			)
+		}
+		self.assertEqual(names, probed)
+		self.assertNotIn(matched.name, names)
+
+		# Vouchers matched by the Bank Transaction rows are excluded too
+		names = {
+			pe["name"]
+			for pe in get_unmatched_payment_entries(self.filters, {("Payment Entry", unmatched.name)})
+		}
+		self.assertNotIn(unmatched.name, names)
+
+	def test_unmatched_journal_entries_anti_join(self):
+		make_bank_transaction(self.bank_account, "2025-04-01", withdrawal=40, reference_number="CHQ-1")
+		make_bank_transaction(self.bank_account, "2025-04-02", deposit=60, reference_number="CHQ-2")
+
+		# Withdrawal with the same normalized reference (Case 3): excluded
+		matched = make_journal_entry(self.bank_account, "2025-04-01", 40, "chq 1")
+		# Only a deposit with the reference, no Bank Transaction: kept
+		deposit_reference = make_journal_entry(self.bank_account, "2025-04-02", 60, "CHQ-2")
+		unmatched = make_journal_entry(self.bank_account, "2025-04-03", 30, "CHQ-3")
+
+		names = {je["name"] for je in get_unmatched_journal_entries(self.filters, set())}
+		self.assertEqual(names, {deposit_reference.name, unmatched.name})
+		self.assertEqual(
+			names,
+			{
+				name
+				for name in (matched.name, deposit_reference.name, unmatched.name)
+				if not self.has_matching_bank_transaction(
+					frappe.db.get_value("Journal Entry", name, "custom_normalized_reference"), "withdrawal"
+				)
+			},
+		)
+
+	def test_exact_matches_skip_ambiguous(self):
+		ambiguous = make_bank_transaction(self.bank_account, "2025-05-01", deposit=100, reference_number="DUP-1")
+		unique = make_bank_transaction(self.bank_account, "2025-05-02", deposit=60, reference_number="ONE-1")
+
+		# Two open vouchers with the reference, direction and amount
+		first = make_payment_entry(self.bank_account, "2025-05-01", "Receive", 100, "DUP-1")
+		make_payment_entry(self.bank_account, "2025-05-03", "Receive", 100, "DUP-1")
+		# Same reference with another amount is not ambiguous
+		voucher = make_payment_entry(self.bank_account, "2025-05-02", "Receive", 60, "ONE-1")
+		make_payment_entry(self.bank_account, "2025-05-04", "Receive", 75, "ONE-1")
+
+		# The report still shows the first voucher, flagged
+		matched = get_matched_vouchers([ambiguous, unique], frappe._dict())
+		self.assertEqual(matched[ambiguous.name]["name"], first.name)
+		self.assertTrue(matched[ambiguous.name].get("is_ambiguous"))
+		self.assertFalse(matched[unique.name].get("is_ambiguous"))
+
+		matches = get_exact_matches([ambiguous, unique])
+		self.assertEqual(
+			[(d["bank_transaction"], d["voucher_name"]) for d in matches], [(unique.name, voucher.name)]
+		)
+
+	def test_exact_matches_skip_shared_references(self):
+		# Same reference, direction and amount: either could take the voucher
+		first = make_bank_transaction(self.bank_account, "2025-05-10", deposit=80, reference_number="TWICE-1")
+		second = make_bank_transaction(self.bank_account, "2025-05-11", deposit=80, reference_number="twice 1")
+		# Another open one outside the batch (partially allocated)
+		make_bank_transaction(
+			self.bank_account, "2025-05-12", deposit=90, reference_number="OUT-1", unallocated_amount=40
+		)
+		batch = make_bank_transaction(self.bank_account, "2025-05-12", deposit=90, reference_number="OUT-1")
+		# A withdrawal with the reference is not shared
+		refund = make_bank_transaction(self.bank_account, "2025-05-13", withdrawal=80, reference_number="TWICE-1")
+
+		make_payment_entry(self.bank_account, "2025-05-10", "Receive", 80, "TWICE-1")
+		make_payment_entry(self.bank_account, "2025-05-12", "Receive", 90, "OUT-1")
+		voucher = make_payment_entry(self.bank_account, "2025-05-13", "Pay", 80, "TWICE-1")
+
+		matches = get_exact_matches([first, second, batch, refund])
+		self.assertEqual(
+			[(d["bank_transaction"], d["voucher_name"]) for d in matches], [(refund.name, voucher.name)]
+		)
+
+	def test_data_page_excludes_fuzzy_matches(self):
+		# Without reference number, matched on the first page by amount and date only
+		fuzzy = make_bank_transaction(self.bank_account, "2025-07-20", deposit=100)
+		make_bank_transaction(self.bank_account, "2025-07-01", deposit=999)
+		# References without Bank Transaction, not excluded by the reference anti-join
+		voucher = make_payment_entry(self.bank_account, "2025-07-19", "Receive", 100, "FZ-100")
+		unmatched = make_payment_entry(self.bank_account, "2025-07-05", "Receive", 55, "FZ-55")
+		# Stored by the background job of the first view
+		save_matches([fuzzy], get_matched_vouchers([fuzzy], frappe._dict()))
+
+		pages = []
+		after = None
+		while True:
+			page = get_data_page(self.filters, after=after, page_length=1)
+			pages.append(page["data"])
+			after = page["last"]
+			if not page["has_more"]:
+				break
+
+		rows = [row for data in pages for row in data]
+		self.assertEqual(pages[0][0]["bt_name"], fuzzy.name)
+		self.assertEqual(pages[0][0]["voucher_name"], voucher.name)
+
+		# The last page lists the unmatched vouchers, not the one matched on the first page
+		voucher_rows = [row["voucher_name"] for row in rows if not row["bt_name"]]
+		self.assertIn(unmatched.name, voucher_rows)
+		self.assertNotIn(voucher.name, voucher_rows)
+
+	def test_stored_reference_match_outside_window(self):
+		bt = make_bank_transaction(self.bank_account, "2025-03-10", deposit=100, reference_number="WIN-1")
+		previous_year = make_payment_entry(self.bank_account, "2024-12-30", "Receive", 100, "WIN-1")
+		voucher = make_payment_entry(self.bank_account, "2025-03-09", "Receive", 100, "WIN-1")
+
+		# The state is stored without voucher date window: the first voucher by posting date
+		matched = get_matched_vouchers([bt], frappe._dict())
+		self.assertEqual(matched[bt.name]["name"], previous_year.name)
+		save_matches([bt], matched)
+
+		# The report resolves it again within the window of its filters
+		rows = [row for row in get_data(self.filters) if row.get("bt_name") == bt.name]
+		self.assertEqual([row["voucher_name"] for row in rows], [voucher.name])
+
+	def get_report_voucher(self, bt):
+		rows = [row for row in get_data(self.filters) if row.get("bt_name") == bt.name]
+		return [row["voucher_name"] for row in rows]
+
+	def test_stored_no_match_within_window(self):
+		bt = make_bank_transaction(self.bank_account, "2025-03-10", deposit=100, reference_number="WIN-2")
+		# First voucher of the reference overall, another amount: no match without window
+		make_payment_entry(self.bank_account, "2024-12-30", "Receive", 70, "WIN-2")
+		voucher = make_payment_entry(self.bank_account, "2025-03-09", "Receive", 100, "WIN-2")
+
+		matched = get_matched_vouchers([bt], frappe._dict())
+		self.assertIsNone(matched[bt.name])
+		save_matches([bt], matched)
+
+		# Within the window of the filters the second voucher is the first one
+		self.assertEqual(self.get_report_voucher(bt), [voucher.name])
+
+	def test_stored_match_cleared(self):
+		bt = make_bank_transaction(self.bank_account, "2025-04-10", deposit=100, reference_number="CLR-1")
+		voucher = make_payment_entry(self.bank_account, "2025-04-09", "Receive", 100, "CLR-1")
+		save_matches([bt], get_matched_vouchers([bt], frappe._dict()))
+
+		# Bank Clearance sets the clearance date without doc_events
+		frappe.db.set_value("Payment Entry", voucher.name, "clearance_date", "2025-04-12")
+		with patch.object(bank_reconcile_report, "enqueue_update") as enqueue_update:
+			self.assertEqual(self.get_report_voucher(bt), [""])
+		enqueue_update.assert_called_once_with({self.bank_account.name})
+
+		# The job of the bank account stores the state again
+		with patch.object(frappe.db, "commit"):
+			update_bank_account_state(self.bank_account.name)
+		self.assertEqual(frappe.db.get_value(STATE_DOCTYPE, bt.name, "voucher_name"), None)
+
+	def test_update_bank_account_state(self):
+		bt = make_bank_transaction(self.bank_account, "2025-04-20", deposit=100, reference_number="UPD-1")
+		voucher = make_payment_entry(self.bank_account, "2025-04-19", "Receive", 100, "UPD-1")
+
+		with patch.object(frappe.db, "commit"):
+			update_bank_account_state(self.bank_account.name)
+		self.assertEqual(frappe.db.get_value(STATE_DOCTYPE, bt.name, "voucher_name"), voucher.name)
@@ -0,0 +1,89 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and Contributors
+# See license.txt
+
+import json
+
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import getdate
+
+from bank_management.bank_management.report.bank_reconcile_report.columnar import (
+	COLUMNAR_KEY,
+	decode_rows,
+	encode_rows,
+	get_columnar_data,
+)
+
+ROWS = [
+	{
+		"bt_name": "ACC-BTN-2025-00001",
+		"bt_date": getdate("2025-01-15"),
+		"bt_deposit": 1234.5,
+		"voucher_doc_type": "Payment Entry",
+		"voucher_name": "ACC-PAY-2025-00001",
+		"voucher_posting_date": getdate("2025-01-14"),
+		"voucher_party_type": "Customer",
+		"match_confidence": None,
+		"reconciled_status": "Unreconciled",
+		"actions": 1,
+	},
+	{
+		"bt_name": "ACC-BTN-2025-00002",
+		"bt_date": getdate("2025-01-16"),
+		"bt_deposit": 0,
+		"voucher_doc_type": "",
+		"voucher_name": "",
+		"voucher_posting_date": "",
+		"voucher_party_type": "",
+		"match_confidence": None,
+		"reconciled_status": "Pending",
+		"actions": 6,
+	},
+	{
+		"bt_name": "",
+		"bt_date": "",
+		"bt_deposit": 0,
+		"voucher_doc_type": "Payment Entry",
+		"voucher_name": "ACC-PAY-2025-00002",
+		"voucher_posting_date": getdate("2025-01-20"),
+		"voucher_party_type": "Supplier",
+		"match_confidence": 87.5,
+		"reconciled_status": "Unmatched",
+		"actions": 8,
+	},
+]
+
+
+def iso_dates(row):
+	return {key: value.isoformat() if hasattr(value, "isoformat") else value for key, value in row.items()}
+
+
+class TestColumnar(FrappeTestCase):
+	def test_round_trip(self):
+		payload = json.loads(json.dumps(encode_rows(ROWS)))
+		self.assertEqual(decode_rows(payload), [iso_dates(row) for row in ROWS])
+
+	def test_dictionary_encoding(self):
+		payload = encode_rows(ROWS)
+		self.assertEqual(payload["length"], 3)
+		self.assertEqual(payload["dictionaries"]["voucher_doc_type"], ["Payment Entry", ""])
+		self.assertEqual(payload["values"]["voucher_doc_type"], [0, 1, 0])
+		self.assertEqual(
+			payload["dictionaries"]["reconciled_status"], ["Unreconciled", "Pending", "Unmatched"]
+		)
+		# Other fields are sent as they are, dates as ISO strings
+		self.assertNotIn("voucher_name", payload["dictionaries"])
+		self.assertEqual(payload["values"]["bt_date"], ["2025-01-15", "2025-01-16", ""])
+
+	def test_missing_fields(self):
+		rows = [{"bt_name": "BT-1", "bt_date": getdate("2025-01-15")}, {"voucher_name": "PE-1"}]
+		self.assertEqual(
+			decode_rows(encode_rows(rows)),
+			[
+				{"bt_name": "BT-1", "bt_date": "2025-01-15", "voucher_name": None},
+				{"bt_name": None, "bt_date": None, "voucher_name": "PE-1"},
+			],
+		)
+
+	def test_empty(self):
+		self.assertEqual(decode_rows(encode_rows([])), [])
+		self.assertEqual(get_columnar_data([]), [{COLUMNAR_KEY: encode_rows([])}])
@@ -0,0 +1,124 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, getdate
+
+from bank_management.bank_management.report.bank_reconcile_report import group_matching
+from bank_management.bank_management.report.bank_reconcile_report.group_matching import (
+	DateIndex,
+	find_subset,
+	get_group_matches,
+)
+from bank_management.bank_management.report.bank_reconcile_report.test_bank_reconcile_report import (
+	create_bank_account,
+	make_bank_transaction,
+	make_payment_entry,
+)
+
+
+class FakeTime:
+	"""Clock advancing 10 ms on every read"""
+
+	def __init__(self):
+		self.now = 0.0
+
+	def monotonic(self):
+		self.now += 0.01
+		return self.now
+
+
+class TestGroupMatching(FrappeTestCase):
+	def assert_subset(self, subset, items, target):
+		self.assertIsNotNone(subset)
+		self.assertEqual(len(set(subset)), len(subset))
+		self.assertLessEqual(abs(sum(items[i] for i in subset) - target), group_matching.TOLERANCE_CENTS)
+
+	def test_find_subset(self):
+		items = [1500, 2500, 700, 4000, 300, 12000]
+		self.assertEqual(sorted(find_subset(4000, items)), [0, 1])
+		self.assert_subset(find_subset(4300, items), items, 4300)
+
+		# Within one cent
+		self.assert_subset(find_subset(4001, items), items, 4001)
+		self.assertIsNone(find_subset(4003, [1000, 3000]))
+
+		# A single item is not a group, larger items are ignored
+		self.assertIsNone(find_subset(12000, [12000, 50000]))
+		self.assertIsNone(find_subset(100, [100]))
+
+	def test_find_subset_smallest_group(self):
+		items = [100, 200, 300, 400, 500, 1000]
+		self.assertEqual(len(find_subset(1500, items)), 2)
+		self.assertEqual(sorted(find_subset(600, [100, 200, 300, 600, 500])), [0, 4])
+
+	def test_find_subset_max_size(self):
+		items = [100] * 8
+		self.assertEqual(len(find_subset(500, items)), 5)
+		self.assertIsNone(find_subset(600, items))
+		self.assertEqual(len(find_subset(600, items, max_size=6)), 6)
+
+	def test_find_subset_time_budget(self):
+		# The pair needs one item of each half: the first half gets its share of the budget
+		items = [100, 5, 9, 200, 6, 8]
+		with patch.object(group_matching, "time", FakeTime()):
+			self.assertEqual(sorted(find_subset(300, items, time_budget=0.03)), [0, 3])
+
+		# Exhausted budget: no search
+		self.assertIsNone(find_subset(300, items, time_budget=-1))
+
+	def test_date_index(self):
+		date = getdate("2025-08-10")
+		items = [
+			frappe._dict(name=name, direction=direction, date=add_days(date, days))
+			for name, direction, days in (
+				("A", "Deposit", 0),
+				("B", "Deposit", -2),
+				("C", "Deposit", 1),
+				("D", "Deposit", group_matching.DATE_WINDOW + 1),
+				("E", "Withdrawal", 0),
+				("F", "Deposit", -group_matching.DATE_WINDOW),
+				("G", "Deposit", 3),
+			)
+		]
+		index = DateIndex(items, lambda d: d.direction, lambda d: d.date)
+
+		def get_closest(is_available=lambda d: True):
+			return [d.name for d in index.get_closest("Deposit", date, is_available)]
+
+		# Closest first, within the date window and of the direction only
+		self.assertEqual(get_closest(), ["A", "C", "B", "G", "F"])
+		self.assertEqual(get_closest(lambda d: d.name != "C"), ["A", "B", "G", "F"])
+		with patch.object(group_matching, "MAX_CANDIDATES", 2):
+			self.assertEqual(get_closest(), ["A", "C"])
+		self.assertEqual(index.get_closest("Withdrawal", add_days(date, 20), lambda d: True), [])
+
+	def test_group_matches_total_time_budget(self):
+		bank_account = create_bank_account()
+		deposit = make_bank_transaction(bank_account, "2025-08-10", deposit=100)
+		make_payment_entry(bank_account, "2025-08-09", "Receive", 60)
+		make_payment_entry(bank_account, "2025-08-10", "Receive", 40)
+
+		# Deadline passed: no search at all
+		with patch.object(group_matching, "TOTAL_TIME_BUDGET", 0):
+			self.assertEqual(get_group_matches([deposit], bank_account.company, bank_account.account), [])
+
+	def test_group_matches_exclude_matched_vouchers(self):
+		bank_account = create_bank_account()
+		deposit = make_bank_transaction(bank_account, "2025-08-10", deposit=100)
+		first = make_payment_entry(bank_account, "2025-08-09", "Receive", 60)
+		second = make_payment_entry(bank_account, "2025-08-10", "Receive", 40)
+
+		groups = get_group_matches([deposit], bank_account.company, bank_account.account)
+		self.assertEqual(len(groups), 1)
+		self.assertEqual(groups[0]["type"], "Many to One")
+		self.assertEqual({d["name"] for d in groups[0]["vouchers"]}, {first.name, second.name})
+
+		# A voucher matched 1:1 to another Bank Transaction of the statement is not offered
+		groups = get_group_matches(
+			[deposit], bank_account.company, bank_account.account, {("Payment Entry", second.name)}
+		)
+		self.assertEqual(groups, [])
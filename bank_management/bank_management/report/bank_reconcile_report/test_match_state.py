@@ -0,0 +1,129 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, getdate
+
+from bank_management.references import normalize_reference
+from bank_management.bank_management.report.bank_reconcile_report import match_state
+from bank_management.bank_management.report.bank_reconcile_report.match_state import (
+	STATE_DOCTYPE,
+	clear_match_state,
+	save_matches,
+)
+from bank_management.bank_management.report.bank_reconcile_report.matching import get_fuzzy_settings
+
+DATE = getdate("2025-06-15")
+
+
+def make_bank_transaction(bank_account, date, reference_number=None):
+	return frappe._dict(
+		name="TEST-BMS-" + frappe.generate_hash(length=10),
+		company="_Test Company",
+		bank_account=bank_account,
+		date=getdate(date),
+		reference_number=reference_number,
+	)
+
+
+def make_voucher(name, date):
+	return {"doctype": "Payment Entry", "name": name, "posting_date": getdate(date), "amount": 100}
+
+
+class TestMatchState(FrappeTestCase):
+	def setUp(self):
+		window = get_fuzzy_settings()[1] * 2
+		self.bank_account = "Test Bank Account " + frappe.generate_hash(length=8)
+		self.other_account = "Test Bank Account " + frappe.generate_hash(length=8)
+
+		self.by_voucher = make_bank_transaction(self.bank_account, DATE, "REF-1")
+		self.same_reference = make_bank_transaction(self.bank_account, add_days(DATE, -60), "ref 2")
+		self.within_window = make_bank_transaction(self.bank_account, add_days(DATE, window))
+		self.outside_window = make_bank_transaction(self.bank_account, add_days(DATE, window + 1))
+		self.other_reference = make_bank_transaction(self.bank_account, DATE, "REF-3")
+		self.other_bank_account = make_bank_transaction(self.other_account, DATE, "REF-2")
+		self.bank_transactions = [
+			self.by_voucher,
+			self.same_reference,
+			self.within_window,
+			self.outside_window,
+			self.other_reference,
+			self.other_bank_account,
+		]
+
+		save_matches(self.bank_transactions, {self.by_voucher.name: make_voucher("TEST-BMS-PE-1", DATE)})
+
+	def get_state(self):
+		return set(
+			frappe.get_all(
+				STATE_DOCTYPE,
+				filters={"name": ["in", [bt.name for bt in self.bank_transactions]]},
+				pluck="name",
+			)
+		)
+
+	def assert_cleared(self, cleared, **kwargs):
+		names = {bt.name for bt in self.bank_transactions}
+		with patch.object(match_state, "enqueue_update") as enqueue_update:
+			clear_match_state(**kwargs)
+
+		self.assertEqual(self.get_state(), names - {bt.name for bt in cleared})
+		# The bank accounts of the cleared Bank Transactions are matched again in the background
+		enqueue_update.assert_called_once()
+		self.assertEqual(set(enqueue_update.call_args[0][0]), {bt.bank_account for bt in cleared})
+
+	def test_save_matches(self):
+		self.assertEqual(self.get_state(), {bt.name for bt in self.bank_transactions})
+		self.assertEqual(
+			frappe.db.get_value(STATE_DOCTYPE, self.by_voucher.name, ["match_type", "voucher_name"]),
+			("Reference", "TEST-BMS-PE-1"),
+		)
+		self.assertEqual(
+			frappe.db.get_value(STATE_DOCTYPE, self.same_reference.name, "reference_key"),
+			normalize_reference("ref 2"),
+		)
+
+		# Saving again replaces the rows without queueing them
+		with patch.object(match_state, "enqueue_update") as enqueue_update:
+			save_matches([self.by_voucher], {})
+		enqueue_update.assert_not_called()
+		self.assertEqual(frappe.db.get_value(STATE_DOCTYPE, self.by_voucher.name, "match_type"), "")
+
+	def test_clear_by_bank_transaction(self):
+		self.assert_cleared([self.same_reference], bank_transactions=[self.same_reference.name])
+
+	def test_clear_by_voucher(self):
+		self.assert_cleared([self.by_voucher], vouchers=[("Payment Entry", "TEST-BMS-PE-1")])
+
+	def test_clear_by_reference(self):
+		# Only of the bank account
+		self.assert_cleared([self.same_reference], bank_accounts=[self.bank_account], references=["ref 2"])
+
+	def test_clear_by_date_window(self):
+		# Rows without reference within twice the fuzzy date window
+		self.assert_cleared([self.within_window], bank_accounts=[self.bank_account], dates=[DATE])
+
+	def test_enqueue_update_per_bank_account(self):
+		with patch("frappe.enqueue") as enqueue:
+			match_state.enqueue_update([self.bank_account, self.other_account, self.bank_account, None])
+
+		self.assertEqual(enqueue.call_count, 2)
+		for call in enqueue.call_args_list:
+			self.assertTrue(call.kwargs["deduplicate"])
+			self.assertEqual(call.kwargs["job_id"], "bank_match_state::" + call.kwargs["bank_account"])
+		self.assertEqual(
+			{call.kwargs["bank_account"] for call in enqueue.call_args_list}, {self.bank_account, self.other_account}
+		)
+
+	def test_clear_without_recompute(self):
+		with patch.object(match_state, "enqueue_update") as enqueue_update:
+			# References and dates only apply with bank accounts
+			clear_match_state(references=["REF-1"], dates=[DATE])
+			clear_match_state(bank_transactions=[self.by_voucher.name], recompute=False)
+
+		enqueue_update.assert_not_called()
+		self.assertNotIn(self.by_voucher.name, self.get_state())
+		self.assertIn(self.same_reference.name, self.get_state())
@@ -0,0 +1,91 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import getdate
+
+from bank_management.bank_management.report.bank_reconcile_report.matching import (
+	VoucherIndex,
+	get_confidence,
+	get_fuzzy_matches,
+)
+from bank_management.bank_management.report.bank_reconcile_report.test_bank_reconcile_report import (
+	create_bank_account,
+	make_bank_transaction,
+	make_payment_entry,
+)
+
+
+def make_voucher(name, direction, amount, posting_date):
+	return {
+		"doctype": "Payment Entry",
+		"name": name,
+		"direction": direction,
+		"amount": amount,
+		"posting_date": getdate(posting_date),
+	}
+
+
+class TestMatching(FrappeTestCase):
+	def test_voucher_index(self):
+		index = VoucherIndex(
+			[
+				make_voucher("V-1", "Deposit", 100.4, "2025-01-02"),
+				make_voucher("V-2", "Deposit", 99.5, "2025-01-01"),
+				make_voucher("V-3", "Deposit", 100, "2025-01-03"),
+				make_voucher("V-4", "Deposit", 100, "2025-01-01"),
+				make_voucher("V-5", "Deposit", 100.6, "2025-01-01"),
+				make_voucher("V-6", "Withdrawal", 100, "2025-01-01"),
+			]
+		)
+
+		# Range query on the amount (bounds included), ordered by amount and posting date
+		self.assertEqual(
+			[d["name"] for d in index.get_candidates("Deposit", 100, 0.5)], ["V-2", "V-4", "V-3", "V-1"]
+		)
+		self.assertEqual([d["name"] for d in index.get_candidates("Deposit", 100, 0)], ["V-4", "V-3"])
+		self.assertEqual([d["name"] for d in index.get_candidates("Withdrawal", 100, 1)], ["V-6"])
+		self.assertEqual(index.get_candidates("Withdrawal", 50, 1), [])
+
+	def test_confidence(self):
+		self.assertEqual(get_confidence(0, 0, 1, 5), 100)
+		self.assertLess(get_confidence(0.5, 0, 1, 5), get_confidence(0, 0, 1, 5))
+		self.assertLess(get_confidence(0, 3, 1, 5), get_confidence(0, 1, 1, 5))
+
+	def test_fuzzy_assignment(self):
+		bank_account = create_bank_account()
+		first = make_bank_transaction(bank_account, "2025-02-10", deposit=100)
+		second = make_bank_transaction(bank_account, "2025-02-12", deposit=100)
+		withdrawal = make_bank_transaction(bank_account, "2025-02-10", withdrawal=100)
+		unmatched = make_bank_transaction(bank_account, "2025-02-10", deposit=300)
+
+		same_day = make_payment_entry(bank_account, "2025-02-10", "Receive", 100)
+		next_day = make_payment_entry(bank_account, "2025-02-13", "Receive", 100)
+		payment = make_payment_entry(bank_account, "2025-02-09", "Pay", 100)
+		# Outside the date window
+		make_payment_entry(bank_account, "2025-02-01", "Receive", 300)
+
+		matched = get_fuzzy_matches(
+			[first, second, withdrawal, unmatched],
+			bank_account.company,
+			bank_account.account,
+			amount_tolerance=0.01,
+			date_window=5,
+		)
+
+		# Best pairs first, every voucher used once
+		self.assertEqual(matched[first.name]["name"], same_day.name)
+		self.assertEqual(matched[first.name]["confidence"], 100)
+		self.assertEqual(matched[second.name]["name"], next_day.name)
+		self.assertEqual(matched[withdrawal.name]["name"], payment.name)
+		self.assertEqual(matched[withdrawal.name]["match_type"], "fuzzy")
+		self.assertNotIn(unmatched.name, matched)
+
+		# One voucher for two Bank Transactions goes to the closer one
+		frappe.db.set_value("Payment Entry", same_day.name, "clearance_date", "2025-02-10")
+		matched = get_fuzzy_matches(
+			[first, second], bank_account.company, bank_account.account, amount_tolerance=0.01, date_window=5
+		)
+		self.assertEqual(matched, {second.name: matched[second.name]})
+		self.assertEqual(matched[second.name]["name"], next_day.name)
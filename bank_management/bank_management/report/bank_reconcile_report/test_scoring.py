@@ -0,0 +1,117 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, getdate
+
+from bank_management.bank_management.report.bank_reconcile_report import scoring
+from bank_management.bank_management.report.bank_reconcile_report.scoring import score_candidates
+
+
+def make_bank_transaction(name, amount, date, reference_number=None, description=None):
+	return frappe._dict(
+		name=name,
+		date=getdate(date),
+		deposit=amount if amount > 0 else 0,
+		withdrawal=-amount if amount < 0 else 0,
+		reference_number=reference_number,
+		description=description,
+		party=None,
+		bank_party_name=None,
+	)
+
+
+def make_voucher(name, amount, date, reference_no="", party=""):
+	return {
+		"doctype": "Payment Entry",
+		"name": name,
+		"amount": abs(amount),
+		"direction": "Deposit" if amount > 0 else "Withdrawal",
+		"posting_date": getdate(date),
+		"reference_no": reference_no,
+		"party": party,
+	}
+
+
+class TestScoring(FrappeTestCase):
+	def setUp(self):
+		date = getdate("2025-03-15")
+		self.bank_transactions = [
+			make_bank_transaction("BT-1", 100, date, "INV-1", "Payment from Acme Trading"),
+			make_bank_transaction("BT-2", -250, date),
+			make_bank_transaction("BT-3", 40, add_days(date, 30)),
+		]
+		self.vouchers = [
+			make_voucher("PE-1", 100, date, "inv 1", "Acme Trading"),
+			make_voucher("PE-2", 100, add_days(date, 3)),
+			make_voucher("PE-3", 100.5, add_days(date, 1)),
+			make_voucher("PE-4", 101, date),
+			make_voucher("PE-5", 99, add_days(date, -10)),
+			make_voucher("PE-6", -100, date, "INV-1"),
+			make_voucher("PE-7", -250, add_days(date, 2)),
+			make_voucher("PE-8", -260, date),
+		]
+
+	def test_top_k(self):
+		suggestions = score_candidates(self.bank_transactions, self.vouchers, top_k=3)
+		ranking = score_candidates(self.bank_transactions, self.vouchers, top_k=len(self.vouchers))
+
+		for name, vouchers in suggestions.items():
+			scores = [d["score"] for d in vouchers]
+			self.assertLessEqual(len(vouchers), 3)
+			self.assertEqual(scores, sorted(scores, reverse=True))
+			# Same vouchers as the first k of the full ranking
+			self.assertEqual(scores, [d["score"] for d in ranking[name][:3]])
+
+		# Same amount, day, reference and party first
+		self.assertEqual(suggestions["BT-1"][0]["name"], "PE-1")
+		self.assertEqual(suggestions["BT-1"][0]["amount_difference"], 0)
+		self.assertEqual(suggestions["BT-1"][0]["day_difference"], 0)
+		self.assertEqual(suggestions["BT-2"][0]["name"], "PE-7")
+
+	def test_direction_and_min_score(self):
+		suggestions = score_candidates(self.bank_transactions, self.vouchers, top_k=len(self.vouchers))
+
+		# Vouchers of the other direction are never suggested
+		self.assertNotIn("PE-6", [d["name"] for d in suggestions["BT-1"]])
+		self.assertEqual({d["direction"] for d in suggestions["BT-2"]}, {"Withdrawal"})
+		self.assertEqual([d["name"] for d in suggestions["BT-2"][:2]], ["PE-7", "PE-8"])
+
+		# Nothing close to 40: every score is below MIN_SCORE
+		self.assertEqual(suggestions["BT-3"], [])
+		for vouchers in suggestions.values():
+			self.assertTrue(all(d["score"] >= scoring.MIN_SCORE for d in vouchers))
+
+	def test_unallocated_amount(self):
+		# 150 of 250 already allocated: the rest is scored
+		bt = make_bank_transaction("BT-4", -250, "2025-03-15")
+		bt.unallocated_amount = 100
+		vouchers = [make_voucher("PE-9", -250, "2025-03-15"), make_voucher("PE-10", -100, "2025-03-15")]
+
+		suggestions = score_candidates([bt], vouchers, top_k=2)
+		self.assertEqual(suggestions["BT-4"][0]["name"], "PE-10")
+		self.assertEqual(suggestions["BT-4"][0]["amount_difference"], 0)
+
+	def test_candidate_window(self):
+		date = getdate("2025-03-15")
+		bt = make_bank_transaction("BT-4", 100, date, "INV-9")
+		vouchers = [
+			make_voucher("PE-9", 100, add_days(date, scoring.CANDIDATE_WINDOW + 1), "INV-9"),
+			make_voucher("PE-10", 100, add_days(date, -scoring.CANDIDATE_WINDOW), "INV-9"),
+		]
+
+		# Posted more than CANDIDATE_WINDOW days away: not a candidate
+		suggestions = score_candidates([bt], vouchers, top_k=2)
+		self.assertEqual([d["name"] for d in suggestions["BT-4"]], ["PE-10"])
+
+	def test_blocks(self):
+		expected = score_candidates(self.bank_transactions, self.vouchers, top_k=2)
+		with patch.object(scoring, "BLOCK_SIZE", 2):
+			self.assertEqual(score_candidates(self.bank_transactions, self.vouchers, top_k=2), expected)
+
+	def test_empty(self):
+		self.assertEqual(score_candidates(self.bank_transactions, [], top_k=2), {"BT-1": [], "BT-2": [], "BT-3": []})
+		self.assertEqual(score_candidates([], self.vouchers), {})
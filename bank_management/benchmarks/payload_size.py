@@ -0,0 +1,191 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+"""
+Payload size of Bank Reconcile Report rows: pre-rendered HTML buttons and
+emoji status (old format) against status names and action flags rendered by
+the JavaScript formatter (current format), and the current rows in the
+columnar format (columnar filter).
+
+    bench --site <site> execute bank_management.benchmarks.payload_size.run --kwargs "{'rows': 100000}"
+
+No database access, rows are generated in memory.
+"""
+
+import gzip
+import json
+import random
+import time
+from datetime import date, timedelta
+
+from bank_management.bank_management.report.bank_reconcile_report.bank_reconcile_report import (
+    ACTION_CREATE_BT,
+    ACTION_CREATE_JE,
+    ACTION_CREATE_PE,
+    ACTION_RECONCILE,
+    can_reconcile,
+    get_row_status,
+)
+from bank_management.bank_management.report.bank_reconcile_report.columnar import encode_rows
+
+
+def run(rows=100000, seed=42):
+    """Size (raw and gzip) and serialization time of each format for the same rows"""
+    old_rows, new_rows = get_rows(int(rows), seed)
+    result = {
+        "rows": int(rows),
+        "old": measure(old_rows),
+        "new": measure(new_rows),
+        # Encoding time included, it is part of the response time
+        "columnar": measure(new_rows, encode_rows),
+    }
+    for fmt in ("new", "columnar"):
+        result[fmt]["ratio"] = round(result["old"]["bytes"] / max(result[fmt]["bytes"], 1), 2)
+        result[fmt]["gzip_ratio"] = round(result["old"]["gzip_bytes"] / max(result[fmt]["gzip_bytes"], 1), 2)
+
+    print(json.dumps(result, indent=1))
+    return result
+
+
+def measure(rows, encode=None):
+    start = time.perf_counter()
+    payload = json.dumps(encode(rows) if encode else rows, default=str, separators=(",", ":")).encode()
+    seconds = time.perf_counter() - start
+    return {
+        "bytes": len(payload),
+        "gzip_bytes": len(gzip.compress(payload, 6)),
+        "serialize_seconds": round(seconds, 3),
+    }
+
+
+def get_rows(count, seed):
+    """Same report rows in the old and the current format: matched, unmatched and voucher-only rows"""
+    rng = random.Random(seed)
+    start_date = date(2026, 1, 1)
+    old_rows, new_rows = [], []
+
+    for i in range(count):
+        kind = rng.random()
+        amount = round(rng.uniform(10, 50000), 2)
+        posting_date = start_date + timedelta(days=rng.randint(0, 364))
+        reference = f"REF-{rng.randint(1, 10 ** 8):08d}"
+
+        if kind < 0.15:
+            # Voucher without Bank Transaction
+            doctype = rng.choice(("Payment Entry", "Journal Entry"))
+            name = f"{'ACC-PAY' if doctype == 'Payment Entry' else 'ACC-JV'}-2026-{i:06d}"
+            row = get_voucher_row(doctype, name, reference, posting_date, amount)
+            old_rows.append(dict(row, reconciled_status="❌ Unmatched", btn_reconcile="", btn_create_pe="",
+                                 btn_create_je="", btn_create_bt=legacy_create_bt_button(doctype, name)))
+            new_rows.append(dict(row, reconciled_status="Unmatched", actions=ACTION_CREATE_BT))
+            continue
+
+        bt = {
+            "name": f"ACC-BTN-2026-{i:06d}",
+            "date": posting_date,
+            "deposit": amount if kind < 0.6 else 0,
+            "withdrawal": 0 if kind < 0.6 else amount,
+            "reference_number": reference,
+            "status": rng.choice(("Unreconciled", "Unreconciled", "Reconciled", "Pending")),
+        }
+        bt["unallocated_amount"] = 0 if bt["status"] == "Reconciled" else amount
+        base = {
+            "bt_name": bt["name"],
+            "bt_date": bt["date"],
+            "bt_deposit": bt["deposit"],
+            "bt_withdrawal": bt["withdrawal"],
+            "bt_reference_number": reference,
+            "bt_unallocated_amount": bt["unallocated_amount"],
+        }
+
+        if kind < 0.85:
+            # Bank Transaction with matched voucher
+            voucher = {"doctype": "Payment Entry", "name": f"ACC-PAY-2026-{i:06d}", "is_linked": rng.random() < 0.5}
+            row = dict(base, **get_voucher_row(voucher["doctype"], voucher["name"], reference, posting_date, amount),
+                       match_confidence=None)
+            old_rows.append(dict(
+                row,
+                reconciled_status=legacy_status(bt["status"], bt["unallocated_amount"], True, voucher["is_linked"]),
+                btn_reconcile="" if voucher["is_linked"] else legacy_reconcile_button(
+                    bt["name"], bt["unallocated_amount"], voucher["name"], voucher["doctype"], bt["status"]),
+                btn_create_pe="", btn_create_je="", btn_create_bt=""))
+            new_rows.append(dict(
+                row,
+                reconciled_status=get_row_status(bt["status"], bt["unallocated_amount"], True, voucher["is_linked"]),
+                actions=ACTION_RECONCILE if can_reconcile(AttrDict(bt), voucher) else 0))
+        else:
+            # Bank Transaction without voucher
+            row = dict(base, **get_voucher_row("", "", "", "", 0))
+            open_amount = bt["unallocated_amount"] > 0
+            old_rows.append(dict(
+                row,
+                reconciled_status=legacy_status(bt["status"], bt["unallocated_amount"], False, False),
+                btn_reconcile="",
+                btn_create_pe=legacy_create_pe_button(bt["name"], bt["unallocated_amount"], reference, bt["date"]),
+                btn_create_je=legacy_create_je_button(bt["name"], bt["unallocated_amount"]),
+                btn_create_bt=""))
+            new_rows.append(dict(
+                row,
+                reconciled_status=get_row_status(bt["status"], bt["unallocated_amount"], False, False),
+                actions=ACTION_CREATE_PE | ACTION_CREATE_JE if open_amount else 0))
+
+    return old_rows, new_rows
+
+
+def get_voucher_row(doctype, name, reference, posting_date, amount):
+    return {
+        "voucher_doc_type": doctype,
+        "voucher_name": name,
+        "voucher_reference_no": reference,
+        "voucher_posting_date": posting_date,
+        "voucher_amount": amount,
+        "voucher_party_type": "Customer" if name else "",
+        "voucher_party": "Customer 0001" if name else "",
+    }
+
+
+class AttrDict(dict):
+    __getattr__ = dict.get
+
+
+# Old format, as previously rendered by bank_reconcile_report.py
+
+def legacy_status(status, unallocated_amount, has_voucher, is_matched):
+    number_emoji = {1: "1️⃣", 2: "2️⃣", 3: "3️⃣", 4: "4️⃣", 5: "5️⃣",
+                    6: "6️⃣", 7: "7️⃣", 8: "8️⃣", 9: "9️⃣", 10: "🔟"}
+    emoji = number_emoji[1]
+    status_name = status or "Unreconciled"
+
+    if has_voucher and is_matched:
+        if status == "Reconciled" or unallocated_amount == 0:
+            return f"{emoji} ✅ {status_name}"
+        return f"{emoji} {status_name}"
+    if has_voucher:
+        return "❌ Unmatched"
+    if status == "Reconciled" or unallocated_amount == 0:
+        return f"{emoji} ✅ {status_name}"
+    if status == "Unreconciled" and unallocated_amount > 0:
+        return f"{emoji} {status_name}"
+    return f"{emoji} ⏳ {status_name}"
+
+
+def legacy_reconcile_button(bt_name, unallocated_amount, voucher_name, voucher_doc_type, status):
+    if status == "Reconciled" or unallocated_amount <= 0:
+        return ""
+    return f'<button class="btn btn-xs btn-primary reconcile-btn" data-bt="{bt_name}" data-voucher="{voucher_name}" data-doctype="{voucher_doc_type}">🔗 Reconcile</button>'
+
+
+def legacy_create_pe_button(bt_name, unallocated_amount, reference_number, date):
+    if unallocated_amount <= 0:
+        return ""
+    return f'<button class="btn btn-xs btn-success create-pe-btn" data-bt="{bt_name}" data-reference-number="{reference_number}" data-date="{date}">➕ Payment Entry</button>'
+
+
+def legacy_create_je_button(bt_name, unallocated_amount):
+    if unallocated_amount <= 0:
+        return ""
+    return f'<button class="btn btn-xs btn-info create-je-btn" data-bt="{bt_name}">📝 Journal Entry</button>'
+
+
+def legacy_create_bt_button(voucher_doc_type, voucher_name):
+    return f'<button class="btn btn-xs btn-warning create-bt-btn" data-doctype="{voucher_doc_type}" data-voucher="{voucher_name}">➕ Bank Transaction</button>'
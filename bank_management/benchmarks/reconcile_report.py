@@ -0,0 +1,331 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+"""
+Bank Reconcile Report benchmark on synthetic data.
+
+A deterministic generator creates a Bank Account with its GL account and
+`scale` Bank Transactions plus Payment Entries and Journal Entries, with
+controlled ratios of reference matches, mismatches (same reference, other
+amount) and Bank Transactions without reference. Rows are bulk inserted as
+submitted documents (no GL Entries). Then execute(), get_data, the unmatched
+voucher functions and get_report_summary are timed and their SQL queries
+counted. Results are written as JSON so runs of different commits can be
+compared.
+
+    bench --site <site> execute bank_management.benchmarks.reconcile_report.run --kwargs "{'scale': 10000}"
+    bench --site <site> execute bank_management.benchmarks.reconcile_report.compare --args "['old.json', 'new.json']"
+    bench --site <site> execute bank_management.benchmarks.reconcile_report.delete_data --kwargs "{'scale': 10000}"
+"""
+
+import json
+import os
+import random
+import statistics
+import subprocess
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import frappe
+from frappe.utils import now
+
+from bank_management.references import normalize_reference
+from bank_management.bank_management.report.bank_reconcile_report.bank_reconcile_report import (
+    execute,
+    get_data,
+    get_report_summary,
+    get_unmatched_journal_entries,
+    get_unmatched_payment_entries,
+)
+from bank_management.bank_management.report.bank_reconcile_report.profiling import trace_queries
+from bank_management.bank_management.report.bank_reconcile_report.report_cache import get_cache_key
+
+SCALES = (1000, 10000, 100000, 1000000)
+
+# Rows generated and inserted per chunk (one commit per chunk)
+CHUNK_SIZE = 10000
+
+START_DATE = date(2025, 1, 1)
+DAYS = 365
+
+BANK = "Benchmark Bank"
+PARTY = "Benchmark Customer"
+
+
+def run(scale=1000, match_ratio=0.6, mismatch_ratio=0.15, no_reference_ratio=0.15, seed=42,
+        repeat=3, company=None, output=None):
+    """Generate the data for scale (once), time the report phases and write the JSON result"""
+    scale = int(scale)
+    bank_account = generate(scale, match_ratio, mismatch_ratio, no_reference_ratio, seed, company)
+    filters = get_filters(bank_account)
+
+    result = {
+        "scale": scale,
+        "ratios": {"match": match_ratio, "mismatch": mismatch_ratio, "no_reference": no_reference_ratio},
+        "seed": seed,
+        "repeat": int(repeat),
+        "commit": get_commit(),
+        "timestamp": now(),
+        "phases": {},
+    }
+
+    def run_execute():
+        # Cold run: drop the cached result of the filters
+        frappe.cache.delete_value(get_cache_key(filters))
+        return execute(filters)
+
+    data = get_data(filters)
+    phases = {
+        "execute": run_execute,
+        "get_data": lambda: get_data(filters),
+        "get_unmatched_payment_entries": lambda: get_unmatched_payment_entries(filters, set()),
+        "get_unmatched_journal_entries": lambda: get_unmatched_journal_entries(filters, set()),
+        "get_report_summary": lambda: get_report_summary(filters, data),
+    }
+    for phase, method in phases.items():
+        result["phases"][phase] = measure(method, int(repeat))
+    result["rows"] = len(data)
+
+    path = output or get_output_path(scale, result["commit"])
+    with open(path, "w") as f:
+        json.dump(result, f, indent=1, default=str)
+
+    print(json.dumps(result["phases"], indent=1))
+    print(f"Written to {path}")
+    return result
+
+
+def measure(method, repeat):
+    """Seconds (min, median) over repeat runs and SQL queries of the last run"""
+    seconds = []
+    for i in range(repeat):
+        with count_queries() as queries:
+            start = time.perf_counter()
+            method()
+            seconds.append(time.perf_counter() - start)
+
+    return {
+        "min_seconds": round(min(seconds), 4),
+        "median_seconds": round(statistics.median(seconds), 4),
+        "queries": queries["count"],
+        "query_seconds": round(queries["seconds"], 4),
+    }
+
+
+@contextmanager
+def count_queries():
+    """Count frappe.db.sql calls (frappe.get_all, get_value and qb run through it)"""
+    stats = {"count": 0, "seconds": 0.0}
+
+    def on_query(query, values, seconds):
+        stats["count"] += 1
+        stats["seconds"] += seconds
+
+    with trace_queries(on_query):
+        yield stats
+
+
+def compare(baseline, current, threshold=0.1):
+    """Print the median time and query changes between two result files, returns the regressed phases"""
+    with open(baseline) as f:
+        baseline = json.load(f)
+    with open(current) as f:
+        current = json.load(f)
+
+    regressions = []
+    for phase, after in current["phases"].items():
+        before = baseline["phases"].get(phase)
+        if not before:
+            continue
+
+        ratio = after["median_seconds"] / max(before["median_seconds"], 1e-6)
+        regressed = ratio > 1 + float(threshold) or after["queries"] > before["queries"]
+        if regressed:
+            regressions.append(phase)
+
+        print("{0:32} {1:>9.4f}s -> {2:>9.4f}s ({3:+.0%})  queries {4} -> {5}{6}".format(
+            phase, before["median_seconds"], after["median_seconds"], ratio - 1,
+            before["queries"], after["queries"], "  REGRESSION" if regressed else ""))
+
+    return regressions
+
+
+def get_filters(bank_account):
+    return frappe._dict({
+        "company": frappe.db.get_value("Bank Account", bank_account, "company"),
+        "bank_account": bank_account,
+        "bank_statement_from_date": START_DATE,
+        "bank_statement_to_date": START_DATE + timedelta(days=DAYS - 1),
+    })
+
+
+def get_output_path(scale, commit):
+    path = frappe.get_site_path("benchmarks")
+    os.makedirs(path, exist_ok=True)
+    return os.path.join(path, f"reconcile_report_{scale}_{commit or 'unknown'}.json")
+
+
+def get_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=frappe.get_app_path("bank_management"),
+            stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def get_prefix(scale):
+    return f"BENCH-{int(scale)}-"
+
+
+def generate(scale, match_ratio=0.6, mismatch_ratio=0.15, no_reference_ratio=0.15, seed=42, company=None):
+    """
+    Bank Account with scale Bank Transactions and their vouchers. Returns the
+    Bank Account. Data already generated for scale is reused.
+
+    Per Bank Transaction, drawn with a seeded random generator:
+    - match: Payment Entry (or, for withdrawals, Journal Entry) with the same reference and amount
+    - mismatch: Payment Entry with the same reference but another amount (stays unmatched)
+    - no reference: Payment Entry with the same amount a few days apart (fuzzy match)
+    - otherwise no voucher
+    """
+    scale = int(scale)
+    prefix = get_prefix(scale)
+    bank_account = get_bank_account(scale, company)
+    if frappe.db.exists("Bank Transaction", {"name": ["like", prefix + "BT-%"]}):
+        return bank_account
+
+    gl_account, company = frappe.db.get_value("Bank Account", bank_account, ["account", "company"])
+    currency = frappe.db.get_value("Company", company, "default_currency")
+    rng = random.Random(seed)
+    timestamp = now()
+    user = frappe.session.user
+
+    for start in range(0, scale, CHUNK_SIZE):
+        bank_transactions, payment_entries, journal_entries, journal_accounts = [], [], [], []
+
+        for i in range(start, min(start + CHUNK_SIZE, scale)):
+            kind = rng.random()
+            amount = round(rng.uniform(10, 50000), 2)
+            posting_date = START_DATE + timedelta(days=rng.randrange(DAYS))
+            is_deposit = rng.random() < 0.6
+            reference = f"{prefix}{i:07d}"
+            reference_key = normalize_reference(reference)
+            common = [timestamp, timestamp, user, user, 1]
+
+            is_match = kind < match_ratio
+            is_mismatch = match_ratio <= kind < match_ratio + mismatch_ratio
+            has_reference = not (
+                match_ratio + mismatch_ratio <= kind < match_ratio + mismatch_ratio + no_reference_ratio)
+
+            bank_transactions.append([
+                f"{prefix}BT-{i:07d}", *common, posting_date, "Unreconciled", bank_account, company,
+                amount if is_deposit else 0, 0 if is_deposit else amount, currency,
+                reference if has_reference else None, reference_key if has_reference else "",
+                f"Benchmark {i}", 0, amount
+            ])
+
+            if is_match or is_mismatch or not has_reference:
+                voucher_amount = amount
+                voucher_date = posting_date
+                if is_mismatch:
+                    voucher_amount = round(amount + rng.uniform(1, 100), 2)
+                if not has_reference:
+                    voucher_date = posting_date + timedelta(days=rng.randint(-3, 3))
+
+                if is_match and not is_deposit and rng.random() < 0.5:
+                    journal_entries.append([
+                        f"{prefix}JE-{i:07d}", *common, voucher_date, company, "Bank Entry",
+                        reference, reference_key, voucher_date, PARTY, voucher_amount, voucher_amount
+                    ])
+                    journal_accounts.append([
+                        f"{prefix}JEA-{i:07d}", *common, f"{prefix}JE-{i:07d}", "Journal Entry", "accounts", 1,
+                        gl_account, 0, voucher_amount, 0, voucher_amount
+                    ])
+                else:
+                    payment_entries.append([
+                        f"{prefix}PE-{i:07d}", *common, voucher_date, company,
+                        "Receive" if is_deposit else "Pay", "Customer" if is_deposit else "Supplier", PARTY,
+                        None if is_deposit else gl_account, gl_account if is_deposit else None,
+                        voucher_amount, voucher_amount, voucher_amount,
+                        reference if has_reference else f"{prefix}X{i:07d}",
+                        reference_key if has_reference else normalize_reference(f"{prefix}X{i:07d}"), voucher_date
+                    ])
+
+        common_fields = ["name", "creation", "modified", "owner", "modified_by", "docstatus"]
+        frappe.db.bulk_insert("Bank Transaction", common_fields + [
+            "date", "status", "bank_account", "company", "deposit", "withdrawal", "currency",
+            "reference_number", "custom_normalized_reference", "description", "allocated_amount",
+            "unallocated_amount"
+        ], bank_transactions)
+        frappe.db.bulk_insert("Payment Entry", common_fields + [
+            "posting_date", "company", "payment_type", "party_type", "party", "paid_from", "paid_to",
+            "paid_amount", "received_amount", "base_paid_amount_after_tax", "reference_no",
+            "custom_normalized_reference", "reference_date"
+        ], payment_entries)
+        frappe.db.bulk_insert("Journal Entry", common_fields + [
+            "posting_date", "company", "voucher_type", "cheque_no", "custom_normalized_reference", "cheque_date",
+            "pay_to_recd_from",
+            "total_debit", "total_credit"
+        ], journal_entries)
+        frappe.db.bulk_insert("Journal Entry Account", common_fields + [
+            "parent", "parenttype", "parentfield", "idx", "account", "debit_in_account_currency",
+            "credit_in_account_currency", "debit", "credit"
+        ], journal_accounts)
+        frappe.db.commit()
+
+    return bank_account
+
+
+def get_bank_account(scale, company=None):
+    """Bank Account (and GL account) of the benchmark scale, created if missing"""
+    company = company or frappe.defaults.get_user_default("Company") or frappe.get_all(
+        "Company", pluck="name", limit=1)[0]
+    account_name = f"Benchmark {int(scale)}"
+
+    bank_account = frappe.db.get_value("Bank Account", {"account_name": account_name, "company": company})
+    if bank_account:
+        return bank_account
+
+    if not frappe.db.exists("Bank", BANK):
+        frappe.get_doc({"doctype": "Bank", "bank_name": BANK}).insert(ignore_permissions=True)
+
+    parent_account = frappe.db.get_value(
+        "Account", {"company": company, "is_group": 1, "account_type": "Bank"}
+    ) or frappe.db.get_value("Account", {"company": company, "is_group": 1, "root_type": "Asset"})
+    gl_account = frappe.get_doc({
+        "doctype": "Account",
+        "account_name": account_name,
+        "company": company,
+        "parent_account": parent_account,
+        "account_type": "Bank",
+    }).insert(ignore_permissions=True)
+
+    bank_account = frappe.get_doc({
+        "doctype": "Bank Account",
+        "account_name": account_name,
+        "bank": BANK,
+        "account": gl_account.name,
+        "company": company,
+        "is_company_account": 1,
+    }).insert(ignore_permissions=True)
+    frappe.db.commit()
+
+    return bank_account.name
+
+
+def delete_data(scale):
+    """Delete the generated documents of scale and its Bank Account"""
+    prefix = get_prefix(scale) + "%"
+    for doctype in ("Bank Transaction", "Payment Entry", "Journal Entry Account", "Journal Entry"):
+        frappe.db.sql(f"DELETE FROM `tab{doctype}` WHERE name LIKE %s", prefix)
+    frappe.db.sql("DELETE FROM `tabBank Transaction Trigram` WHERE bank_transaction LIKE %s", prefix)
+    frappe.db.sql("DELETE FROM `tabBank Match State` WHERE name LIKE %s", prefix)
+
+    bank_account = frappe.db.get_value("Bank Account", {"account_name": f"Benchmark {int(scale)}"},
+                                       ["name", "account"], as_dict=True)
+    if bank_account:
+        frappe.delete_doc("Bank Account", bank_account.name, ignore_permissions=True, force=True)
+        frappe.delete_doc("Account", bank_account.account, ignore_permissions=True, force=True)
+    frappe.db.commit()
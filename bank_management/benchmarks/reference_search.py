@@ -0,0 +1,133 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+"""
+Substring search benchmark: trigram index against LIKE '%text%'.
+
+Uses the synthetic Bank Account of reconcile_report (generated once per
+scale) and builds its trigram index if missing. Search texts are random
+substrings of existing reference numbers and descriptions plus texts that do
+not occur. Every text is searched on both paths with the condition the report
+uses (get_search_condition), the results are checked to be equal and the
+timings written as JSON.
+
+    bench --site <site> execute bank_management.benchmarks.reference_search.run --kwargs "{'scale': 100000}"
+"""
+
+import json
+import os
+import random
+import statistics
+import string
+import time
+
+import frappe
+from frappe.utils import now
+
+from bank_management.trigram_index import TRIGRAM_DOCTYPE, get_search_condition, rebuild_trigram_index
+from bank_management.benchmarks.reconcile_report import generate, get_commit
+
+
+def run(scale=10000, searches=50, length=5, miss_ratio=0.2, seed=42, repeat=3, company=None, output=None):
+    """Time LIKE and trigram searches over reference_number and description, write the JSON result"""
+    scale = int(scale)
+    bank_account = generate(scale, company=company)
+    if not frappe.db.exists(TRIGRAM_DOCTYPE, {"bank_account": bank_account}):
+        rebuild_trigram_index(bank_account)
+
+    result = {
+        "scale": scale,
+        "searches": int(searches),
+        "length": int(length),
+        "seed": seed,
+        "repeat": int(repeat),
+        "commit": get_commit(),
+        "timestamp": now(),
+        "fields": {},
+    }
+
+    rng = random.Random(seed)
+    for field in ("reference_number", "description"):
+        texts = get_search_texts(bank_account, field, int(searches), int(length), float(miss_ratio), rng)
+        result["fields"][field] = compare_paths(bank_account, field, texts, int(repeat))
+
+    path = output or get_output_path(scale, result["commit"])
+    with open(path, "w") as f:
+        json.dump(result, f, indent=1, default=str)
+
+    print(json.dumps(result["fields"], indent=1))
+    print(f"Written to {path}")
+    return result
+
+
+def get_search_texts(bank_account, field, searches, length, miss_ratio, rng):
+    """Substrings of random field values, and random texts (misses)"""
+    values = frappe.db.sql_list(f"""
+        SELECT `{field}` FROM `tabBank Transaction`
+        WHERE bank_account = %(bank_account)s AND docstatus = 1
+            AND CHAR_LENGTH(`{field}`) >= %(length)s
+        ORDER BY name
+        LIMIT 10000
+    """, {"bank_account": bank_account, "length": length})
+
+    texts = []
+    for i in range(searches):
+        if not values or rng.random() < miss_ratio:
+            texts.append("".join(rng.choice(string.ascii_uppercase) for j in range(length)))
+        else:
+            value = rng.choice(values)
+            start = rng.randrange(len(value) - length + 1)
+            texts.append(value[start:start + length])
+    return texts
+
+
+def compare_paths(bank_account, field, texts, repeat):
+    """Seconds per search (median, p95, total) of both paths and the searches with different results"""
+    seconds = {"like": [], "trigram": []}
+    mismatches = []
+    rows = 0
+
+    for text in texts:
+        results = {}
+        for path, use_index in (("like", False), ("trigram", True)):
+            timings = []
+            for i in range(repeat):
+                start = time.perf_counter()
+                results[path] = search(bank_account, field, text, use_index)
+                timings.append(time.perf_counter() - start)
+            seconds[path].append(min(timings))
+
+        rows += len(results["like"])
+        if set(results["like"]) != set(results["trigram"]):
+            mismatches.append(text)
+
+    summary = {path: get_stats(timings) for path, timings in seconds.items()}
+    summary["speedup"] = round(
+        summary["like"]["median_seconds"] / max(summary["trigram"]["median_seconds"], 1e-6), 1)
+    summary["rows"] = rows
+    summary["mismatches"] = mismatches
+    return summary
+
+
+def search(bank_account, field, text, use_index):
+    values = {"bank_account": bank_account}
+    condition = get_search_condition(field, text, values, bank_account, use_index=use_index)
+    return frappe.db.sql_list(f"""
+        SELECT bt.name FROM `tabBank Transaction` bt
+        WHERE bt.bank_account = %(bank_account)s AND bt.docstatus = 1 AND {condition}
+    """, values)
+
+
+def get_stats(seconds):
+    seconds = sorted(seconds)
+    return {
+        "median_seconds": round(statistics.median(seconds), 5),
+        "p95_seconds": round(seconds[min(len(seconds) - 1, int(len(seconds) * 0.95))], 5),
+        "total_seconds": round(sum(seconds), 4),
+    }
+
+
+def get_output_path(scale, commit):
+    path = frappe.get_site_path("benchmarks")
+    os.makedirs(path, exist_ok=True)
+    return os.path.join(path, f"reference_search_{scale}_{commit or 'unknown'}.json")
@@ -85,7 +85,8 @@ doctype_js = {
 # ------------
 
 # before_install = "bank_management.install.before_install"
-# after_install = "bank_management.install.after_install"
+after_install = "bank_management.install.after_install"
+after_migrate = "bank_management.install.after_migrate"
 
 # Uninstallation
 # ------------
@@ -139,17 +140,92 @@ doctype_js = {
 # ---------------
 # Hook on document methods and events
 
-# doc_events = {
-# 	"*": {
-# 		"on_update": "method",
-# 		"on_cancel": "method",
-# 		"on_trash": "method"
-# 	}
-# }
+doc_events = {
+	"Repost Item Valuation": {
+		"on_submit": "bank_management.bank_management.doctype.bank_balance_checkpoint.bank_balance_checkpoint.clear_reposted_checkpoints"
+	},
+	"Repost Accounting Ledger": {
+		"on_submit": "bank_management.bank_management.doctype.bank_balance_checkpoint.bank_balance_checkpoint.clear_reposted_checkpoints"
+	},
+	"Bank Transaction": {
+		"validate": [
+			"bank_management.bank_management.doctype.bulk_bank_transaction.fingerprint.set_fingerprint",
+			"bank_management.references.set_normalized_reference"
+		],
+		"before_update_after_submit": "bank_management.references.set_normalized_reference",
+		"on_update": "bank_management.trigram_index.update_trigram_index",
+		"on_trash": "bank_management.trigram_index.delete_trigram_index",
+		"on_submit": [
+			"bank_management.bank_management.report.bank_reconcile_report.report_cache.bump_data_version",
+			"bank_management.bank_management.report.bank_reconcile_report.match_state.clear_bank_transaction_state"
+		],
+		"on_cancel": [
+			"bank_management.bank_management.report.bank_reconcile_report.report_cache.bump_data_version",
+			"bank_management.bank_management.report.bank_reconcile_report.match_state.clear_bank_transaction_state"
+		],
+		"on_update_after_submit": [
+			"bank_management.bank_management.report.bank_reconcile_report.report_cache.bump_data_version",
+			"bank_management.bank_management.report.bank_reconcile_report.match_state.clear_bank_transaction_state",
+			"bank_management.trigram_index.update_trigram_index"
+		]
+	},
+	"Payment Entry": {
+		"validate": "bank_management.references.set_normalized_reference",
+		"before_update_after_submit": "bank_management.references.set_normalized_reference",
+		"on_submit": [
+			"bank_management.bank_management.report.bank_reconcile_report.report_cache.bump_data_version",
+			"bank_management.bank_management.report.bank_reconcile_report.match_state.clear_voucher_state"
+		],
+		"on_cancel": [
+			"bank_management.bank_management.report.bank_reconcile_report.report_cache.bump_data_version",
+			"bank_management.bank_management.report.bank_reconcile_report.match_state.clear_voucher_state"
+		],
+		"on_update_after_submit": [
+			"bank_management.bank_management.report.bank_reconcile_report.report_cache.bump_data_version",
+			"bank_management.bank_management.report.bank_reconcile_report.match_state.clear_voucher_state"
+		]
+	},
+	"Journal Entry": {
+		"validate": "bank_management.references.set_normalized_reference",
+		"before_update_after_submit": "bank_management.references.set_normalized_reference",
+		"on_submit": [
+			"bank_management.bank_management.report.bank_reconcile_report.report_cache.bump_data_version",
+			"bank_management.bank_management.report.bank_reconcile_report.match_state.clear_voucher_state"
+		],
+		"on_cancel": [
+			"bank_management.bank_management.report.bank_reconcile_report.report_cache.bump_data_version",
+			"bank_management.bank_management.report.bank_reconcile_report.match_state.clear_voucher_state"
+		],
+		"on_update_after_submit": [
+			"bank_management.bank_management.report.bank_reconcile_report.report_cache.bump_data_version",
+			"bank_management.bank_management.report.bank_reconcile_report.match_state.clear_voucher_state"
+		]
+	},
+	"Bank Account": {
+		"on_update": "bank_management.metadata.clear_bank_account_cache",
+		"on_trash": "bank_management.metadata.clear_bank_account_cache",
+		"after_rename": "bank_management.metadata.clear_bank_account_cache"
+	},
+	"Account": {
+		"on_update": "bank_management.metadata.clear_account_cache",
+		"on_trash": "bank_management.metadata.clear_account_cache",
+		"after_rename": "bank_management.metadata.clear_account_cache"
+	},
+	"Company": {
+		"on_update": "bank_management.metadata.clear_company_cache"
+	}
+}
 
 # Scheduled Tasks
 # ---------------
 
+scheduler_events = {
+	"daily_long": [
+		"bank_management.bank_management.report.bank_reconcile_report.auto_reconcile.scheduled_auto_reconcile",
+		"bank_management.bank_management.doctype.bank_balance_checkpoint.bank_balance_checkpoint.update_all_checkpoints"
+	]
+}
+
 # scheduler_events = {
 # 	"all": [
 # 		"bank_management.tasks.all"
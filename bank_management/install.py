@@ -0,0 +1,94 @@
+# Copyright (c) 2025, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+import frappe
+
+# Composite indexes for the Bank Reconcile Report access paths
+# (doctype, index name, columns)
+BANK_RECONCILE_INDEXES = [
+    # Bank Transaction matching, existence checks and filter by normalized reference
+    ("Bank Transaction", "bank_reconcile_reference_index",
+     ["company", "bank_account", "docstatus", "custom_normalized_reference"]),
+    # Keyset pagination of the report (date desc, reference_number, name)
+    ("Bank Transaction", "bank_reconcile_date_index",
+     ["company", "bank_account", "docstatus", "date", "reference_number", "name"]),
+    # Duplicate detection of bulk created Bank Transactions
+    ("Bank Transaction", "bank_reconcile_fingerprint_index",
+     ["custom_fingerprint"]),
+    # Payment Entry matching (Case 1 & 2)
+    ("Payment Entry", "bank_reconcile_reference_index",
+     ["company", "custom_normalized_reference", "payment_type", "clearance_date"]),
+    ("Payment Entry", "bank_reconcile_paid_to_index",
+     ["company", "paid_to", "clearance_date"]),
+    ("Payment Entry", "bank_reconcile_paid_from_index",
+     ["company", "paid_from", "clearance_date"]),
+    # Journal Entry matching (Case 3)
+    ("Journal Entry", "bank_reconcile_cheque_index",
+     ["company", "custom_normalized_reference", "clearance_date"]),
+    # Existing Bank Transaction lookup in create_bank_transaction_from_voucher
+    ("Bank Transaction Payments", "bank_reconcile_payment_index",
+     ["payment_document", "payment_entry"]),
+    # Nearest balance checkpoint lookup for report summary balances
+    ("Bank Balance Checkpoint", "bank_reconcile_checkpoint_index",
+     ["account", "posting_date"]),
+    # GL Entries created after the watermark of a checkpoint
+    ("GL Entry", "bank_reconcile_creation_index",
+     ["account", "creation"]),
+    # Summary deltas after a checkpoint: vouchers posted or cleared after it
+    ("Payment Entry", "bank_reconcile_posting_date_index",
+     ["company", "posting_date"]),
+    ("Journal Entry", "bank_reconcile_posting_date_index",
+     ["company", "posting_date"]),
+    ("Journal Entry", "bank_reconcile_clearance_index",
+     ["company", "clearance_date"]),
+    ("Sales Invoice Payment", "bank_reconcile_clearance_index",
+     ["account", "clearance_date"]),
+    # Trigram substring search and index maintenance
+    ("Bank Transaction Trigram", "bank_transaction_trigram_index",
+     ["field", "trigram", "bank_account", "bank_transaction"]),
+    ("Bank Transaction Trigram", "bank_transaction_trigram_parent_index",
+     ["bank_transaction"]),
+    # Paging the staging rows of a Bulk Bank Transaction
+    ("Bank Transactions Table", "bulk_bank_transaction_row_index",
+     ["parent", "idx"]),
+    # Report match state invalidation by voucher, reference number and date window
+    ("Bank Match State", "bank_match_state_voucher_index",
+     ["voucher_type", "voucher_name"]),
+    ("Bank Match State", "bank_match_state_reference_index",
+     ["bank_account", "reference_key"]),
+    ("Bank Match State", "bank_match_state_date_index",
+     ["bank_account", "date"]),
+]
+
+
+def after_install():
+    create_indexes()
+
+
+def after_migrate():
+    create_indexes()
+
+
+def create_indexes():
+    """Create missing indexes and re-create the ones whose columns have changed"""
+    for doctype, index_name, columns in BANK_RECONCILE_INDEXES:
+        try:
+            existing_columns = get_index_columns(doctype, index_name)
+            if existing_columns == columns:
+                continue
+
+            if existing_columns:
+                frappe.db.sql_ddl(
+                    f"ALTER TABLE `tab{doctype}` DROP INDEX `{index_name}`")
+
+            frappe.db.add_index(doctype, columns, index_name)
+        except Exception:
+            frappe.log_error(
+                "[install.py] method: create_indexes", "Bank Management")
+
+
+def get_index_columns(doctype, index_name):
+    """Columns of an existing index, in index order"""
+    index_rows = frappe.db.sql(
+        f"SHOW INDEX FROM `tab{doctype}` WHERE Key_name = %s", index_name, as_dict=True)
+    return [d.Column_name for d in sorted(index_rows, key=lambda d: d.Seq_in_index)]
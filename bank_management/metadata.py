@@ -0,0 +1,110 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+"""
+Bank metadata cache.
+
+Bank Account -> GL account, company, currency and Account -> type, currency,
+plus GL account -> Bank Accounts. Lookups go through a per-request layer
+(frappe.local) and a Redis hash layer before the database. Redis entries are
+invalidated by doc_events on Bank Account, Account and Company.
+"""
+
+import frappe
+
+BANK_ACCOUNT_KEY = "bank_management:bank_account"
+ACCOUNT_KEY = "bank_management:account"
+GL_BANK_ACCOUNTS_KEY = "bank_management:gl_bank_accounts"
+
+
+def get_local_cache(key):
+    """Per-request layer, reset by frappe with frappe.local"""
+    if not hasattr(frappe.local, "bank_management_metadata"):
+        frappe.local.bank_management_metadata = {}
+    return frappe.local.bank_management_metadata.setdefault(key, {})
+
+
+def get_cached(key, name, load):
+    """Value of name in the local layer, then the Redis hash key, then load(name)"""
+    local = get_local_cache(key)
+    if name in local:
+        return local[name]
+
+    value = frappe.cache.hget(key, name)
+    if value is None:
+        value = load(name)
+        frappe.cache.hset(key, name, value)
+
+    local[name] = value
+    return value
+
+
+def get_bank_account_details(bank_account):
+    """_dict(account, company, currency) of a Bank Account, None if it does not exist"""
+    if not bank_account:
+        return None
+
+    details = get_cached(BANK_ACCOUNT_KEY, bank_account, load_bank_account_details)
+    return frappe._dict(details) if details else None
+
+
+def load_bank_account_details(bank_account):
+    details = frappe.db.get_value(
+        "Bank Account", bank_account, ["account", "company"], as_dict=True)
+    if not details:
+        # Cached as missing, not None (None means not cached)
+        return {}
+
+    # Currency of the GL account, or the company default currency
+    currency = None
+    if details.account:
+        currency = (get_account_details(details.account) or {}).get("account_currency")
+    if not currency and details.company:
+        currency = frappe.db.get_value("Company", details.company, "default_currency")
+
+    return {"account": details.account, "company": details.company, "currency": currency}
+
+
+def get_account_details(account):
+    """_dict(account_type, account_currency, company) of an Account, None if it does not exist"""
+    if not account:
+        return None
+
+    details = get_cached(ACCOUNT_KEY, account, lambda name: frappe.db.get_value(
+        "Account", name, ["account_type", "account_currency", "company"], as_dict=True) or {})
+    return frappe._dict(details) if details else None
+
+
+def get_bank_accounts_for_gl(account):
+    """Bank Accounts linked to a GL account"""
+    if not account:
+        return []
+
+    return get_cached(GL_BANK_ACCOUNTS_KEY, account, lambda name: frappe.get_all(
+        "Bank Account", filters={"account": name}, pluck="name", order_by="name"))
+
+
+def clear_local_cache():
+    if hasattr(frappe.local, "bank_management_metadata"):
+        frappe.local.bank_management_metadata = {}
+
+
+def clear_bank_account_cache(doc, method=None, *args):
+    """doc_events: Bank Account on_update, on_trash, after_rename"""
+    # Whole hashes: the GL account of the Bank Account may have changed, and
+    # after_rename leaves entries under the old name
+    frappe.cache.delete_value([BANK_ACCOUNT_KEY, GL_BANK_ACCOUNTS_KEY])
+    clear_local_cache()
+
+
+def clear_account_cache(doc, method=None, *args):
+    """doc_events: Account on_update, on_trash, after_rename"""
+    # Bank Account currency comes from the GL account
+    frappe.cache.delete_value([ACCOUNT_KEY, BANK_ACCOUNT_KEY, GL_BANK_ACCOUNTS_KEY])
+    clear_local_cache()
+
+
+def clear_company_cache(doc, method=None, *args):
+    """doc_events: Company on_update (default currency of Bank Accounts without GL currency)"""
+    frappe.cache.delete_value(BANK_ACCOUNT_KEY)
+    clear_local_cache()
@@ -0,0 +1,9 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+from bank_management.trigram_index import enqueue_rebuild
+
+
+def execute():
+    """Build the Bank Transaction trigram index in the background, searches use LIKE until it is done"""
+    enqueue_rebuild()
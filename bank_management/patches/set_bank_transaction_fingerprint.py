@@ -0,0 +1,46 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.modules.utils import sync_customizations
+
+from bank_management.bank_management.doctype.bulk_bank_transaction.fingerprint import get_fingerprint
+
+BATCH_SIZE = 5000
+
+
+def execute():
+    """Back-fill Bank Transaction.custom_fingerprint for existing rows"""
+    # Custom fields are synced after post_model_sync patches, make sure the column exists
+    sync_customizations("bank_management")
+
+    last_name = ""
+    while True:
+        rows = frappe.db.sql("""
+            SELECT name, bank_account, date, deposit, withdrawal, reference_number
+            FROM `tabBank Transaction`
+            WHERE name > %(last_name)s
+            AND (custom_fingerprint IS NULL OR custom_fingerprint = '')
+            ORDER BY name
+            LIMIT %(batch_size)s
+        """, {"last_name": last_name, "batch_size": BATCH_SIZE}, as_dict=True)
+
+        if not rows:
+            break
+
+        last_name = rows[-1].name
+        values = []
+        for row in rows:
+            if row.bank_account and row.date:
+                values.append((row.name, get_fingerprint(
+                    row.bank_account, row.date, row.deposit, row.withdrawal, row.reference_number)))
+
+        if values:
+            frappe.db.sql("""
+                UPDATE `tabBank Transaction`
+                SET custom_fingerprint = CASE name {cases} END
+                WHERE name IN %s
+            """.format(cases=" ".join(["WHEN %s THEN %s"] * len(values))),
+                [value for pair in values for value in pair] + [tuple(name for name, fingerprint in values)])
+
+        frappe.db.commit()
@@ -0,0 +1,14 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+from frappe.modules.utils import sync_customizations
+
+from bank_management.references import update_normalized_references
+
+
+def execute():
+    """Back-fill custom_normalized_reference of Bank Transactions, Payment Entries and Journal Entries"""
+    # Custom fields are synced after post_model_sync patches, make sure the columns exist
+    sync_customizations("bank_management")
+
+    update_normalized_references()
@@ -0,0 +1,169 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+"""
+Normalized reference keys of Bank Transaction, Payment Entry and Journal Entry.
+
+Banks format the same reference differently (case, spaces, punctuation,
+leading zeros, prefixes like "CHQ"). The reference (reference_number,
+reference_no, cheque_no) is normalized with the rules of Bank Management
+Settings, or a custom function set there, and stored in the indexed
+custom_normalized_reference column on validate. Matching and the report
+reference filter compare these keys with indexed equality.
+
+When the rules change all keys are recomputed by a background job.
+"""
+
+import re
+
+import frappe
+from frappe.utils import cint
+
+# Reference field per doctype
+REFERENCE_FIELDS = {
+    "Bank Transaction": "reference_number",
+    "Payment Entry": "reference_no",
+    "Journal Entry": "cheque_no",
+}
+
+NORMALIZED_FIELD = "custom_normalized_reference"
+
+# Normalization settings of Bank Management Settings
+SETTINGS_FIELDS = (
+    "reference_ignore_case",
+    "reference_ignore_punctuation",
+    "reference_strip_leading_zeros",
+    "reference_strip_prefixes",
+    "reference_normalization_method",
+)
+
+# Length of the Data column
+MAX_LENGTH = 140
+
+# Documents updated per batch (and database transaction) by the back-fill
+BATCH_SIZE = 5000
+
+
+def normalize_reference(reference):
+    """Normalized key of a reference, "" for an empty reference"""
+    if not reference:
+        return ""
+    return (get_normalizer()(str(reference)) or "")[:MAX_LENGTH]
+
+
+def get_normalizer():
+    """Configured normalization function (cached per request)"""
+    normalizer = getattr(frappe.local, "bank_reference_normalizer", None)
+    if normalizer is None:
+        settings = frappe.get_cached_doc("Bank Management Settings")
+        if settings.reference_normalization_method:
+            normalizer = frappe.get_attr(settings.reference_normalization_method)
+        else:
+            normalizer = get_rule_normalizer(settings)
+        frappe.local.bank_reference_normalizer = normalizer
+    return normalizer
+
+
+def get_rule_normalizer(settings):
+    """Normalization function of the settings rules"""
+    ignore_case = get_rule(settings, "reference_ignore_case")
+    ignore_punctuation = get_rule(settings, "reference_ignore_punctuation")
+    strip_leading_zeros = get_rule(settings, "reference_strip_leading_zeros")
+
+    # Prefixes normalized like the references, longest first
+    prefixes = []
+    for prefix in (settings.reference_strip_prefixes or "").splitlines():
+        prefix = prefix.strip()
+        if ignore_punctuation:
+            prefix = re.sub(r"[\W_]", "", prefix)
+        if ignore_case:
+            prefix = prefix.upper()
+        if prefix:
+            prefixes.append(prefix)
+    prefixes.sort(key=len, reverse=True)
+
+    def normalize(reference):
+        reference = reference.strip()
+        if ignore_punctuation:
+            reference = re.sub(r"[\W_]", "", reference)
+        if ignore_case:
+            reference = reference.upper()
+        for prefix in prefixes:
+            # Keep a reference that is only the prefix
+            if reference.startswith(prefix) and len(reference) > len(prefix):
+                reference = reference[len(prefix):]
+                break
+        if strip_leading_zeros:
+            reference = reference.lstrip("0") or reference[-1:]
+        return reference
+
+    return normalize
+
+
+def get_rule(settings, fieldname):
+    """Check field of the settings, enabled when not set yet"""
+    value = settings.get(fieldname)
+    return 1 if value in (None, "") else cint(value)
+
+
+def clear_normalizer():
+    frappe.local.bank_reference_normalizer = None
+
+
+def set_normalized_reference(doc, method=None):
+    """validate / before_update_after_submit hook of Bank Transaction, Payment Entry and Journal Entry"""
+    doc.set(NORMALIZED_FIELD, normalize_reference(doc.get(REFERENCE_FIELDS[doc.doctype])))
+
+
+def enqueue_update_normalized_references():
+    """Recompute all keys in the background (normalization settings changed)"""
+    clear_normalizer()
+    frappe.enqueue(
+        "bank_management.references.update_normalized_references",
+        queue="long",
+        job_id="bank_management_update_normalized_references",
+        deduplicate=True,
+        enqueue_after_commit=True,
+    )
+
+
+def update_normalized_references(doctypes=None):
+    """Recompute the normalized reference of all documents, only changed keys are written"""
+    from bank_management.bank_management.report.bank_reconcile_report.match_state import clear_all_match_state
+
+    for doctype in doctypes or REFERENCE_FIELDS:
+        reference_field = REFERENCE_FIELDS[doctype]
+        last_name = ""
+        while True:
+            rows = frappe.db.sql(f"""
+                SELECT name, `{reference_field}`, `{NORMALIZED_FIELD}`
+                FROM `tab{doctype}`
+                WHERE name > %(last_name)s
+                ORDER BY name
+                LIMIT %(batch_size)s
+            """, {"last_name": last_name, "batch_size": BATCH_SIZE})
+
+            if not rows:
+                break
+
+            last_name = rows[-1][0]
+            values = {}
+            for name, reference, normalized in rows:
+                key = normalize_reference(reference)
+                if key != (normalized or ""):
+                    values[name] = key
+
+            if values:
+                frappe.db.sql("""
+                    UPDATE `tab{doctype}`
+                    SET `{field}` = CASE name {cases} END
+                    WHERE name IN %s
+                """.format(doctype=doctype, field=NORMALIZED_FIELD,
+                           cases=" ".join(["WHEN %s THEN %s"] * len(values))),
+                    [value for item in values.items() for value in item] + [tuple(values)])
+
+            frappe.db.commit()
+
+    # Stored matches were resolved with the previous keys
+    clear_all_match_state()
+    frappe.db.commit()
@@ -0,0 +1,95 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from bank_management.references import (
+	MAX_LENGTH,
+	clear_normalizer,
+	get_rule_normalizer,
+	normalize_reference,
+)
+
+
+def make_settings(**kwargs):
+	settings = {
+		"reference_ignore_case": 1,
+		"reference_ignore_punctuation": 1,
+		"reference_strip_leading_zeros": 1,
+		"reference_strip_prefixes": "",
+		"reference_normalization_method": "",
+	}
+	settings.update(kwargs)
+	return frappe._dict(settings)
+
+
+def reverse_reference(reference):
+	"""Custom normalization method of the tests"""
+	return reference[::-1]
+
+
+class TestReferences(FrappeTestCase):
+	def setUp(self):
+		clear_normalizer()
+
+	def tearDown(self):
+		clear_normalizer()
+
+	def normalize(self, reference, **kwargs):
+		with patch("frappe.get_cached_doc", return_value=make_settings(**kwargs)):
+			clear_normalizer()
+			return normalize_reference(reference)
+
+	def test_default_rules(self):
+		self.assertEqual(self.normalize(" inv-0042 "), "INV0042")
+		self.assertEqual(self.normalize("000123"), "123")
+		self.assertEqual(self.normalize("0000"), "0")
+		self.assertEqual(self.normalize("a_b.c/d e"), "ABCDE")
+		self.assertEqual(self.normalize(123), "123")
+
+		# Same key for the formats of one reference
+		self.assertEqual(len({self.normalize(d) for d in ("INV-001", "inv 001", "Inv.001", "INV001")}), 1)
+
+	def test_empty_reference(self):
+		for reference in (None, "", 0):
+			self.assertEqual(self.normalize(reference), "")
+		self.assertEqual(self.normalize(" - "), "")
+
+	def test_rules_disabled(self):
+		kwargs = {
+			"reference_ignore_case": 0,
+			"reference_ignore_punctuation": 0,
+			"reference_strip_leading_zeros": 0,
+		}
+		self.assertEqual(self.normalize(" inv-0042 ", **kwargs), "inv-0042")
+
+		# Unset rules are enabled
+		normalize = get_rule_normalizer(frappe._dict(reference_ignore_case=None))
+		self.assertEqual(normalize("inv-0042"), "INV0042")
+		self.assertEqual(normalize("0042"), "42")
+
+	def test_strip_prefixes(self):
+		prefixes = "CHQ\nchq no.\n\nREF"
+		self.assertEqual(self.normalize("CHQ 00123", reference_strip_prefixes=prefixes), "123")
+		# Longest prefix first
+		self.assertEqual(self.normalize("Chq No. 456", reference_strip_prefixes=prefixes), "456")
+		self.assertEqual(self.normalize("ref-789", reference_strip_prefixes=prefixes), "789")
+		# A reference that is only the prefix is kept, prefixes only at the start
+		self.assertEqual(self.normalize("CHQ", reference_strip_prefixes=prefixes), "CHQ")
+		self.assertEqual(self.normalize("123-CHQ", reference_strip_prefixes=prefixes), "123CHQ")
+
+	def test_custom_method(self):
+		method = "bank_management.test_references.reverse_reference"
+		self.assertEqual(self.normalize("abc-1", reference_normalization_method=method), "1-cba")
+
+	def test_max_length(self):
+		self.assertEqual(len(self.normalize("A" * (MAX_LENGTH + 10))), MAX_LENGTH)
+
+	def test_normalizer_cached_per_request(self):
+		with patch("frappe.get_cached_doc", return_value=make_settings()) as get_cached_doc:
+			normalize_reference("INV-1")
+			normalize_reference("INV-2")
+		get_cached_doc.assert_called_once()
@@ -0,0 +1,96 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from bank_management.trigram_index import (
+	escape_like,
+	get_search_condition,
+	get_trigrams,
+	index_bank_transactions,
+)
+from bank_management.bank_management.report.bank_reconcile_report.test_bank_reconcile_report import (
+	create_bank_account,
+	make_bank_transaction,
+)
+
+
+class TestTrigramIndex(FrappeTestCase):
+	def search(self, bank_account, field, text, use_index):
+		values = {"bank_account": bank_account.name}
+		condition = get_search_condition(field, text, values, bank_account.name, use_index=use_index)
+		return set(
+			frappe.db.sql_list(
+				f"""
+			SELECT bt.name FROM `tabBank Transaction` bt
+			WHERE bt.bank_account = %(bank_account)s AND {condition}
+		""",
+				values,
+			)
+		)
+
+	def test_get_trigrams(self):
+		self.assertEqual(get_trigrams("abcd"), {"abc", "bcd"})
+		# Distinct, lower case, without accents
+		self.assertEqual(get_trigrams("AAAA"), {"aaa"})
+		self.assertEqual(get_trigrams("Café"), {"caf", "afe"})
+		self.assertEqual(get_trigrams("a b"), {"a b"})
+
+		# Too short to index
+		for text in (None, "", "ab"):
+			self.assertEqual(get_trigrams(text), set())
+
+	def test_escape_like(self):
+		self.assertEqual(escape_like("100%_a\\b"), "100\\%\\_a\\\\b")
+		self.assertEqual(escape_like("INV-1"), "INV-1")
+
+	def test_search_condition(self):
+		values = {}
+		condition = get_search_condition("description", "ab", values, use_index=True)
+		# Shorter than a trigram: LIKE only
+		self.assertEqual(condition, "bt.`description` LIKE %(description_like)s")
+		self.assertEqual(values, {"description_like": "%ab%"})
+
+		values = {}
+		condition = get_search_condition("reference_number", "50%", values, use_index=False, alias="t")
+		self.assertEqual(condition, "t.`reference_number` LIKE %(reference_number_like)s")
+		self.assertEqual(values, {"reference_number_like": "%50\\%%"})
+
+		values = {}
+		condition = get_search_condition("description", "Rent", values, "Test Account", use_index=True)
+		self.assertIn("Bank Transaction Trigram", condition)
+		self.assertIn("bt.`description` LIKE %(description_like)s", condition)
+		self.assertEqual(values["description_field"], "description")
+		self.assertEqual(set(values["description_trigrams"]), {"ren", "ent"})
+		self.assertEqual(values["description_trigram_count"], 2)
+		self.assertEqual(values["description_bank_account"], "Test Account")
+
+	def test_indexed_search(self):
+		bank_account = create_bank_account()
+		bank_transactions = [
+			make_bank_transaction(bank_account, "2025-09-01", deposit=100, description="Office rent September"),
+			make_bank_transaction(bank_account, "2025-09-02", deposit=100, description="RENTAL deposit"),
+			# Every trigram of "rent", not the text
+			make_bank_transaction(bank_account, "2025-09-03", deposit=100, description="ren entry"),
+			make_bank_transaction(bank_account, "2025-09-04", deposit=100, reference_number="REF_100%"),
+			make_bank_transaction(bank_account, "2025-09-05", deposit=100, reference_number="REF-1000"),
+		]
+		index_bank_transactions(bank_transactions)
+
+		names = [bt.name for bt in bank_transactions]
+		self.assertEqual(self.search(bank_account, "description", "Rent", True), set(names[:2]))
+		self.assertEqual(self.search(bank_account, "reference_number", "_100%", True), {names[3]})
+
+		# Same result as LIKE alone
+		for field, text in (
+			("description", "rent"),
+			("description", "re"),
+			("description", "entry"),
+			("reference_number", "_100%"),
+			("reference_number", "ref"),
+			("reference_number", "xyz"),
+		):
+			self.assertEqual(
+				self.search(bank_account, field, text, True), self.search(bank_account, field, text, False)
+			)
@@ -0,0 +1,194 @@
+# Copyright (c) 2026, abdopcnet@gmail.com and contributors
+# For license information, please see license.txt
+
+"""
+Trigram side index for substring search in Bank Transaction reference
+numbers and descriptions.
+
+Every distinct three-character substring of an indexed field is stored as a
+Bank Transaction Trigram row (field, trigram, bank account, Bank Transaction).
+A search text of at least three characters selects the Bank Transactions
+having all of its trigrams (one GROUP BY on the trigram index) and only these
+candidates are verified with LIKE. Shorter texts cannot be indexed and use LIKE.
+
+Trigrams are lower case without accents, as the database collation compares.
+The index is maintained by Bank Transaction doc_events (on_update, which also
+runs on insert, on_update_after_submit and on_trash) and by the fast bulk
+insert. Until a full rebuild_trigram_index has finished (Bank Management
+Settings) searches use LIKE.
+"""
+
+import unicodedata
+
+import frappe
+from frappe.utils import cint, now
+
+TRIGRAM_DOCTYPE = "Bank Transaction Trigram"
+
+INDEXED_FIELDS = ("reference_number", "description")
+
+# Bank Transactions indexed per batch (and database transaction) by the rebuild
+BATCH_SIZE = 5000
+
+
+def get_trigrams(text):
+    """Distinct trigrams of text"""
+    text = unicodedata.normalize("NFKD", (text or "").lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def index_bank_transactions(bank_transactions):
+    """Replace the trigram rows of Bank Transactions (docs or dicts with the indexed fields)"""
+    if not bank_transactions:
+        return
+
+    timestamp = now()
+    user = frappe.session.user
+    rows = []
+    for bt in bank_transactions:
+        for field in INDEXED_FIELDS:
+            for trigram in get_trigrams(bt.get(field)):
+                rows.append([
+                    f"{bt.name}|{field}|{trigram}", user, user, timestamp, timestamp, 0,
+                    trigram, field, bt.bank_account, bt.name,
+                ])
+
+    delete_trigrams([bt.name for bt in bank_transactions])
+    # The collation may consider two trigrams equal, keep the first
+    frappe.db.bulk_insert(
+        TRIGRAM_DOCTYPE,
+        ["name", "owner", "modified_by", "creation", "modified", "docstatus",
+         "trigram", "field", "bank_account", "bank_transaction"],
+        rows,
+        ignore_duplicates=True,
+    )
+
+
+def delete_trigrams(names):
+    if names:
+        frappe.db.sql(
+            f"DELETE FROM `tab{TRIGRAM_DOCTYPE}` WHERE bank_transaction IN %(names)s",
+            {"names": tuple(names)})
+
+
+def update_trigram_index(doc, method=None):
+    """Bank Transaction on_update / on_update_after_submit hook"""
+    if doc.flags.trigrams_indexed:
+        # Indexed in one multi-row insert (insert_bank_transactions_fast)
+        return
+    try:
+        if any(doc.has_value_changed(field) for field in INDEXED_FIELDS + ("bank_account",)):
+            index_bank_transactions([doc])
+    except Exception:
+        frappe.log_error(
+            "[trigram_index.py] method: update_trigram_index", "Bank Management")
+
+
+def delete_trigram_index(doc, method=None):
+    """Bank Transaction on_trash hook"""
+    delete_trigrams([doc.name])
+
+
+def is_index_ready():
+    return cint(frappe.db.get_single_value("Bank Management Settings", "trigram_index_ready"))
+
+
+def escape_like(text):
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def get_search_condition(field, text, values, bank_account=None, use_index=None, alias="bt"):
+    """
+    SQL condition: Bank Transaction field (alias) contains text, case insensitive.
+    Adds its parameters to values. use_index: None uses the index once it is built.
+    """
+    values[f"{field}_like"] = "%{0}%".format(escape_like(text))
+    condition = f"{alias}.`{field}` LIKE %({field}_like)s"
+
+    trigrams = get_trigrams(text)
+    if use_index is None:
+        use_index = is_index_ready()
+    if not trigrams or not use_index:
+        return condition
+
+    values.update({
+        f"{field}_field": field,
+        f"{field}_trigrams": tuple(trigrams),
+        f"{field}_trigram_count": len(trigrams),
+    })
+    account_condition = ""
+    if bank_account:
+        account_condition = f"AND bank_account = %({field}_bank_account)s"
+        values[f"{field}_bank_account"] = bank_account
+
+    # Candidates having every trigram, verified with LIKE
+    return f"""({alias}.name IN (
+            SELECT bank_transaction
+            FROM `tab{TRIGRAM_DOCTYPE}`
+            WHERE field = %({field}_field)s
+                AND trigram IN %({field}_trigrams)s
+                {account_condition}
+            GROUP BY bank_transaction
+            HAVING COUNT(DISTINCT trigram) = %({field}_trigram_count)s
+        ) AND {condition})"""
+
+
+@frappe.whitelist()
+def rebuild_trigram_index(bank_account=None):
+    """
+    Rebuild the trigram index of a bank account, or of all Bank Transactions.
+    A full rebuild enables indexed search (Bank Management Settings) when done.
+
+    bench --site <site> execute bank_management.trigram_index.rebuild_trigram_index
+    """
+    frappe.only_for("System Manager")
+
+    conditions = ""
+    values = {"batch_size": BATCH_SIZE}
+    if bank_account:
+        conditions = "AND bank_account = %(bank_account)s"
+        values["bank_account"] = bank_account
+        frappe.db.sql(f"DELETE FROM `tab{TRIGRAM_DOCTYPE}` WHERE bank_account = %(bank_account)s", values)
+    else:
+        # Searches use LIKE while the index is incomplete
+        frappe.db.set_single_value("Bank Management Settings", "trigram_index_ready", 0)
+        frappe.db.sql(f"DELETE FROM `tab{TRIGRAM_DOCTYPE}`")
+    frappe.db.commit()
+
+    indexed = 0
+    values["last_name"] = ""
+    while True:
+        bank_transactions = frappe.db.sql(f"""
+            SELECT name, bank_account, reference_number, description
+            FROM `tabBank Transaction`
+            WHERE name > %(last_name)s {conditions}
+            ORDER BY name
+            LIMIT %(batch_size)s
+        """, values, as_dict=True)
+
+        if not bank_transactions:
+            break
+
+        values["last_name"] = bank_transactions[-1].name
+        index_bank_transactions(bank_transactions)
+        frappe.db.commit()
+        indexed += len(bank_transactions)
+
+    if not bank_account:
+        frappe.db.set_single_value("Bank Management Settings", "trigram_index_ready", 1)
+        frappe.db.commit()
+
+    return indexed
+
+
+def enqueue_rebuild():
+    """Full rebuild in the background (patch)"""
+    frappe.enqueue(
+        "bank_management.trigram_index.rebuild_trigram_index",
+        queue="long",
+        timeout=14400,
+        job_id="bank_management_rebuild_trigram_index",
+        deduplicate=True,
+        enqueue_after_commit=True,
+    )